@@ -0,0 +1,150 @@
+"""
+Benchmark: booking store throughput with concurrent writers and readers
+
+Writer processes (each with several threads, so group commit can batch)
+create bookings and mark half of them paid, while reader processes look
+bookings up by id and by customer email in the same SQLite file. Compares
+SQLite with one transaction per write against the default group-committed
+put path, plus the in-memory store (threads in one process, since it cannot
+be shared across processes).
+
+Usage:
+    python benchmarks/bench_booking_store.py [--writers 4] [--threads 4] [--readers 4] [--bookings 300]
+"""
+
+import os
+import sys
+import time
+import uuid
+import random
+import argparse
+import tempfile
+import threading
+import multiprocessing
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tools', 'python', 'booking_tool', 'source'))
+
+os.environ.setdefault("CINEMA_AGENT_CACHE_DIR", tempfile.mkdtemp(prefix="booking_bench_"))
+import booking_tool  # noqa: E402
+
+
+class SingleWriteSQLiteStore(booking_tool.SQLiteBookingStore):
+    """SQLite store without group commit: one transaction per booking"""
+
+    def put(self, booking):
+        self.put_many([booking])
+
+
+STORES = {"single": SingleWriteSQLiteStore, "grouped": booking_tool.SQLiteBookingStore}
+
+
+def make_booking(writer: int, i: int) -> dict:
+    return {
+        "booking_id": f"BK-{uuid.uuid4().hex[:8].upper()}",
+        "status": "confirmed",
+        "film_title": "Dune: Part Two",
+        "showtime": f"2026-10-17 {18 + i % 4}:00",
+        "seats": [{"row": "A", "number": str(n + 1), "type": "standard", "price": 12.0} for n in range(2)],
+        "customer": {"name": f"Customer {writer}", "email": f"customer{writer}@example.com"},
+        "pricing": {"subtotal": 24.0, "booking_fee": 1.5, "total": 25.5},
+        "created_at": f"2026-10-17T12:00:{i % 60:02d}.{i:06d}"
+    }
+
+
+def write_bookings(store, writer: int, count: int) -> None:
+    for i in range(count):
+        booking = make_booking(writer, i)
+        store.put(booking)
+        if i % 2:
+            booking["status"] = "paid"
+            store.compare_and_set(booking, "confirmed")
+
+
+def writer_process(kind: str, path: str, writer: int, threads: int, count: int, results) -> None:
+    store = STORES[kind](path)
+    workers = [threading.Thread(target=write_bookings, args=(store, writer * threads + t, count)) for t in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    results.put(("stats", store.stats()))
+
+
+def reader_process(kind: str, path: str, reader: int, customers: int, stop, results) -> None:
+    store = STORES[kind](path)
+    rng = random.Random(reader)
+    reads = 0
+    while not stop.is_set():
+        found = store.find_by_email(f"customer{rng.randrange(customers)}@example.com", 20)
+        if found:
+            store.get(found[rng.randrange(len(found))]["booking_id"])
+        reads += 2
+    results.put(("reads", reads))
+
+
+def run_sqlite(kind: str, path: str, args) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    results, stop = ctx.Queue(), ctx.Event()
+    STORES[kind](path)  # create the schema once
+    readers = [ctx.Process(target=reader_process, args=(kind, path, r, args.writers * args.threads, stop, results))
+               for r in range(args.readers)]
+    for process in readers:
+        process.start()
+    start = time.perf_counter()
+    writers = [ctx.Process(target=writer_process, args=(kind, path, w, args.threads, args.bookings, results))
+               for w in range(args.writers)]
+    for process in writers:
+        process.start()
+    for process in writers:
+        process.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for process in readers:
+        process.join()
+    reads, batches, rows = 0, 0, 0
+    while not results.empty():
+        name, value = results.get()
+        if name == "reads":
+            reads += value
+        else:
+            batches, rows = batches + value["batches"], rows + value["rows"]
+    writes = args.writers * args.threads * args.bookings * 1.5  # inserts plus payment updates
+    return {"writes_per_s": writes / elapsed, "reads_per_s": reads / elapsed,
+            "rows_per_commit": rows / batches if batches else 0.0}
+
+
+def run_memory(args) -> dict:
+    store = booking_tool.MemoryBookingStore()
+    workers = [threading.Thread(target=write_bookings, args=(store, w, args.bookings))
+               for w in range(args.writers * args.threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    return {"writes_per_s": len(workers) * args.bookings * 1.5 / elapsed, "reads_per_s": 0.0, "rows_per_commit": 0.0}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", type=int, default=4, help="writer processes")
+    parser.add_argument("--threads", type=int, default=4, help="writer threads per process")
+    parser.add_argument("--readers", type=int, default=4, help="reader processes")
+    parser.add_argument("--bookings", type=int, default=300, help="bookings per writer thread")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="booking_bench_")
+    print(f"{args.writers} writer processes x {args.threads} threads x {args.bookings} bookings, "
+          f"{args.readers} reader processes")
+    print(f"{'backend':<30}{'writes/s':>11}{'reads/s':>11}{'rows/commit':>13}")
+    for name, result in [
+        ("memory (one process, no readers)", run_memory(args)),
+        ("sqlite, txn per write", run_sqlite("single", os.path.join(directory, "single.db"), args)),
+        ("sqlite, group commit", run_sqlite("grouped", os.path.join(directory, "grouped.db"), args)),
+    ]:
+        print(f"{name:<30}{result['writes_per_s']:>11.0f}{result['reads_per_s']:>11.0f}{result['rows_per_commit']:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
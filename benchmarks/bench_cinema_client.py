@@ -0,0 +1,110 @@
+"""
+Load test: cinema_tool's MovieGlu client against the local stand-in server
+
+Starts benchmarks/movieglu_stub_server.py in-process (or uses --base-url to
+target one running separately, which keeps the server off this process's
+GIL), points MOVIEGLU_BASE_URL at it and drives the real cinema_tool tools
+from a thread pool. Reports throughput, latency percentiles, errors and the
+client's guard/single-flight/quota counters.
+
+Usage:
+    python benchmarks/bench_cinema_client.py [--requests 2000] [--concurrency 16]
+        [--latency lognormal:40:0.5] [--throttle-rate 0.02] [--error-rate 0.01]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tools', 'python', 'cinema_tool', 'source'))
+
+from movieglu_stub_server import MovieGluStubServer, sim  # noqa: E402
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="", help="use an already running stand-in server")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", default="lognormal:20:0.5")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=1e6, help="client-side MOVIEGLU_RATE_LIMIT")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server = MovieGluStubServer(latency=args.latency, error_rate=args.error_rate,
+                                    throttle_rate=args.throttle_rate, retry_after=0.05,
+                                    max_concurrency=max(args.concurrency, 1), seed=1).start()
+        base_url = server.url
+
+    # Configure the client before importing it: stand-in URL, no quota cap, fresh cache dir
+    os.environ["MOVIEGLU_BASE_URL"] = base_url
+    os.environ["MOVIEGLU_DAILY_QUOTA"] = str(10 ** 9)
+    os.environ["MOVIEGLU_RATE_LIMIT"] = os.environ["MOVIEGLU_RATE_BURST"] = str(args.rate_limit)
+    os.environ["CINEMA_AGENT_CACHE_DIR"] = tempfile.mkdtemp(prefix="cinema_client_bench_")
+    import cinema_tool  # noqa: E402
+
+    world = sim.get_world()
+    rng = random.Random(7)
+    start_date = world.start_date[0] if world is not None else None
+    dates = [str(start_date + day) for day in range(7)] if world is not None else [""]
+    cinema_ids = [str(c) for c in world.cinema_id[:2000].tolist()] if world is not None else ["19001"]
+    film_ids = [str(f) for f in world.film_id.tolist()] if world is not None else ["345000"]
+    titles = [str(t) for t in world.film_title[:50].tolist()] if world is not None else ["Dune"]
+
+    def workload(i: int):
+        kind = i % 4
+        if kind == 0:
+            return "get_cinema_showtimes", lambda: cinema_tool.get_cinema_showtimes.fn(rng.choice(cinema_ids), "", rng.choice(dates))
+        if kind == 1:
+            return "check_film_showtimes", lambda: cinema_tool.check_film_showtimes.fn(
+                rng.choice(film_ids), rng.choice(dates), 48.8566 + rng.uniform(-0.2, 0.2), 2.3522 + rng.uniform(-0.2, 0.2))
+        if kind == 2:
+            return "search_film_by_title", lambda: cinema_tool.search_film_by_title.fn(rng.choice(titles))
+        return "find_cinemas_nearby", lambda: cinema_tool.find_cinemas_nearby.fn(
+            45.0 + rng.uniform(-2, 4), 2.0 + rng.uniform(-2, 4), 10)
+
+    def timed(i: int):
+        name, call = workload(i)
+        start = time.perf_counter()
+        result = call()
+        return name, time.perf_counter() - start, isinstance(result, dict) and "error" in result
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(timed, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.requests} tool calls, concurrency {args.concurrency}, server latency {args.latency}, "
+          f"429 rate {args.throttle_rate}, 5xx rate {args.error_rate}")
+    print(f"throughput: {args.requests / elapsed:.0f} calls/s over {elapsed:.2f}s")
+    print(f"{'tool':<24}{'calls':>7}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for name in sorted({r[0] for r in results}):
+        latencies = sorted(r[1] * 1e3 for r in results if r[0] == name)
+        errors = sum(1 for r in results if r[0] == name and r[2])
+        print(f"{name:<24}{len(latencies):>7}{errors:>8}{percentile(latencies, 0.5):>9.1f}"
+              f"{percentile(latencies, 0.95):>9.1f}{percentile(latencies, 0.99):>9.1f}{latencies[-1]:>9.1f}")
+    print("guard:", cinema_tool.UPSTREAM_GUARD.stats())
+    print("single-flight:", cinema_tool.MOVIEGLU_FLIGHT.stats())
+    print("quota:", cinema_tool.MOVIEGLU_CLIENT.quota_status())
+    if server is not None:
+        print("server:", server.stats)
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark: seat-hold expiry with a timing wheel against a heap and a full scan
+
+Keeps a steady population of active holds (random TTLs, a share converted
+to bookings before they expire) on a simulated clock and times each expiry
+pass. The full scan looks at every hold on every tick; the heap pops due
+holds but leaves converted ones behind as tombstones; booking_tool's
+TimingWheel only visits the slot of the tick that passed. A final run drives
+SeatHolds end to end on the in-memory inventory and prints its metrics.
+
+Usage:
+    python benchmarks/bench_seat_holds.py [--holds 100000] [--ticks 600] [--convert 0.5]
+"""
+
+import os
+import sys
+import time
+import heapq
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tools', 'python', 'booking_tool', 'source'))
+
+os.environ.setdefault("CINEMA_AGENT_CACHE_DIR", tempfile.mkdtemp(prefix="hold_bench_"))
+import booking_tool  # noqa: E402
+
+
+class ScanExpiry:
+    def __init__(self):
+        self.deadlines = {}
+
+    def schedule(self, entry, deadline):
+        self.deadlines[entry] = deadline
+
+    def cancel(self, entry):
+        self.deadlines.pop(entry, None)
+
+    def advance(self, now):
+        due = [(e, d) for e, d in self.deadlines.items() if d <= now]
+        for entry, _ in due:
+            del self.deadlines[entry]
+        return due
+
+
+class HeapExpiry:
+    def __init__(self):
+        self.heap = []
+        self.deadlines = {}
+
+    def schedule(self, entry, deadline):
+        self.deadlines[entry] = deadline
+        heapq.heappush(self.heap, (deadline, entry))
+
+    def cancel(self, entry):
+        self.deadlines.pop(entry, None)  # tombstone stays in the heap
+
+    def advance(self, now):
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            deadline, entry = heapq.heappop(self.heap)
+            if self.deadlines.get(entry) == deadline:
+                del self.deadlines[entry]
+                due.append((entry, deadline))
+        return due
+
+
+def run(expiry, holds: int, ticks: int, convert: float, seed: int = 7) -> tuple:
+    """Seconds per expiry pass, holds expired and mean lag (simulated seconds)"""
+    rng = random.Random(seed)
+    now, serial, pending = 0.0, 0, []
+    per_tick = holds // 600  # steady state: about holds alive with a mean TTL of 600 s
+    for _ in range(holds):
+        expiry.schedule(serial, now + rng.uniform(60, 1140))
+        serial += 1
+    spent, expired, lag = 0.0, 0, 0.0
+    for _ in range(ticks):
+        now += 1.0
+        for _ in range(per_tick):
+            expiry.schedule(serial, now + rng.uniform(60, 1140))
+            if rng.random() < convert:
+                pending.append(serial)
+            serial += 1
+        # Conversions happen a little while after the hold was created
+        while len(pending) > per_tick * 30:
+            expiry.cancel(pending.pop(rng.randrange(len(pending))))
+        start = time.perf_counter()
+        due = expiry.advance(now)
+        spent += time.perf_counter() - start
+        expired += len(due)
+        lag += sum(now - deadline for _, deadline in due)
+    return spent / ticks, expired, lag / max(expired, 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--holds", type=int, default=100000)
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--convert", type=float, default=0.5, help="share of new holds converted to bookings")
+    args = parser.parse_args()
+
+    print(f"{args.holds} active holds, {args.ticks} one-second ticks, {args.convert:.0%} converted")
+    print(f"{'expiry':<14}{'us/tick':>10}{'expired':>10}{'lag s':>8}")
+    for name, expiry in [("full scan", ScanExpiry()), ("heap", HeapExpiry()),
+                         ("timing wheel", booking_tool.TimingWheel(1.0, 2048, now=0.0))]:
+        per_tick, expired, lag = run(expiry, args.holds, args.ticks, args.convert)
+        print(f"{name:<14}{per_tick * 1e6:>10.1f}{expired:>10}{lag:>8.2f}")
+
+    # End to end: hold, book half, let the rest expire on the real clock
+    inventory = booking_tool.MemorySeatInventory(booking_tool.SeatLayout([25] * 20))
+    holds = booking_tool.SeatHolds(inventory, booking_tool.SeatAllocator(inventory.layout), tick=0.05, reaper=True)
+    start = time.perf_counter()
+    tokens = [holds.hold(booking_tool.showing_key("19001", str(340000 + i % 2000), "2026-10-17", "19:30"),
+                         2, ttl=2.0)[0] for i in range(20000)]
+    for token in tokens[::2]:
+        holds.convert(token)
+    created = time.perf_counter() - start
+    time.sleep(2.5)
+    print(f"SeatHolds: {len(tokens) / created:.0f} holds+conversions/s;", holds.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: bitmap seat inventory reservations, availability checks and memory
+
+Fills many showings of a large auditorium to a target occupancy with single
+and pair reservations, then measures availability counts (popcount) and the
+memory the in-memory inventory holds per sold showing. The SQLite
+inventory (the default, shared across processes) is timed on a smaller run
+since every reservation is a transaction.
+
+Usage:
+    python benchmarks/bench_seat_inventory.py [--showings 5000] [--rows 20] [--width 26] [--occupancy 0.6]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tools', 'python', 'booking_tool', 'source'))
+
+os.environ.setdefault("CINEMA_AGENT_CACHE_DIR", tempfile.mkdtemp(prefix="seat_bench_"))
+import booking_tool  # noqa: E402
+
+
+def fill(inventory, keys, occupancy: float, rng: random.Random) -> int:
+    """Reserve random pairs and singles until each showing reaches occupancy; returns reservations made"""
+    layout = inventory.layout
+    target = int(layout.capacity * occupancy)
+    reservations = 0
+    for key in keys:
+        sold = 0
+        while sold < target:
+            bit = rng.randrange(layout.capacity - 1)
+            mask = (3 if rng.random() < 0.5 else 1) << bit
+            if inventory.reserve(key, mask):
+                sold += booking_tool.popcount(mask)
+            reservations += 1
+    return reservations
+
+
+def retained_bytes(inventory) -> int:
+    """Bytes held by a memory inventory: its dict, keys and bitmaps"""
+    return sys.getsizeof(inventory.bitmaps) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in inventory.bitmaps.items())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--showings", type=int, default=5000)
+    parser.add_argument("--sqlite-showings", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--width", type=int, default=26)
+    parser.add_argument("--occupancy", type=float, default=0.6)
+    args = parser.parse_args()
+
+    layout = booking_tool.SeatLayout([args.width] * args.rows)
+    rng = random.Random(7)
+    print(f"{layout.capacity}-seat auditorium, {args.occupancy:.0%} sold")
+    print(f"{'inventory':<10}{'showings':>10}{'reserve/s':>12}{'count/s':>12}{'B/showing':>11}")
+
+    inventories = [
+        ("memory", booking_tool.MemorySeatInventory(layout), args.showings),
+        ("sqlite", booking_tool.SQLiteSeatInventory(booking_tool.SQLiteBookingStore(
+            os.path.join(tempfile.mkdtemp(prefix="seat_bench_"), "bookings.db")), layout), args.sqlite_showings),
+    ]
+    for name, inventory, showings in inventories:
+        keys = [booking_tool.showing_key(str(19000 + i % 500), str(340000 + i), "2026-10-17", "19:30")
+                for i in range(showings)]
+        start = time.perf_counter()
+        reservations = fill(inventory, keys, args.occupancy, rng)
+        reserve_rate = reservations / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for key in keys:
+            inventory.available_count(key)
+        count_rate = len(keys) / (time.perf_counter() - start)
+        per_showing = f"{retained_bytes(inventory) / showings:.0f}" if name == "memory" else "-"
+        print(f"{name:<10}{showings:>10}{reserve_rate:>12.0f}{count_rate:>12.0f}{per_showing:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Microbenchmark: decoding and formatting MovieGlu /cinemaShowTimes/ responses
+
+Compares the original dict-building code (Standard format only, json module)
+with the __slots__ showtime model in cinema_tool (every format, orjson when
+installed). Reports time per response and memory retained per parsed response.
+
+Usage:
+    python benchmarks/bench_showtime_decoding.py [--films 40] [--iterations 200]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tools', 'python', 'cinema_tool', 'source'))
+
+import cinema_tool  # noqa: E402
+
+FORMATS = ["Standard", "IMAX", "3D", "4DX", "Dolby Atmos", "VOST"]
+
+
+def make_payload(films: int, seed: int = 7) -> bytes:
+    """A large cinemaShowTimes response: every film in several formats"""
+    rng = random.Random(seed)
+    payload = {
+        "cinema": {"cinema_id": 8930, "cinema_name": "Pathé Beaugrenelle", "address": "7 Rue Linois", "city": "Paris"},
+        "films": []
+    }
+    for i in range(films):
+        showings = {}
+        for showing_format in rng.sample(FORMATS, rng.randint(2, len(FORMATS))):
+            times = sorted(f"{rng.randint(10, 23):02d}:{rng.choice(['00', '15', '30', '45'])}" for _ in range(rng.randint(3, 8)))
+            showings[showing_format] = {
+                "film_id": 300000 + i,
+                "film_name": f"Film {i}",
+                "times": [{"start_time": t, "end_time": t, "display_start_time": t} for t in times]
+            }
+        payload["films"].append({
+            "film_id": 300000 + i,
+            "imdb_id": 1000000 + i,
+            "film_name": f"Film {i}",
+            "age_rating": [{"rating": "12", "age_rating_image": "https://example.com/12.png", "age_advisory": ""}],
+            "film_image": "https://example.com/poster.jpg",
+            "showings": showings,
+            "show_dates": [{"date": "2026-10-17"}]
+        })
+    return json.dumps(payload).encode()
+
+
+def legacy_format(content: bytes, date: str) -> dict:
+    """The original get_cinema_showtimes formatting (Standard showings only)"""
+    data = json.loads(content)
+    cinema = data.get('cinema', {})
+    formatted_showtimes = {
+        "status": "success",
+        "cinema": {
+            "id": cinema.get('cinema_id'),
+            "name": cinema.get('cinema_name'),
+            "address": cinema.get('address'),
+            "city": cinema.get('city')
+        },
+        "date": date,
+        "films": []
+    }
+    for film in data.get('films', []):
+        film_data = {
+            "id": film.get('film_id'),
+            "title": film.get('film_name'),
+            "age_rating": film.get('age_rating', [{}])[0].get('rating', 'TBC'),
+            "showtimes": []
+        }
+        for showtime in film.get('showings', {}).get('Standard', {}).get('times', []):
+            film_data['showtimes'].append({
+                "start_time": showtime.get('start_time'),
+                "end_time": showtime.get('end_time')
+            })
+        formatted_showtimes['films'].append(film_data)
+    return formatted_showtimes
+
+
+def legacy_format_all(content: bytes, date: str) -> dict:
+    """Dict-building extended to every format, for a like-for-like comparison"""
+    data = json.loads(content)
+    result = legacy_format(content, date)
+    for film_data, film in zip(result['films'], data.get('films', [])):
+        film_data['showtimes'] = [
+            {"start_time": t.get('start_time'), "end_time": t.get('end_time'), "format": name}
+            for name, group in film.get('showings', {}).items()
+            for t in group.get('times', [])
+        ]
+    return result
+
+
+def model_parse(content: bytes, date: str) -> cinema_tool.CinemaSchedule:
+    """The __slots__ model: one-pass parse of every format"""
+    return cinema_tool.CinemaSchedule.from_response(cinema_tool.json_loads(content), date)
+
+
+def time_per_call(fn, content: bytes, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(content, "2026-10-17")
+    return (time.perf_counter() - start) / iterations
+
+
+def retained_bytes(fn, content: bytes, copies: int = 50) -> float:
+    """Memory retained per parsed response (what the showtime cache holds)"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [fn(content, "2026-10-17") for _ in range(copies)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / copies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--films", type=int, default=40)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    content = make_payload(args.films)
+    showings = sum(len(g["times"]) for f in json.loads(content)["films"] for g in f["showings"].values())
+    decoder = "orjson" if cinema_tool.json_loads is not json.loads else "json"
+    print(f"payload: {len(content) / 1024:.1f} KiB, {args.films} films, {showings} showings; model decoder: {decoder}")
+    print(f"{'variant':<28}{'us/response':>14}{'KiB retained':>15}")
+    for name, fn in [("legacy (Standard only)", legacy_format),
+                     ("legacy dicts (all formats)", legacy_format_all),
+                     ("slots model (all formats)", model_parse)]:
+        print(f"{name:<28}{time_per_call(fn, content, args.iterations) * 1e6:>14.1f}"
+              f"{retained_bytes(fn, content) / 1024:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Build (and optionally save) a synthetic cinema world, then time tool lookups
+
+The world is generated with vectorized NumPy into columnar arrays and can be
+saved as .npz or as a directory of .npy files that the simulation tool
+memory-maps (point SIMULATION_WORLD_PATH at it). Reports build time, array
+memory and per-call latency of the three simulated lookup tools.
+
+Usage:
+    python benchmarks/bench_simulation_world.py [--cinemas 20000] [--films 800] [--days 14] [--save PATH]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tools', 'python', 'cinema_simulation_tool', 'source'))
+
+import cinema_simulation_tool as sim  # noqa: E402
+
+
+def time_calls(fn, argument_sets) -> float:
+    start = time.perf_counter()
+    for args in argument_sets:
+        fn(*args)
+    return (time.perf_counter() - start) / len(argument_sets)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cinemas", type=int, default=20000)
+    parser.add_argument("--films", type=int, default=800)
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--save", default="", help="write the world to PATH (.npz or directory)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    world = sim.SimulatedWorld.generate(args.cinemas, args.films, args.days)
+    build = time.perf_counter() - start
+    size = sum(getattr(world, name).nbytes for name in world.ARRAYS)
+    print(f"world: {len(world.cinema_id)} cinemas, {len(world.film_id)} films, {args.days} days, "
+          f"{len(world.showing_film)} showings; built in {build:.2f}s, {size / 2 ** 20:.1f} MiB")
+    if args.save:
+        start = time.perf_counter()
+        world.save(args.save)
+        world = sim.SimulatedWorld.load(args.save)
+        print(f"saved and reloaded {args.save} in {time.perf_counter() - start:.2f}s")
+    sim._WORLD = world
+
+    rng = random.Random(11)
+    dates = [str(world.start_date[0] + day) for day in range(args.days)]
+    cinema_ids = [str(world.cinema_id[rng.randrange(len(world.cinema_id))]) for _ in range(args.queries)]
+    film_ids = [str(world.film_id[rng.randrange(len(world.film_id))]) for _ in range(args.queries)]
+    points = [(float(world.cinema_lat[i]), float(world.cinema_lng[i])) for i in
+              (rng.randrange(len(world.cinema_id)) for _ in range(args.queries))]
+
+    print(f"{'tool':<24}{'us/call':>12}")
+    for name, fn, argument_sets in [
+        ("find_cinemas_nearby", sim.find_cinemas_nearby.fn, [(lat, lng, 5) for lat, lng in points]),
+        ("get_cinema_showtimes", sim.get_cinema_showtimes.fn, [(c, "", rng.choice(dates)) for c in cinema_ids]),
+        ("check_film_showtimes", sim.check_film_showtimes.fn,
+         [(f, rng.choice(dates), lat, lng) for f, (lat, lng) in zip(film_ids, points)]),
+    ]:
+        print(f"{name:<24}{time_calls(fn, argument_sets) * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: KD-tree vs linear scan for simulated cinema radius / k-nearest search
+
+Cinemas are clustered around French cities like the simulated world. For each
+size, compares the CinemaKDTree in cinema_simulation_tool with a vectorized
+NumPy haversine scan (and a pure-Python scan for the smaller sizes), checking
+that all methods return the same cinemas and distances.
+
+Usage:
+    python benchmarks/bench_spatial_index.py [--sizes 1000 10000 100000] [--radius 5] [--k 10]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tools', 'python', 'cinema_simulation_tool', 'source'))
+
+import cinema_simulation_tool as sim  # noqa: E402
+
+
+def make_cinemas(count: int, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    weights = np.array([city[3] for city in sim.WORLD_CITIES], dtype=np.float64)
+    city = rng.choice(len(sim.WORLD_CITIES), size=count, p=weights / weights.sum())
+    centre = np.array([(c[1], c[2], c[6]) for c in sim.WORLD_CITIES])[city]
+    lat = centre[:, 0] + rng.normal(0, 1, count) * centre[:, 2]
+    lng = centre[:, 1] + rng.normal(0, 1, count) * centre[:, 2] / np.cos(np.radians(centre[:, 0]))
+    return lat, lng
+
+
+def linear_numpy(lat, lng, qlat, qlng, k, radius):
+    distance = sim.haversine_miles(qlat, qlng, lat, lng)
+    within = np.flatnonzero(distance <= radius)
+    within = within[np.argsort(distance[within], kind="stable")][:k]
+    return within, distance[within]
+
+
+def linear_python(points, qlat, qlng, k, radius):
+    found = []
+    for i, (plat, plng) in enumerate(points):
+        d = sim.calculate_distance(qlat, qlng, plat, plng)
+        if d <= radius:
+            found.append((d, i))
+    found.sort()
+    return [i for _, i in found[:k]]
+
+
+def per_query(fn, queries) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        fn(*query)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--radius", type=float, default=5.0)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"radius {args.radius} mi, k={args.k}")
+    print(f"{'cinemas':>8}{'build ms':>10}{'kd-tree us':>12}{'numpy scan us':>15}{'python scan us':>16}")
+    for size in args.sizes:
+        lat, lng = make_cinemas(size)
+        start = time.perf_counter()
+        tree = sim.CinemaKDTree(lat, lng)
+        build = time.perf_counter() - start
+
+        rng = np.random.default_rng(5)
+        picks = rng.integers(0, size, args.queries)
+        queries = [(float(lat[i]) + rng.normal(0, 0.02), float(lng[i]) + rng.normal(0, 0.02)) for i in picks]
+
+        for qlat, qlng in queries[:50]:
+            idx, miles = tree.query(qlat, qlng, k=args.k, radius=args.radius)
+            expected, expected_miles = linear_numpy(lat, lng, qlat, qlng, args.k, args.radius)
+            assert np.allclose(miles, expected_miles), "KD-tree and linear scan disagree"
+
+        kd = per_query(lambda a, b: tree.query(a, b, k=args.k, radius=args.radius), queries)
+        scan = per_query(lambda a, b: linear_numpy(lat, lng, a, b, args.k, args.radius), queries)
+        python_scan = "-"
+        if size <= 20000:
+            points = list(zip(lat.tolist(), lng.tolist()))
+            python_scan = f"{per_query(lambda a, b: linear_python(points, a, b, args.k, args.radius), queries[:20]) * 1e6:.0f}"
+        print(f"{size:>8}{build * 1e3:>10.1f}{kd * 1e6:>12.1f}{scan * 1e6:>15.1f}{python_scan:>16}")
+
+
+if __name__ == "__main__":
+    main()
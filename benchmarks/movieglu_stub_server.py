@@ -0,0 +1,282 @@
+"""
+Local MovieGlu-compatible stand-in server driven by the cinema simulation tool
+
+Serves /cinemasNearby/, /cinemaShowTimes/, /filmLiveSearch/ and
+/filmShowTimes/ in MovieGlu's raw response schema, answered from
+cinema_simulation_tool (its pre-generated world when numpy is installed).
+Latency, 5xx errors, 429 throttling and server concurrency are configurable
+so the real cinema_tool client can be load-tested offline:
+
+    python benchmarks/movieglu_stub_server.py --port 8099 --latency lognormal:40:0.5 --throttle-rate 0.02
+    MOVIEGLU_BASE_URL=http://127.0.0.1:8099 MOVIEGLU_DAILY_QUOTA=1000000 python ...
+
+GET /__stats__ returns request counts per endpoint and status code.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tools', 'python', 'cinema_simulation_tool', 'source'))
+
+import cinema_simulation_tool as sim  # noqa: E402
+
+DEFAULT_GEOLOCATION = "48.8566;2.3522"
+NEARBY_RADIUS_MILES = 25
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Latency sampler (seconds) from a spec in milliseconds:
+    none | fixed:MS | uniform:LO:HI | lognormal:MEDIAN:SIGMA | exponential:MEAN"""
+    kind, _, args = (spec or "none").partition(":")
+    values = [float(v) for v in args.split(":") if v]
+    if kind == "none":
+        return lambda rng: 0.0
+    if kind == "fixed":
+        return lambda rng: values[0] / 1000
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == "lognormal":
+        return lambda rng: values[0] / 1000 * rng.lognormvariate(0.0, values[1])
+    if kind == "exponential":
+        return lambda rng: rng.expovariate(1000 / values[0])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def status_block(count: int) -> Dict[str, Any]:
+    return {
+        "count": count,
+        "state": "OK",
+        "method": "stub",
+        "message": None,
+        "request_method": "GET",
+        "version": "v201",
+        "territory": "FR",
+        "device_datetime_sent": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        "device_datetime_used": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+
+def age_rating(rating: str) -> list:
+    return [{"rating": rating, "age_rating_image": f"https://example.com/age_{rating}.png", "age_advisory": ""}]
+
+
+def raw_showings(film_id: int, title: str, showtimes: list) -> Dict[str, Any]:
+    return {"Standard": {
+        "film_id": film_id,
+        "film_name": title,
+        "times": [{"start_time": t["start_time"], "end_time": t["end_time"]} for t in showtimes]
+    }}
+
+
+def cinemas_nearby(params: Dict[str, str], latitude: float, longitude: float) -> Dict[str, Any]:
+    limit = int(params.get("n", 10))
+    result = sim.find_cinemas_nearby.fn(latitude, longitude, NEARBY_RADIUS_MILES)
+    cinemas = [{
+        "cinema_id": c["id"],
+        "cinema_name": c["name"],
+        "address": c["address"],
+        "city": c["city"],
+        "postcode": c.get("postcode"),
+        "lat": c["lat"],
+        "lng": c["lng"],
+        "distance": c["distance"],
+        "logo_url": f"https://example.com/cinema_{c['id']}.png"
+    } for c in result["cinemas"][:limit]]
+    return {"cinemas": cinemas, "status": status_block(len(cinemas))}
+
+
+def cinema_show_times(params: Dict[str, str], latitude: float, longitude: float) -> Dict[str, Any]:
+    result = sim.get_cinema_showtimes.fn(params["cinema_id"], params.get("film_id", ""), params.get("date", ""))
+    cinema = result["cinema"]
+    films = [{
+        "film_id": f["id"],
+        "imdb_id": None,
+        "film_name": f["title"],
+        "age_rating": age_rating(f["age_rating"]),
+        "film_image": f"https://example.com/poster_{f['id']}.jpg",
+        "showings": raw_showings(f["id"], f["title"], f["showtimes"]),
+        "show_dates": [{"date": result["date"]}]
+    } for f in result["films"]]
+    return {
+        "cinema": {"cinema_id": cinema["id"], "cinema_name": cinema["name"],
+                   "address": cinema["address"], "city": cinema["city"]},
+        "films": films,
+        "status": status_block(len(films))
+    }
+
+
+def film_live_search(params: Dict[str, str], latitude: float, longitude: float) -> Dict[str, Any]:
+    film = sim.search_film_by_title.fn(params["query"])["film"]
+    image = lambda url: {"1": {"medium": {"film_image": url, "width": 200, "height": 300}}}  # noqa: E731
+    films = [{
+        "film_id": film["movieglu_id"],
+        "imdb_id": None,
+        "film_name": film["title"],
+        "release_dates": [{"release_date": film["release_date"], "notes": ""}],
+        "age_rating": age_rating(film["age_rating"]),
+        "synopsis_long": film["synopsis"],
+        "genres": [{"genre_id": i, "genre_name": name} for i, name in enumerate(film["genres"])],
+        "cast": [{"cast_id": i, "cast_name": name} for i, name in enumerate(film["cast"])],
+        "directors": [{"director_id": i, "director_name": name} for i, name in enumerate(film["directors"])],
+        "duration_mins": film["duration_mins"],
+        "images": {"poster": image(film["images"]["poster"]), "still": image(film["images"]["still"])}
+    }]
+    return {"films": films[:int(params.get("n", 5))], "status": status_block(len(films))}
+
+
+def film_show_times(params: Dict[str, str], latitude: float, longitude: float) -> Dict[str, Any]:
+    result = sim.check_film_showtimes.fn(params["film_id"], params.get("date", ""), latitude, longitude)
+    film = result["film"]
+    cinemas = [{
+        "cinema_id": c["id"],
+        "cinema_name": c["name"],
+        "address": c["address"],
+        "city": c["city"],
+        "distance": c["distance"],
+        "logo_url": f"https://example.com/cinema_{c['id']}.png",
+        "showings": raw_showings(film["id"], film["title"], c["showtimes"])
+    } for c in result["cinemas"][:int(params.get("n", 10))]]
+    return {
+        "film": {"film_id": film["id"], "film_name": film["title"], "age_rating": age_rating(film["age_rating"])},
+        "cinemas": cinemas,
+        "status": status_block(len(cinemas))
+    }
+
+
+ENDPOINTS = {
+    "/cinemasNearby/": cinemas_nearby,
+    "/cinemaShowTimes/": cinema_show_times,
+    "/filmLiveSearch/": film_live_search,
+    "/filmShowTimes/": film_show_times,
+}
+
+
+class MovieGluStubServer:
+    """Threaded MovieGlu stand-in with latency, error and throttle injection"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: str = "none",
+                 error_rate: float = 0.0, throttle_rate: float = 0.0, retry_after: float = 1.0,
+                 max_concurrency: int = 64, seed: Optional[int] = None):
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.rng = random.Random(seed)
+        self.stats = {}
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, path: str, status: int) -> None:
+        with self._lock:
+            by_status = self.stats.setdefault(path, {})
+            by_status[str(status)] = by_status.get(str(status), 0) + 1
+
+    def _draw(self) -> tuple:
+        """(delay, fault) for one request; fault is None, 429 or 500"""
+        with self._lock:
+            delay = max(self.latency(self.rng), 0.0)
+            roll = self.rng.random()
+        if roll < self.throttle_rate:
+            return delay, 429
+        if roll < self.throttle_rate + self.error_rate:
+            return delay, 500
+        return delay, None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+                server._count(urlparse(self.path).path, status)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == "/__stats__":
+                    with server._lock:
+                        return self._reply(200, {"requests": server.stats})
+                handler = ENDPOINTS.get(url.path)
+                if handler is None:
+                    return self._reply(404, {"status": {"state": "NOT_FOUND", "message": url.path}})
+                with server.slots:
+                    delay, fault = server._draw()
+                    time.sleep(delay)
+                    if fault == 429:
+                        return self._reply(429, {"status": {"state": "RATE_LIMITED"}},
+                                           {"Retry-After": f"{server.retry_after:g}"})
+                    if fault == 500:
+                        return self._reply(500, {"status": {"state": "ERROR", "message": "Injected failure"}})
+                    params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                    try:
+                        lat, _, lng = (self.headers.get("geolocation") or DEFAULT_GEOLOCATION).partition(";")
+                        body = handler(params, float(lat), float(lng))
+                    except (KeyError, ValueError) as e:
+                        return self._reply(400, {"status": {"state": "BAD_REQUEST", "message": str(e)}})
+                    self._reply(200, body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "MovieGluStubServer":
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", default="none",
+                        help="none | fixed:MS | uniform:LO:HI | lognormal:MEDIAN:SIGMA | exponential:MEAN")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests answered 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on 429")
+    parser.add_argument("--max-concurrency", type=int, default=64, help="requests served at once; the rest queue")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = MovieGluStubServer(args.host, args.port, args.latency, args.error_rate, args.throttle_rate,
+                                args.retry_after, args.max_concurrency, args.seed)
+    print(f"MovieGlu stand-in listening on {server.url} (MOVIEGLU_BASE_URL={server.url})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,1015 @@ Booking Tool for watsonx Orchestrate
 Simulated booking functionality for educational purposes
 """
 
+import os
+import json
 import uuid
-from typing import List, Dict, Any
+import time
+import sqlite3
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from ibm_watsonx_orchestrate.agent_builder.tools import tool
 import random
 
-# Simulated booking storage
-BOOKINGS = {}
+# Booking storage: "sqlite" (persistent, shared across processes) or "memory"
+CACHE_DIR = os.getenv('CINEMA_AGENT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'cinema_agent'))
+BOOKING_STORE_BACKEND = os.getenv('BOOKING_STORE', 'sqlite')
+BOOKING_DB_PATH = os.getenv('BOOKING_DB_PATH', os.path.join(CACHE_DIR, 'bookings.db'))
+BOOKING_DB_TIMEOUT = float(os.getenv('BOOKING_DB_TIMEOUT', '10'))
+
+# Seat inventory: auditorium shape, premium rows and prices
+SEAT_ROWS = int(os.getenv('SEAT_ROWS', '6'))
+SEAT_ROW_WIDTH = int(os.getenv('SEAT_ROW_WIDTH', '10'))
+SEAT_PREMIUM_ROWS = [row.strip().upper() for row in os.getenv('SEAT_PREMIUM_ROWS', 'E,F').split(',') if row.strip()]
+SEAT_PRICE_STANDARD = float(os.getenv('SEAT_PRICE_STANDARD', '12.00'))
+SEAT_PRICE_PREMIUM = float(os.getenv('SEAT_PRICE_PREMIUM', '15.00'))
+SEAT_PREFERRED_ROWS = [row.strip().upper() for row in os.getenv('SEAT_PREFERRED_ROWS', ','.join(SEAT_PREMIUM_ROWS)).split(',') if row.strip()]
+SEAT_ROW_WEIGHT = float(os.getenv('SEAT_ROW_WEIGHT', '2.0'))
+SEAT_INVENTORY_LOCKS = int(os.getenv('SEAT_INVENTORY_LOCKS', '64'))
+
+# Seat holds: default and maximum hold time, expiry wheel resolution
+SEAT_HOLD_TTL = int(os.getenv('SEAT_HOLD_TTL', '600'))
+SEAT_HOLD_MAX_TTL = int(os.getenv('SEAT_HOLD_MAX_TTL', '1800'))
+SEAT_HOLD_TICK = float(os.getenv('SEAT_HOLD_TICK', '1.0'))
+SEAT_HOLD_WHEEL_SLOTS = int(os.getenv('SEAT_HOLD_WHEEL_SLOTS', '2048'))
+SEAT_HOLD_REAPER = os.getenv('SEAT_HOLD_REAPER', 'true').lower() == 'true'
+BOOKING_FEE = 1.50
+
+
+class BookingStore(ABC):
+    """Booking storage interface: lookups by id and by the indexed fields"""
+
+    def put(self, booking: Dict[str, Any]) -> None:
+        """Insert or replace one booking"""
+        self.put_many([booking])
+
+    @abstractmethod
+    def put_many(self, bookings: List[Dict[str, Any]]) -> None:
+        """Insert or replace several bookings"""
+
+    @abstractmethod
+    def get(self, booking_id: str) -> Optional[Dict[str, Any]]:
+        """The booking with this id, or None"""
+
+    @abstractmethod
+    def compare_and_set(self, booking: Dict[str, Any], expected_status: str) -> bool:
+        """Replace a booking only if its stored status is still expected_status"""
+
+    @abstractmethod
+    def find(self, field: str, value: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """Bookings by customer_email, showtime or status (newest first)"""
+
+    def find_by_email(self, email: str, limit: int = 100) -> List[Dict[str, Any]]:
+        return self.find("customer_email", email, limit)
+
+    def find_by_showtime(self, showtime: str, limit: int = 100) -> List[Dict[str, Any]]:
+        return self.find("showtime", showtime, limit)
+
+    def find_by_status(self, status: str, limit: int = 100) -> List[Dict[str, Any]]:
+        return self.find("status", status, limit)
+
+    @staticmethod
+    def index_values(booking: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "customer_email": (booking.get("customer") or {}).get("email", "").strip().lower(),
+            "showtime": booking.get("showtime", ""),
+            "status": booking.get("status", "")
+        }
+
+
+class MemoryBookingStore(BookingStore):
+    """Process-local store (the original dict) with in-memory secondary indexes"""
+
+    INDEXED = ("customer_email", "showtime", "status")
+
+    def __init__(self):
+        self.bookings = {}
+        self.indexes = {field: {} for field in self.INDEXED}
+        self._lock = threading.Lock()
+
+    def _unindex(self, booking: Dict[str, Any]) -> None:
+        for field, value in self.index_values(booking).items():
+            self.indexes[field].get(value, {}).pop(booking["booking_id"], None)
+
+    def put_many(self, bookings: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            for booking in bookings:
+                old = self.bookings.get(booking["booking_id"])
+                if old is not None:
+                    self._unindex(old)
+                stored = json.loads(json.dumps(booking))
+                self.bookings[booking["booking_id"]] = stored
+                for field, value in self.index_values(stored).items():
+                    self.indexes[field].setdefault(value, {})[booking["booking_id"]] = None
+
+    def get(self, booking_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            booking = self.bookings.get(booking_id)
+            return json.loads(json.dumps(booking)) if booking is not None else None
+
+    def compare_and_set(self, booking: Dict[str, Any], expected_status: str) -> bool:
+        with self._lock:
+            old = self.bookings.get(booking["booking_id"])
+            if old is None or old.get("status") != expected_status:
+                return False
+            self._unindex(old)
+            stored = json.loads(json.dumps(booking))
+            self.bookings[booking["booking_id"]] = stored
+            for field, value in self.index_values(stored).items():
+                self.indexes[field].setdefault(value, {})[booking["booking_id"]] = None
+            return True
+
+    def find(self, field: str, value: str, limit: int = 100) -> List[Dict[str, Any]]:
+        if field not in self.indexes:
+            raise ValueError(f"Not an indexed field: {field}")
+        if field == "customer_email":
+            value = value.strip().lower()
+        with self._lock:
+            ids = list(self.indexes[field].get(value, {}))[::-1][:limit]
+            return [json.loads(json.dumps(self.bookings[i])) for i in ids]
+
+
+class _WriteBatch:
+    """Statements queued by concurrent writers and committed in one transaction"""
+
+    def __init__(self):
+        self.ops = []      # (sql, params)
+        self.results = []  # rowcount of each op, filled in by the committing thread
+        self.done = threading.Event()
+        self.error = None
+
+
+class SQLiteBookingStore(BookingStore):
+    """
+    SQLite booking store (WAL mode) with secondary indexes
+    
+    Each thread gets its own connection; statements are fixed, parameterized
+    SQL so sqlite3 reuses the prepared statements. Concurrent writes are
+    group-committed: writers that arrive while a commit is in progress join
+    the next batch, which runs in one transaction. put_many writes a list of
+    bookings with executemany. The write lock is retried with short jittered
+    sleeps rather than SQLite's coarse busy handler, which matters when
+    several processes share the file.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS bookings ("
+        " booking_id TEXT PRIMARY KEY,"
+        " customer_email TEXT NOT NULL,"
+        " showtime TEXT NOT NULL,"
+        " status TEXT NOT NULL,"
+        " created_at TEXT NOT NULL,"
+        " data TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS bookings_email ON bookings (customer_email, created_at)",
+        "CREATE INDEX IF NOT EXISTS bookings_showtime ON bookings (showtime, created_at)",
+        "CREATE INDEX IF NOT EXISTS bookings_status ON bookings (status, created_at)",
+    )
+    UPSERT = ("INSERT OR REPLACE INTO bookings (booking_id, customer_email, showtime, status, created_at, data) "
+              "VALUES (?, ?, ?, ?, ?, ?)")
+    SELECT = "SELECT data FROM bookings WHERE booking_id = ?"
+    CAS = ("UPDATE bookings SET customer_email = ?, showtime = ?, status = ?, data = ? "
+           "WHERE booking_id = ? AND status = ?")
+    FIND = {
+        field: f"SELECT data FROM bookings WHERE {field} = ? ORDER BY created_at DESC LIMIT ?"
+        for field in ("customer_email", "showtime", "status")
+    }
+
+    def __init__(self, path: str = BOOKING_DB_PATH, timeout: float = BOOKING_DB_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._open_batch = None
+        self.batches = 0
+        self.batched_ops = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self.transaction() as conn:
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+        self._conn().execute("PRAGMA journal_mode=WAL")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # busy_timeout 0: lock waits are handled by _begin
+            conn = sqlite3.connect(self.path, timeout=0, isolation_level=None, cached_statements=64)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """This thread's connection, for reads outside a transaction"""
+        return self._conn()
+
+    def _begin(self, conn: sqlite3.Connection) -> None:
+        """BEGIN IMMEDIATE, retrying a locked database with short jittered sleeps"""
+        deadline = time.monotonic() + self.timeout
+        delay = 0.0005
+        while True:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                return
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e) and "busy" not in str(e):
+                    raise
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(random.uniform(0, delay))
+                delay = min(delay * 2, 0.01)
+
+    def _row(self, booking: Dict[str, Any]) -> tuple:
+        index = self.index_values(booking)
+        return (booking["booking_id"], index["customer_email"], index["showtime"], index["status"],
+                booking.get("created_at") or datetime.now().isoformat(), json.dumps(booking, ensure_ascii=False))
+
+    @contextmanager
+    def transaction(self):
+        """A write transaction on this thread's connection, serialized with the other writers"""
+        with self._write_lock:
+            conn = self._conn()
+            self._begin(conn)
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def put_many(self, bookings: List[Dict[str, Any]]) -> None:
+        """Write many bookings in one transaction"""
+        rows = [self._row(booking) for booking in bookings]
+        with self.transaction() as conn:
+            conn.executemany(self.UPSERT, rows)
+        self.batches += 1
+        self.batched_ops += len(rows)
+
+    def _submit(self, sql: str, params: tuple) -> int:
+        """Run one write statement, group-committed with concurrent writers; returns its rowcount"""
+        with self._lock:
+            batch = self._open_batch
+            leader = batch is None
+            if leader:
+                batch = self._open_batch = _WriteBatch()
+            position = len(batch.ops)
+            batch.ops.append((sql, params))
+        if leader:
+            with self._write_lock:
+                with self._lock:
+                    self._open_batch = None  # later writers start the next batch
+                try:
+                    conn = self._conn()
+                    self._begin(conn)
+                    try:
+                        batch.results = [conn.execute(op_sql, op_params).rowcount for op_sql, op_params in batch.ops]
+                    except BaseException:
+                        conn.execute("ROLLBACK")
+                        raise
+                    conn.execute("COMMIT")
+                    self.batches += 1
+                    self.batched_ops += len(batch.ops)
+                except BaseException as e:
+                    batch.error = e  # every writer in the batch sees the failure, not just the leader
+                finally:
+                    batch.done.set()
+        else:
+            batch.done.wait()
+        if batch.error is not None:
+            raise batch.error
+        return batch.results[position]
+
+    def put(self, booking: Dict[str, Any]) -> None:
+        """Write one booking, group-committed with concurrent writers"""
+        self._submit(self.UPSERT, self._row(booking))
+
+    def get(self, booking_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(self.SELECT, (booking_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def compare_and_set(self, booking: Dict[str, Any], expected_status: str) -> bool:
+        index = self.index_values(booking)
+        return self._submit(self.CAS, (index["customer_email"], index["showtime"], index["status"],
+                                       json.dumps(booking, ensure_ascii=False),
+                                       booking["booking_id"], expected_status)) == 1
+
+    def find(self, field: str, value: str, limit: int = 100) -> List[Dict[str, Any]]:
+        if field not in self.FIND:
+            raise ValueError(f"Not an indexed field: {field}")
+        if field == "customer_email":
+            value = value.strip().lower()
+        return [json.loads(row[0]) for row in self._conn().execute(self.FIND[field], (value, limit))]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"batches": self.batches, "rows": self.batched_ops,
+                "rows_per_batch": round(self.batched_ops / self.batches, 2) if self.batches else 0.0}
+
+
+def make_booking_store(backend: str = BOOKING_STORE_BACKEND) -> BookingStore:
+    """Booking store for the configured backend"""
+    if backend == "memory":
+        return MemoryBookingStore()
+    if backend == "sqlite":
+        return SQLiteBookingStore()
+    raise ValueError(f"Unknown booking store: {backend}")
+
+
+# Module-level store shared by every booking tool
+BOOKING_STORE = make_booking_store()
+
+
+if hasattr(int, "bit_count"):
+    def popcount(value: int) -> int:
+        return value.bit_count()
+else:
+    def popcount(value: int) -> int:
+        return bin(value).count("1")
+
+
+def iter_bits(mask: int):
+    """Indexes of the set bits of mask, lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def row_label(index: int) -> str:
+    """A, B, ..., Z, AA, AB, ... for row 0, 1, ..."""
+    label = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        label = chr(ord("A") + remainder) + label
+    return label
+
+
+class SeatLayout:
+    """
+    Auditorium layout with one bit per seat
+    
+    Seat number n of row r is bit offsets[r] + n - 1, so the taken seats of a
+    showing are a single int and every availability question is a mask and a
+    popcount. One layout is shared by all showings of that shape.
+    """
+
+    def __init__(self, widths: List[int], premium_rows: List[str] = ("E", "F"),
+                 prices: Optional[Dict[str, float]] = None):
+        self.rows = [row_label(i) for i in range(len(widths))]
+        self.widths = list(widths)
+        self.offsets = []
+        self.row_masks = []
+        offset = 0
+        for width in self.widths:
+            self.offsets.append(offset)
+            self.row_masks.append(((1 << width) - 1) << offset)
+            offset += width
+        self.capacity = offset
+        self.full_mask = (1 << offset) - 1
+        self.row_start_mask = sum(1 << o for o in self.offsets)
+        self.row_index = {row: i for i, row in enumerate(self.rows)}
+        self.premium_mask = 0
+        for row in premium_rows:
+            if row in self.row_index:
+                self.premium_mask |= self.row_masks[self.row_index[row]]
+        self.prices = prices or {"standard": SEAT_PRICE_STANDARD, "premium": SEAT_PRICE_PREMIUM}
+
+    def bit(self, row: str, number: int) -> int:
+        i = self.row_index.get(row.strip().upper())
+        if i is None or not 1 <= int(number) <= self.widths[i]:
+            raise ValueError(f"No seat {row}{number} in this auditorium")
+        return self.offsets[i] + int(number) - 1
+
+    def parse(self, labels: str) -> int:
+        """Mask for seat labels such as "E5, E6" """
+        mask = 0
+        for label in labels.replace(";", ",").split(","):
+            label = label.strip().upper()
+            if not label:
+                continue
+            row = label.rstrip("0123456789")
+            if not row or row == label:
+                raise ValueError(f"Invalid seat label: {label}")
+            mask |= 1 << self.bit(row, int(label[len(row):]))
+        return mask
+
+    def seat_type(self, bit: int) -> str:
+        return "premium" if self.premium_mask >> bit & 1 else "standard"
+
+    def seat(self, bit: int) -> Dict[str, Any]:
+        i = bisect_right(self.offsets, bit) - 1
+        seat_type = self.seat_type(bit)
+        return {"row": self.rows[i], "number": str(bit - self.offsets[i] + 1),
+                "type": seat_type, "price": self.prices[seat_type]}
+
+    def seats(self, mask: int) -> List[Dict[str, Any]]:
+        return [self.seat(bit) for bit in iter_bits(mask)]
+
+    def blocks(self, mask: int) -> int:
+        """Number of separate runs of adjacent seats in mask"""
+        continued = (mask << 1) & ~self.row_start_mask
+        return popcount(mask & ~continued)
+
+    def price(self, mask: int) -> float:
+        premium = popcount(mask & self.premium_mask)
+        return premium * self.prices["premium"] + (popcount(mask) - premium) * self.prices["standard"]
+
+    def to_bytes(self, mask: int) -> bytes:
+        return mask.to_bytes((self.capacity + 7) // 8, "little")
+
+    @staticmethod
+    def from_bytes(data: bytes) -> int:
+        return int.from_bytes(data, "little")
+
+
+# Auditorium shape used for every showing
+SEAT_LAYOUT = SeatLayout([SEAT_ROW_WIDTH] * SEAT_ROWS, SEAT_PREMIUM_ROWS)
+
+
+SHOWING_FIELDS = ("cinema_id", "film_id", "date", "showtime")
+
+
+def showing_key(cinema_id: str, film_id: str, date: str, showtime: str) -> str:
+    """Inventory key of one showing"""
+    return "|".join(str(part).strip() for part in (cinema_id, film_id, date, showtime))
+
+
+def unidentified_showing(cinema_id: str, film_id: str) -> Optional[Dict[str, Any]]:
+    """Error for a showing without a cinema or film, whose seats would be shared by every cinema"""
+    missing = [name for name, value in (("cinema_id", cinema_id), ("film_id", film_id)) if not str(value or "").strip()]
+    if missing:
+        return {"error": f"{' and '.join(missing)} {'are' if len(missing) > 1 else 'is'} required to identify the showing: "
+                         f"use the same cinema_id and film_id as for check_seat_availability"}
+    return None
+
+
+def parse_showing_key(key: str) -> Dict[str, str]:
+    """cinema_id, film_id, date and showtime of an inventory key"""
+    return dict(zip(SHOWING_FIELDS, key.split("|", len(SHOWING_FIELDS) - 1)))
+
+
+class SeatAllocator:
+    """
+    Best-available seat picker for a layout
+    
+    Starts of n adjacent free seats are found for the whole house at once by
+    AND-ing the free mask with shifted copies of itself (log n shifts),
+    restricted to starts where the block stays inside one row. A block costs
+    row_weight seats per row away from the preferred rows plus the distance
+    of its centre from the row centre; rows are visited cheapest first and
+    the search stops once no later row can beat the best block. With no
+    block long enough the seats are split over as few blocks as possible.
+    """
+
+    def __init__(self, layout: SeatLayout, preferred_rows: List[str] = SEAT_PREFERRED_ROWS,
+                 row_weight: float = SEAT_ROW_WEIGHT):
+        self.layout = layout
+        preferred = [layout.row_index[row] for row in preferred_rows if row in layout.row_index]
+        if not preferred:
+            preferred = [(len(layout.rows) - 1) // 2]
+        self.row_cost = [row_weight * min(abs(i - p) for p in preferred) for i in range(len(layout.rows))]
+        self.row_order = sorted(range(len(layout.rows)), key=lambda i: self.row_cost[i])
+        self._starts = {}
+
+    def _valid_starts(self, count: int) -> int:
+        """Bits where a block of count seats fits inside its row"""
+        mask = self._starts.get(count)
+        if mask is None:
+            mask = 0
+            for offset, width in zip(self.layout.offsets, self.layout.widths):
+                if width >= count:
+                    mask |= ((1 << (width - count + 1)) - 1) << offset
+            self._starts[count] = mask
+        return mask
+
+    @staticmethod
+    def block_starts(free: int, count: int) -> int:
+        """Bits j of free with j..j+count-1 all set"""
+        starts, length = free, 1
+        while length * 2 <= count:
+            starts &= starts >> length
+            length *= 2
+        if length < count:
+            starts &= starts >> (count - length)
+        return starts
+
+    def _cost(self, row: int, start: int, count: int) -> float:
+        return self.row_cost[row] + abs(start - (self.layout.widths[row] - count) / 2)
+
+    def contiguous(self, taken: int, count: int) -> int:
+        """Best block of count adjacent free seats in one row (0 if none)"""
+        layout = self.layout
+        starts = self.block_starts(layout.full_mask & ~taken, count) & self._valid_starts(count)
+        if not starts:
+            return 0
+        best_cost, best_bit = None, None
+        for row in self.row_order:
+            if best_cost is not None and self.row_cost[row] >= best_cost:
+                break
+            width = layout.widths[row]
+            row_starts = (starts >> layout.offsets[row]) & ((1 << width) - 1)
+            if not row_starts:
+                continue
+            # Nearest start on either side of the centred position
+            centre = (width - count) // 2
+            candidates = []
+            right = row_starts >> centre
+            if right:
+                candidates.append(centre + (right & -right).bit_length() - 1)
+            left = row_starts & ((1 << (centre + 1)) - 1)
+            if left:
+                candidates.append(left.bit_length() - 1)
+            for start in candidates:
+                cost = self._cost(row, start, count)
+                if best_cost is None or cost < best_cost:
+                    best_cost, best_bit = cost, layout.offsets[row] + start
+        return ((1 << count) - 1) << best_bit
+
+    def free_runs(self, taken: int) -> List[tuple]:
+        """(length, row, start) of every maximal run of free seats"""
+        layout = self.layout
+        free = layout.full_mask & ~taken
+        runs = []
+        for row, (offset, width) in enumerate(zip(layout.offsets, layout.widths)):
+            bits = (free >> offset) & ((1 << width) - 1)
+            while bits:
+                start = (bits & -bits).bit_length() - 1
+                shifted = bits >> start
+                length = (~shifted & (shifted + 1)).bit_length() - 1
+                runs.append((length, row, start))
+                bits &= ~(((1 << length) - 1) << start)
+        return runs
+
+    def _place(self, row: int, run_start: int, run_length: int, count: int) -> int:
+        """Most central start for count seats inside a free run"""
+        ideal = round((self.layout.widths[row] - count) / 2)
+        return min(max(ideal, run_start), run_start + run_length - count)
+
+    def split(self, taken: int, count: int) -> int:
+        """count free seats in as few blocks as possible (0 if fewer are free)"""
+        runs = sorted(self.free_runs(taken),
+                      key=lambda run: (-run[0], self._cost(run[1], run[2], run[0])))
+        mask, needed = 0, count
+        for used, (length, row, start) in enumerate(runs):
+            if length >= needed:
+                # Last block: the best placed run that can still hold the rest
+                length, row, start = min(
+                    (run for run in runs[used:] if run[0] >= needed),
+                    key=lambda run: self._cost(run[1], self._place(run[1], run[2], run[0], needed), needed))
+                start = self._place(row, start, length, needed)
+                return mask | ((1 << needed) - 1) << (self.layout.offsets[row] + start)
+            mask |= ((1 << length) - 1) << (self.layout.offsets[row] + start)
+            needed -= length
+        return 0
+
+    def best(self, taken: int, count: int) -> int:
+        """Best count seats: one contiguous block if possible, else the fewest blocks"""
+        if count <= 0 or popcount(self.layout.full_mask & ~taken) < count:
+            return 0
+        return self.contiguous(taken, count) or self.split(taken, count)
+
+
+# Best-available allocator for SEAT_LAYOUT
+SEAT_ALLOCATOR = SeatAllocator(SEAT_LAYOUT)
+
+
+class SeatInventory(ABC):
+    """
+    Taken-seat bitmaps per showing, keyed by showing_key
+    
+    Showings nobody has booked have no entry at all, so memory grows with
+    the showings actually sold rather than with the programme.
+    """
+
+    def __init__(self, layout: SeatLayout = SEAT_LAYOUT):
+        self.layout = layout
+
+    @abstractmethod
+    def taken(self, key: str) -> int:
+        """Bitmap of the taken seats of a showing"""
+
+    @abstractmethod
+    def claim(self, key: str, choose) -> int:
+        """
+        Atomically take the seats choose(taken) picks (a mask, 0 for none);
+        returns the mask taken, or 0 if the choice overlaps a taken seat
+        """
+
+    def reserve(self, key: str, mask: int) -> bool:
+        """Take every seat in mask, or none of them if any is already taken"""
+        return mask != 0 and self.claim(key, lambda taken: mask) == mask
+
+    @abstractmethod
+    def release(self, key: str, mask: int) -> None:
+        """Give the seats in mask back"""
+
+    def available_count(self, key: str) -> int:
+        return self.layout.capacity - popcount(self.taken(key))
+
+    def is_available(self, key: str, mask: int) -> bool:
+        return not self.taken(key) & mask
+
+    @abstractmethod
+    def hold(self, key: str, choose, token: str, expires_at: float) -> int:
+        """claim() the seats and record them as held under token until expires_at"""
+
+    @abstractmethod
+    def get_hold(self, token: str) -> Optional[tuple]:
+        """(key, mask, expires_at) of a hold, or None"""
+
+    @abstractmethod
+    def attach_hold(self, token: str, booking_id: str, now: float) -> bool:
+        """Tie a live hold to a booking; False if it expired, is gone or already backs a booking"""
+
+    @abstractmethod
+    def drop_hold(self, token: str, release: bool) -> Optional[tuple]:
+        """
+        Remove a hold, giving its seats back if release (expiry) or keeping
+        them taken (conversion to a booking); returns (key, mask, expires_at,
+        booking_id), or None if the hold was already gone
+        """
+
+    @abstractmethod
+    def expired_holds(self, now: float) -> List[str]:
+        """Tokens of the recorded holds due by now"""
+
+    @abstractmethod
+    def load_holds(self) -> List[tuple]:
+        """(token, key, mask, expires_at) of every recorded hold"""
+
+
+class MemorySeatInventory(SeatInventory):
+    """Process-local inventory: a dict of bitmaps behind striped locks"""
+
+    def __init__(self, layout: SeatLayout = SEAT_LAYOUT, stripes: int = SEAT_INVENTORY_LOCKS):
+        super().__init__(layout)
+        self.bitmaps = {}
+        self.holds = {}
+        self.hold_bookings = {}  # token -> booking id
+        self._locks = [threading.Lock() for _ in range(max(stripes, 1))]
+        self._holds_lock = threading.Lock()
+
+    def _lock(self, key: str) -> threading.Lock:
+        return self._locks[hash(key) % len(self._locks)]
+
+    def taken(self, key: str) -> int:
+        return self.bitmaps.get(key, 0)
+
+    def claim(self, key: str, choose) -> int:
+        with self._lock(key):
+            taken = self.bitmaps.get(key, 0)
+            mask = choose(taken) & self.layout.full_mask
+            if not mask or taken & mask:
+                return 0
+            self.bitmaps[key] = taken | mask
+            return mask
+
+    def release(self, key: str, mask: int) -> None:
+        with self._lock(key):
+            taken = self.bitmaps.get(key, 0) & ~mask
+            if taken:
+                self.bitmaps[key] = taken
+            else:
+                self.bitmaps.pop(key, None)
+
+    def hold(self, key: str, choose, token: str, expires_at: float) -> int:
+        with self._lock(key):
+            taken = self.bitmaps.get(key, 0)
+            mask = choose(taken) & self.layout.full_mask
+            if not mask or taken & mask:
+                return 0
+            self.bitmaps[key] = taken | mask
+            with self._holds_lock:
+                self.holds[token] = (key, mask, expires_at)
+            return mask
+
+    def get_hold(self, token: str) -> Optional[tuple]:
+        return self.holds.get(token)
+
+    def attach_hold(self, token: str, booking_id: str, now: float) -> bool:
+        with self._holds_lock:
+            held = self.holds.get(token)
+            if held is None or held[2] <= now or token in self.hold_bookings:
+                return False
+            self.hold_bookings[token] = booking_id
+            return True
+
+    def drop_hold(self, token: str, release: bool) -> Optional[tuple]:
+        with self._holds_lock:
+            held = self.holds.pop(token, None)
+            booking_id = self.hold_bookings.pop(token, None)
+        if held is None:
+            return None
+        if release:
+            self.release(held[0], held[1])
+        return held + (booking_id,)
+
+    def load_holds(self) -> List[tuple]:
+        with self._holds_lock:
+            return [(token,) + held for token, held in self.holds.items()]
+
+    def expired_holds(self, now: float) -> List[str]:
+        return []  # process-local: every hold is already on this process's timing wheel
+
+
+class SQLiteSeatInventory(SeatInventory):
+    """
+    Inventory in the booking database: one row per sold showing holding its
+    bitmap as a little-endian blob, updated read-check-write inside a
+    BEGIN IMMEDIATE transaction so reservations are atomic across processes
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS seat_maps (showing TEXT PRIMARY KEY, taken BLOB NOT NULL) WITHOUT ROWID",
+        "CREATE TABLE IF NOT EXISTS seat_holds ("
+        " token TEXT PRIMARY KEY, showing TEXT NOT NULL, seats BLOB NOT NULL, expires_at REAL NOT NULL,"
+        " booking_id TEXT)",
+        "CREATE INDEX IF NOT EXISTS seat_holds_expiry ON seat_holds (expires_at)",
+    )
+    SELECT = "SELECT taken FROM seat_maps WHERE showing = ?"
+    UPSERT = "INSERT OR REPLACE INTO seat_maps (showing, taken) VALUES (?, ?)"
+    DELETE = "DELETE FROM seat_maps WHERE showing = ?"
+    INSERT_HOLD = "INSERT INTO seat_holds (token, showing, seats, expires_at) VALUES (?, ?, ?, ?)"
+    SELECT_HOLD = "SELECT showing, seats, expires_at, booking_id FROM seat_holds WHERE token = ?"
+    ATTACH_HOLD = ("UPDATE seat_holds SET booking_id = ? "
+                   "WHERE token = ? AND booking_id IS NULL AND expires_at > ?")
+    DELETE_HOLD = "DELETE FROM seat_holds WHERE token = ?"
+    ALL_HOLDS = "SELECT token, showing, seats, expires_at FROM seat_holds"
+    EXPIRED_HOLDS = "SELECT token FROM seat_holds WHERE expires_at <= ?"
+
+    def __init__(self, store: SQLiteBookingStore, layout: SeatLayout = SEAT_LAYOUT):
+        super().__init__(layout)
+        self.store = store
+        with store.transaction() as conn:
+            if conn.execute("SELECT name FROM sqlite_master WHERE name = 'seat_holds'").fetchone() and \
+                    "booking_id" not in [column[1] for column in conn.execute("PRAGMA table_info(seat_holds)")]:
+                conn.execute("ALTER TABLE seat_holds ADD COLUMN booking_id TEXT")  # created before holds were single-use
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+
+    def _read(self, conn: sqlite3.Connection, key: str) -> int:
+        row = conn.execute(self.SELECT, (key,)).fetchone()
+        return self.layout.from_bytes(row[0]) if row else 0
+
+    def _write(self, conn: sqlite3.Connection, key: str, taken: int) -> None:
+        if taken:
+            conn.execute(self.UPSERT, (key, self.layout.to_bytes(taken)))
+        else:
+            conn.execute(self.DELETE, (key,))
+
+    def taken(self, key: str) -> int:
+        return self._read(self.store.connection(), key)
+
+    def claim(self, key: str, choose) -> int:
+        with self.store.transaction() as conn:
+            taken = self._read(conn, key)
+            mask = choose(taken) & self.layout.full_mask
+            if not mask or taken & mask:
+                return 0
+            self._write(conn, key, taken | mask)
+            return mask
+
+    def release(self, key: str, mask: int) -> None:
+        with self.store.transaction() as conn:
+            self._write(conn, key, self._read(conn, key) & ~mask)
+
+    def hold(self, key: str, choose, token: str, expires_at: float) -> int:
+        with self.store.transaction() as conn:
+            taken = self._read(conn, key)
+            mask = choose(taken) & self.layout.full_mask
+            if not mask or taken & mask:
+                return 0
+            self._write(conn, key, taken | mask)
+            conn.execute(self.INSERT_HOLD, (token, key, self.layout.to_bytes(mask), expires_at))
+            return mask
+
+    def get_hold(self, token: str) -> Optional[tuple]:
+        row = self.store.connection().execute(self.SELECT_HOLD, (token,)).fetchone()
+        return (row[0], self.layout.from_bytes(row[1]), row[2]) if row else None
+
+    def attach_hold(self, token: str, booking_id: str, now: float) -> bool:
+        with self.store.transaction() as conn:
+            return conn.execute(self.ATTACH_HOLD, (booking_id, token, now)).rowcount == 1
+
+    def drop_hold(self, token: str, release: bool) -> Optional[tuple]:
+        with self.store.transaction() as conn:
+            row = conn.execute(self.SELECT_HOLD, (token,)).fetchone()
+            if row is None:
+                return None
+            key, mask = row[0], self.layout.from_bytes(row[1])
+            conn.execute(self.DELETE_HOLD, (token,))
+            if release:
+                self._write(conn, key, self._read(conn, key) & ~mask)
+            return key, mask, row[2], row[3]
+
+    def load_holds(self) -> List[tuple]:
+        return [(token, key, self.layout.from_bytes(seats), expires_at)
+                for token, key, seats, expires_at in self.store.connection().execute(self.ALL_HOLDS)]
+
+    def expired_holds(self, now: float) -> List[str]:
+        return [row[0] for row in self.store.connection().execute(self.EXPIRED_HOLDS, (now,))]
+
+
+def make_seat_inventory(store: BookingStore) -> SeatInventory:
+    """Seat inventory kept alongside the booking store"""
+    if isinstance(store, SQLiteBookingStore):
+        return SQLiteSeatInventory(store)
+    return MemorySeatInventory()
+
+
+# Module-level inventory shared by every booking tool
+SEAT_INVENTORY = make_seat_inventory(BOOKING_STORE)
+
+
+class TimingWheel:
+    """
+    Hashed timing wheel of deadlines
+    
+    An entry goes in the slot of its deadline's tick, so schedule and cancel
+    are O(1) and advance() only visits the slots of ticks that have passed;
+    entries a whole revolution or more ahead stay put until their own
+    revolution. Deadlines expire at the first tick boundary after them.
+    """
+
+    def __init__(self, tick: float = SEAT_HOLD_TICK, slots: int = SEAT_HOLD_WHEEL_SLOTS,
+                 now: Optional[float] = None):
+        self.tick = tick
+        self.slots = [{} for _ in range(max(slots, 1))]
+        self.where = {}  # entry -> slot
+        self.current = int((time.time() if now is None else now) // tick) - 1  # last tick processed
+
+    def __len__(self) -> int:
+        return len(self.where)
+
+    def schedule(self, entry: str, deadline: float) -> None:
+        self.cancel(entry)
+        slot = max(int(deadline // self.tick), self.current + 1) % len(self.slots)
+        self.slots[slot][entry] = deadline
+        self.where[entry] = slot
+
+    def cancel(self, entry: str) -> None:
+        slot = self.where.pop(entry, None)
+        if slot is not None:
+            self.slots[slot].pop(entry, None)
+
+    def advance(self, now: float) -> List[tuple]:
+        """(entry, deadline) of every entry due before the current tick"""
+        last = int(now // self.tick) - 1
+        if last <= self.current:
+            return []
+        first = max(self.current + 1, last - len(self.slots) + 1)  # one revolution covers every slot
+        cutoff = (last + 1) * self.tick
+        due = []
+        for tick in range(first, last + 1):
+            bucket = self.slots[tick % len(self.slots)]
+            for entry, deadline in list(bucket.items()):
+                if deadline < cutoff:
+                    del bucket[entry]
+                    del self.where[entry]
+                    due.append((entry, deadline))
+        self.current = last
+        return due
+
+
+class SeatHolds:
+    """
+    Time-limited seat holds on top of the seat inventory
+    
+    A hold takes its seats in the inventory like a booking does and is
+    recorded there with its expiry time, so holds survive restarts and can
+    be converted by any process. A hold backs at most one booking, which
+    moves to "expired" when the hold lapses. Expiry is driven by a timing
+    wheel: on every booking tool call and, when SEAT_HOLD_REAPER is on,
+    from a background thread once per tick. Holds recorded by other
+    processes are not on this wheel, so the inventory is also swept for
+    overdue holds at most once per tick.
+    """
+
+    def __init__(self, inventory: SeatInventory, allocator: SeatAllocator, store: Optional[BookingStore] = None,
+                 tick: float = SEAT_HOLD_TICK, slots: int = SEAT_HOLD_WHEEL_SLOTS, reaper: bool = SEAT_HOLD_REAPER):
+        self.inventory = inventory
+        self.allocator = allocator
+        self.store = store
+        self.wheel = TimingWheel(tick, slots)
+        self.reaper = reaper
+        self._lock = threading.Lock()
+        self._reaper_thread = None
+        self._next_sweep = 0.0
+        self.created = 0
+        self.converted = 0
+        self.expired = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+        # Holds recorded before a restart (or by other processes) expire here too
+        for token, key, mask, expires_at in inventory.load_holds():
+            self.wheel.schedule(token, expires_at)
+
+    def hold(self, key: str, count: int, mask: int = 0, ttl: float = SEAT_HOLD_TTL) -> tuple:
+        """Hold the given seats, or the best count seats; returns (token, mask, expires_at), mask 0 if unavailable"""
+        self.expire()
+        token = f"HOLD-{uuid.uuid4().hex[:10].upper()}"
+        expires_at = time.time() + ttl
+        choose = (lambda taken: mask) if mask else (lambda taken: self.allocator.best(taken, count))
+        held = self.inventory.hold(key, choose, token, expires_at)
+        if held:
+            with self._lock:
+                self.wheel.schedule(token, expires_at)
+                self.created += 1
+            self._start_reaper()
+        return token, held, expires_at
+
+    def get(self, token: str) -> Optional[tuple]:
+        """(key, mask, expires_at) of a live hold, or None"""
+        held = self.inventory.get_hold(token)
+        return held if held is not None and held[2] > time.time() else None
+
+    def attach(self, token: str, booking_id: str) -> bool:
+        """Make a live, unused hold back booking_id; False if it cannot"""
+        return self.inventory.attach_hold(token, booking_id, time.time())
+
+    def convert(self, token: str) -> Optional[tuple]:
+        """
+        Turn a hold into a sale: its seats stay taken for good. Returns
+        (key, mask, expires_at, booking_id), or None if the hold expired or was used
+        """
+        with self._lock:
+            self.wheel.cancel(token)
+        held = self.inventory.drop_hold(token, release=False)
+        if held is None:
+            return None
+        if held[2] <= time.time():
+            # Expired but not reaped yet: give the seats back instead
+            self.inventory.release(held[0], held[1])
+            self._record_expiry(held, time.time() - held[2])
+            return None
+        with self._lock:
+            self.converted += 1
+        return held
+
+    def expire_booking(self, booking_id: str) -> None:
+        """Move a booking still waiting on its lapsed hold to the expired status"""
+        booking = self.store.get(booking_id) if self.store is not None and booking_id else None
+        if booking is not None and booking["status"] == "held":
+            booking["status"] = "expired"
+            booking["expired_at"] = datetime.now().isoformat()
+            self.store.compare_and_set(booking, "held")
+
+    def _record_expiry(self, held: tuple, lag: float) -> None:
+        with self._lock:
+            self.expired += 1
+            self.lag_total += lag
+            self.lag_max = max(self.lag_max, lag)
+        self.expire_booking(held[3])
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Release every hold due by now; returns how many were released"""
+        now = time.time() if now is None else now
+        with self._lock:
+            due = self.wheel.advance(now)
+            if now >= self._next_sweep:
+                self._next_sweep = now + self.wheel.tick
+                due += [(token, None) for token in self.inventory.expired_holds(now) if token not in self.wheel.where]
+        released = 0
+        for token, deadline in due:
+            held = self.inventory.drop_hold(token, release=True)
+            if held is not None:
+                self._record_expiry(held, now - (held[2] if deadline is None else deadline))
+                released += 1
+        return released
+
+    def _reap(self) -> None:
+        while True:
+            time.sleep(self.wheel.tick)
+            try:
+                self.expire()
+            except sqlite3.Error:
+                pass  # retried on the next tick
+
+    def _start_reaper(self) -> None:
+        if self.reaper and self._reaper_thread is None:
+            with self._lock:
+                if self._reaper_thread is None:
+                    self._reaper_thread = threading.Thread(target=self._reap, name="seat-hold-reaper", daemon=True)
+                    self._reaper_thread.start()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "active_holds": len(self.wheel),
+                "created": self.created,
+                "converted": self.converted,
+                "expired": self.expired,
+                "expiry_lag_avg_ms": round(self.lag_total / self.expired * 1000, 1) if self.expired else 0.0,
+                "expiry_lag_max_ms": round(self.lag_max * 1000, 1)
+            }
+
+
+# Module-level holds shared by every booking tool
+SEAT_HOLDS = SeatHolds(SEAT_INVENTORY, SEAT_ALLOCATOR, BOOKING_STORE)
 
 @tool
 def check_seat_availability(cinema_id: str,
@@ -18,47 +1019,40 @@ def check_seat_availability(cinema_id: str,
                            showtime: str,
                            date: str) -> Dict[str, Any]:
     """
-    Check seat availability for a specific showtime (simulated)
+    Check seat availability for a specific showtime
+    
+    Args:
+        cinema_id: MovieGlu cinema identifier
+        film_id: MovieGlu film identifier
+        showtime: Time of the showing (e.g. "19:30")
+        date: Date of the showing (YYYY-MM-DD)
+    
+    Returns:
+        Dictionary containing the seat map and counts of free seats
     """
     
-    # Simulate seat map generation
-    rows = ["A", "B", "C", "D", "E", "F"]
-    seats_per_row = 10
+    unidentified = unidentified_showing(cinema_id, film_id)
+    if unidentified:
+        return unidentified
     
-    seat_map = []
-    total_seats = 0
-    available_seats = 0
+    SEAT_HOLDS.expire()
+    layout = SEAT_INVENTORY.layout
+    taken = SEAT_INVENTORY.taken(showing_key(cinema_id, film_id, date, showtime))
     
-    for row in rows:
+    seat_map = []
+    for i, row in enumerate(layout.rows):
         row_seats = []
-        for seat_num in range(1, seats_per_row + 1):
-            is_available = random.random() > 0.3  # 70% availability
-            
-            if row in ["E", "F"]:
-                seat_type = "premium"
-                price = 15.00
-            else:
-                seat_type = "standard"
-                price = 12.00
-            
-            seat = {
-                "row": row,
-                "number": str(seat_num),
-                "type": seat_type,
-                "price": price,
-                "available": is_available
-            }
-            
+        for bit in range(layout.offsets[i], layout.offsets[i] + layout.widths[i]):
+            seat = layout.seat(bit)
+            seat["available"] = not taken >> bit & 1
             row_seats.append(seat)
-            total_seats += 1
-            if is_available:
-                available_seats += 1
-        
         seat_map.append({
             "row": row,
+            "available": layout.widths[i] - popcount(taken & layout.row_masks[i]),
             "seats": row_seats
         })
     
+    free = layout.full_mask & ~taken
     return {
         "status": "success",
         "showtime_info": {
@@ -68,25 +1062,96 @@ def check_seat_availability(cinema_id: str,
             "time": showtime
         },
         "availability": {
-            "total_seats": total_seats,
-            "available_seats": available_seats
+            "total_seats": layout.capacity,
+            "available_seats": popcount(free),
+            "available_premium": popcount(free & layout.premium_mask),
+            "available_standard": popcount(free & ~layout.premium_mask)
         },
         "seat_map": seat_map,
-        "pricing": {
-            "standard": 12.00,
-            "premium": 15.00
-        }
+        "pricing": dict(layout.prices)
     }
 
 
+@tool
+def hold_seats(cinema_id: str,
+               film_id: str,
+               showtime: str,
+               date: str,
+               seat_count: int = 2,
+               seats: str = "",
+               ttl_seconds: int = SEAT_HOLD_TTL) -> Dict[str, Any]:
+    """
+    Hold seats for a showing while the customer decides, without booking them yet
+    
+    Args:
+        cinema_id: MovieGlu cinema identifier
+        film_id: MovieGlu film identifier
+        showtime: Time of the showing (e.g. "19:30")
+        date: Date of the showing (YYYY-MM-DD)
+        seat_count: Number of seats to hold (default: 2)
+        seats: Specific seats to hold, e.g. "E5, E6" (default: the best seats available together)
+        ttl_seconds: How long the hold lasts before the seats are released (default: 600)
+    
+    Returns:
+        Dictionary containing the hold token, the held seats and when the hold expires
+    """
+    
+    unidentified = unidentified_showing(cinema_id, film_id)
+    if unidentified:
+        return unidentified
+    
+    try:
+        layout = SEAT_INVENTORY.layout
+        key = showing_key(cinema_id, film_id, date, showtime)
+        mask = layout.parse(seats) if seats else 0
+        if not mask and seat_count <= 0:
+            return {"error": "seat_count must be at least 1"}
+        ttl = min(max(int(ttl_seconds), 1), SEAT_HOLD_MAX_TTL)
+        
+        token, held, expires_at = SEAT_HOLDS.hold(key, seat_count, mask, ttl)
+        if not held:
+            if seats:
+                return {"error": f"Some of the seats {seats} are no longer available, please check availability again"}
+            return {"error": f"Only {SEAT_INVENTORY.available_count(key)} seats left for this showing"}
+        
+        held_seats = layout.seats(held)
+        return {
+            "status": "success",
+            "hold_token": token,
+            "showtime_info": {
+                "cinema_id": cinema_id,
+                "film_id": film_id,
+                "date": date,
+                "time": showtime
+            },
+            "seats": held_seats,
+            "together": layout.blocks(held) == 1,
+            "ttl_seconds": ttl,
+            "expires_at": datetime.fromtimestamp(expires_at).isoformat(timespec="seconds"),
+            "message": f"{len(held_seats)} seats held for {ttl // 60} min {ttl % 60} s; "
+                       f"create the booking with this hold_token and pay before it expires"
+        }
+    
+    except Exception as e:
+        return {
+            "status": "error",
+            "error": f"Hold failed: {str(e)}"
+        }
+
+
 @tool
 def create_booking(customer_name: str,
                   customer_email: str,
                   film_title: str,
                   showtime: str,
-                  seat_count: int = 2) -> Dict[str, Any]:
+                  seat_count: int = 2,
+                  cinema_id: str = "",
+                  film_id: str = "",
+                  date: str = "",
+                  seats: str = "",
+                  hold_token: str = "") -> Dict[str, Any]:
     """
-    Create a booking for movie tickets (simplified)
+    Create a booking for movie tickets, reserving the seats in the showing's inventory
     
     Args:
         customer_name: Customer's full name
@@ -94,38 +1159,86 @@ def create_booking(customer_name: str,
         film_title: Name of the movie
         showtime: Time of the showing
         seat_count: Number of seats to book (default: 2)
+        cinema_id: MovieGlu cinema identifier, as passed to check_seat_availability (required without hold_token)
+        film_id: MovieGlu film identifier, as passed to check_seat_availability (required without hold_token)
+        date: Date of the showing, YYYY-MM-DD (default: today)
+        seats: Specific seats to book, e.g. "E5, E6" (default: the best seats available together)
+        hold_token: Token from hold_seats; books the held seats, confirmed once process_payment succeeds
     
     Returns:
         Dictionary containing booking confirmation
     """
     
     try:
+        layout = SEAT_INVENTORY.layout
+        requested = {"cinema_id": cinema_id, "film_id": film_id, "date": date, "showtime": showtime}
+        date = date or datetime.now().strftime('%Y-%m-%d')
+        key = showing_key(cinema_id, film_id, date, showtime)
+        hold = None
+        
+        # Seats are only reserved for an identified showing (a hold already is one)
+        unidentified = None if hold_token else unidentified_showing(cinema_id, film_id)
+        if unidentified:
+            return unidentified
+        
+        # Reserve the seats atomically: held ones, requested ones, or the best available
+        if hold_token:
+            SEAT_HOLDS.expire()
+            held = SEAT_HOLDS.get(hold_token)
+            if held is None:
+                return {"error": "Seat hold not found or expired, please hold the seats again"}
+            key, wanted, expires_at = held
+            # The showing is the held one: arguments may repeat it, not change it
+            showing = parse_showing_key(key)
+            conflicts = [f"{field} {str(value).strip()} (held: {showing[field]})" for field, value in requested.items()
+                         if str(value or "").strip() and str(value).strip() != showing[field]]
+            if conflicts:
+                return {"error": f"Seat hold {hold_token} is for another showing: {', '.join(conflicts)}"}
+            cinema_id, film_id, date, showtime = (showing[field] for field in SHOWING_FIELDS)
+            hold = {"token": hold_token, "expires_at": datetime.fromtimestamp(expires_at).isoformat(timespec="seconds")}
+        elif seats:
+            wanted = layout.parse(seats)
+            if not SEAT_INVENTORY.reserve(key, wanted):
+                return {"error": f"Some of the seats {seats} are no longer available, please check availability again"}
+        else:
+            if seat_count <= 0:
+                return {"error": "seat_count must be at least 1"}
+            wanted = SEAT_INVENTORY.claim(key, lambda taken: SEAT_ALLOCATOR.best(taken, seat_count))
+            if not wanted:
+                return {"error": f"Only {SEAT_INVENTORY.available_count(key)} seats left for this showing"}
+        seat_count = popcount(wanted)
+        
         # Generate booking ID
         booking_id = f"BK-{uuid.uuid4().hex[:8].upper()}"
         
+        # A hold backs a single booking
+        if hold and not SEAT_HOLDS.attach(hold_token, booking_id):
+            return {"error": "Seat hold already used for another booking or expired, please hold the seats again"}
+        
         # Calculate pricing
-        price_per_seat = 12.00
-        total_price = price_per_seat * seat_count
-        booking_fee = 1.50
+        total_price = layout.price(wanted)
+        booking_fee = BOOKING_FEE
         final_total = total_price + booking_fee
         
-        # Generate seats automatically
-        seats = []
-        for i in range(seat_count):
-            seats.append({
-                "row": "A",
-                "number": str(i + 1),
-                "type": "standard",
-                "price": price_per_seat
-            })
+        booked_seats = layout.seats(wanted)
+        seat_labels = ", ".join(f"{seat['row']}{seat['number']}" for seat in booked_seats)
+        blocks = layout.blocks(wanted)
+        if blocks > 1:
+            seat_labels += f" (not all together: {blocks} groups)"
         
         # Create booking record
         booking = {
             "booking_id": booking_id,
-            "status": "confirmed",
+            "status": "held" if hold else "confirmed",
             "film_title": film_title,
             "showtime": showtime,
-            "seats": seats,
+            "showing": {
+                "cinema_id": cinema_id,
+                "film_id": film_id,
+                "date": date,
+                "key": key
+            },
+            "seats": booked_seats,
             "customer": {
                 "name": customer_name,
                 "email": customer_email
@@ -137,20 +1250,29 @@ def create_booking(customer_name: str,
             },
             "created_at": datetime.now().isoformat()
         }
+        if hold:
+            booking["hold"] = hold
         
-        # Store booking
-        BOOKINGS[booking_id] = booking
+        # Store booking, giving the seats back if that fails (a hold just expires)
+        try:
+            BOOKING_STORE.put(booking)
+        except Exception:
+            if not hold:
+                SEAT_INVENTORY.release(key, wanted)
+            raise
         
         return {
             "status": "success",
             "booking_id": booking_id,
-            "message": f"Booking confirmed for {seat_count} seats for '{film_title}' at {showtime}",
+            "message": (f"Seats held for '{film_title}' at {showtime} until {hold['expires_at']}; "
+                        f"process the payment to confirm the booking") if hold else
+                       f"Booking confirmed for {seat_count} seats for '{film_title}' at {showtime}",
             "confirmation_details": {
                 "booking_id": booking_id,
                 "customer": customer_name,
                 "film": film_title,
                 "showtime": showtime,
-                "seats": f"{seat_count} seats in row A",
+                "seats": f"{seat_count} seats: {seat_labels}",
                 "total_cost": f"€{final_total:.2f}",
                 "confirmation_email": f"Confirmation sent to {customer_email}"
             }
@@ -175,7 +1297,7 @@ def get_booking_status(booking_id: str) -> Dict[str, Any]:
         Dictionary containing booking information
     """
     
-    booking = BOOKINGS.get(booking_id)
+    booking = BOOKING_STORE.get(booking_id)
     
     if not booking:
         return {"error": "Booking not found"}
@@ -198,11 +1320,24 @@ def process_payment(booking_id: str) -> Dict[str, Any]:
         Dictionary containing payment confirmation
     """
     
-    booking = BOOKINGS.get(booking_id)
+    booking = BOOKING_STORE.get(booking_id)
     
     if not booking:
         return {"error": "Booking not found"}
     
+    if booking["status"] == "expired":
+        return {"error": "Seat hold expired before payment, please hold the seats again"}
+    
+    # Seats on hold become the customer's only if the hold is still live
+    converted = None
+    if booking["status"] == "held":
+        SEAT_HOLDS.expire()
+        converted = SEAT_HOLDS.convert(booking["hold"]["token"])
+        if converted is None:
+            if datetime.fromisoformat(booking["hold"]["expires_at"]) <= datetime.now():
+                SEAT_HOLDS.expire_booking(booking_id)
+            return {"error": "Seat hold expired or was already used, please hold the seats again"}
+    
     # Simulate payment processing
     payment_success = True  # Always succeed for demo
     
@@ -210,10 +1345,15 @@ def process_payment(booking_id: str) -> Dict[str, Any]:
         # Generate confirmation code
         confirmation_code = f"CNF-{uuid.uuid4().hex[:6].upper()}"
         
-        # Update booking
+        # Update booking (only if nobody changed its status in the meantime)
+        previous_status = booking["status"]
         booking["status"] = "paid"
         booking["confirmation_code"] = confirmation_code
         booking["payment_processed_at"] = datetime.now().isoformat()
+        if not BOOKING_STORE.compare_and_set(booking, previous_status):
+            if converted is not None:
+                SEAT_INVENTORY.release(converted[0], converted[1])  # the hold is gone, so nothing else frees them
+            return {"error": "Booking was updated concurrently, please check its status and retry"}
         
         return {
             "status": "success",
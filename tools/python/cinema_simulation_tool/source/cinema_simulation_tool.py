@@ -3,11 +3,32 @@ Cinema Simulation Tool for watsonx Orchestrate
 Simulates MovieGlu API responses with realistic French cinema data
 """
 
+import os
+import copy
+import json
+import math
+import heapq
 import random
+import hashlib
+import tempfile
+import threading
+import unicodedata
+from contextlib import contextmanager
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from ibm_watsonx_orchestrate.agent_builder.tools import tool
 
+try:
+    import numpy as np
+except ImportError:  # the pre-generated world needs numpy; fall back to per-call generation
+    np = None
+
+try:
+    import fcntl
+except ImportError:  # No advisory file locks (Windows): writes stay atomic but may race
+    fcntl = None
+
 # French cinema chains and locations
 FRENCH_CINEMAS = [
     {"id": 19001, "name": "Pathé Opéra", "address": "2 Boulevard des Capucines", "city": "Paris", "lat": 48.8707, "lng": 2.3322},
@@ -26,6 +47,9 @@ FRENCH_CINEMAS = [
 CINEMA_CHAINS = ["Pathé", "UGC", "Gaumont", "MK2", "Luminor", "Studio", "Cinéma", "Le Grand Rex", "Espace"]
 CINEMA_LOCATIONS = ["Opéra", "Bastille", "Châtelet", "République", "Nation", "Belleville", "Montmartre", "Marais", "Saint-Germain", "Beaubourg", "Halles", "Bibliothèque", "Beaugrenelle", "Villette", "Vincennes", "Neuilly", "Boulogne", "Issy", "Créteil", "Rosny"]
 CINEMA_TYPES = ["", "Cinéma", "Multiplex", "IMAX", "Premium", "Digital"]
+STREET_TYPES = ["Rue", "Avenue", "Boulevard", "Place", "Passage"]
+STREET_NAMES = ["de la République", "du Temple", "Saint-Antoine", "de Rivoli", "des Champs-Élysées", "Montmartre", "de la Bastille", "Saint-Germain", "du Louvre", "de Belleville", "Voltaire", "Danton", "Lafayette", "Haussmann", "Faubourg"]
+AGE_RATINGS = ["G", "PG", "PG-13", "R"]
 
 # Movie genres for random assignment
 MOVIE_GENRES = [
@@ -35,36 +59,290 @@ MOVIE_GENRES = [
     ["Crime", "Drama"], ["Fantasy", "Adventure"], ["Biography", "Drama"], ["Music", "Drama"]
 ]
 
+# Seed of the simulated world: the same seed and inputs always give the same results
+SIMULATION_SEED = os.getenv('SIMULATION_SEED', 'cinemate')
+SIMULATION_MEMO_SIZE = int(os.getenv('SIMULATION_MEMO_SIZE', '4096'))
+
+# Interned film ids: a stable hash of the title, collision-checked and persisted
+CACHE_DIR = os.getenv('CINEMA_AGENT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'cinema_agent'))
+FILM_REGISTRY_PATH = os.getenv('FILM_REGISTRY_PATH', os.path.join(CACHE_DIR, 'film_registry.json'))
+FILM_REGISTRY_VERSION = 1
+FILM_ID_BASE = 340000
+FILM_ID_SPACE = 1000000
+
+# Pre-generated synthetic world (columnar NumPy arrays). When SIMULATION_WORLD_PATH
+# exists it is loaded (.npz, or a directory of memory-mapped .npy files); otherwise a
+# world of the configured size is generated on first use and saved there if set.
+SIMULATION_WORLD_PATH = os.getenv('SIMULATION_WORLD_PATH', '')
+SIMULATION_WORLD_CINEMAS = int(os.getenv('SIMULATION_WORLD_CINEMAS', '2000'))
+SIMULATION_WORLD_FILMS = int(os.getenv('SIMULATION_WORLD_FILMS', '400'))
+SIMULATION_WORLD_DAYS = int(os.getenv('SIMULATION_WORLD_DAYS', '14'))
+SIMULATION_NEARBY_LIMIT = int(os.getenv('SIMULATION_NEARBY_LIMIT', '10'))
+SIMULATION_MATRIX_MAX_CELLS = int(os.getenv('SIMULATION_MATRIX_MAX_CELLS', '21'))
+KDTREE_LEAF_SIZE = int(os.getenv('KDTREE_LEAF_SIZE', '32'))
+SIMULATION_WORLD_FORMAT = 2
+
+# Cinema ids: generated world cinemas count up from WORLD_CINEMA_ID_BASE; cinemas made up on the
+# fly for films outside the world use a separate range so an id always names the same cinema
+WORLD_CINEMA_ID_BASE = 20000
+FALLBACK_CINEMA_ID_BASE = 5000000
+FALLBACK_CINEMA_IDS = 10000
+
+# Screen scheduling: opening hours, cleaning gap between shows and start-time granularity (minutes)
+SCREEN_OPENING = os.getenv('SCREEN_OPENING', '10:00')
+SCREEN_LAST_START = os.getenv('SCREEN_LAST_START', '22:45')
+SCREEN_CLEANING_GAP = int(os.getenv('SCREEN_CLEANING_GAP', '20'))
+SCREEN_SLOT_MINUTES = int(os.getenv('SCREEN_SLOT_MINUTES', '5'))
+SCREEN_MAX_SHOWS = int(os.getenv('SCREEN_MAX_SHOWS', '8'))
+EARTH_RADIUS_MILES = 3958.8
+
+# Cities the world spreads cinemas over:
+# (name, lat, lng, weight, postcode base, districts, spread in degrees)
+WORLD_CITIES = [
+    ("Paris", 48.8566, 2.3522, 30, 75000, 20, 0.05),
+    ("Marseille", 43.2965, 5.3698, 8, 13000, 16, 0.05),
+    ("Lyon", 45.7640, 4.8357, 8, 69000, 9, 0.04),
+    ("Toulouse", 43.6047, 1.4442, 6, 31000, 5, 0.04),
+    ("Nice", 43.7102, 7.2620, 5, 6000, 6, 0.03),
+    ("Nantes", 47.2184, -1.5536, 5, 44000, 3, 0.04),
+    ("Bordeaux", 44.8378, -0.5792, 5, 33000, 8, 0.04),
+    ("Lille", 50.6292, 3.0573, 5, 59000, 9, 0.04),
+    ("Strasbourg", 48.5734, 7.7521, 4, 67000, 2, 0.03),
+    ("Montpellier", 43.6108, 3.8767, 4, 34000, 9, 0.03),
+    ("Rennes", 48.1173, -1.6778, 3, 35000, 7, 0.03),
+    ("Grenoble", 45.1885, 5.7245, 3, 38000, 1, 0.03),
+]
+
+# Words for generated film titles in the world
+TITLE_POPULAR = ["Avatar", "Dune", "Spider-Man", "Batman", "Superman", "Avengers", "Star Wars", "Jurassic Park", "Fast & Furious", "Mission Impossible", "James Bond", "Transformers", "Harry Potter", "Lord of the Rings", "The Matrix"]
+TITLE_SUFFIXES = ["Revolution", "Origins", "Returns", "Awakens", "Rising", "Legacy", "Reborn", "Forever", "Unleashed", "Destiny"]
+TITLE_ADJECTIVES = ["Last", "Silent", "Hidden", "Broken", "Golden", "Midnight", "Lost", "Burning", "Frozen", "Secret", "Eternal", "Crimson", "Wild", "Distant", "Final", "Quiet"]
+TITLE_NOUNS = ["Horizon", "Garden", "Empire", "River", "Kingdom", "Signal", "Harbor", "Summer", "Promise", "Station", "Frontier", "Dream", "Voyage", "Shadow", "Island", "Letter"]
+
+# Local movie catalog (same data/movies.json used by the movie search tool)
+MOVIE_CATALOG_PATH = os.getenv(
+    'MOVIE_CATALOG_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', '..', 'data', 'movies.json')
+)
+
+def tokenize_title(text: str) -> List[str]:
+    """Split a title into normalized (case and accent insensitive) tokens"""
+    decomposed = unicodedata.normalize("NFKD", (text or "").casefold())
+    stripped = "".join(c if c.isalnum() else " " for c in decomposed if not unicodedata.combining(c))
+    return stripped.split()
+
+class LocalFilmCatalog:
+    """Title index over the local movie catalog (whole-title matches only)"""
+
+    def __init__(self, path: Optional[str] = MOVIE_CATALOG_PATH):
+        self.path = path
+        self.movies = []
+        self.title_postings = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self.movies = json.load(f).get('movies', [])
+            except (OSError, ValueError, AttributeError, TypeError):
+                self.movies = []
+            for idx, movie in enumerate(self.movies):
+                for token in set(tokenize_title(movie.get('title', ''))):
+                    self.title_postings.setdefault(token, set()).add(idx)
+            self._loaded = True
+
+    def find(self, title: str) -> Optional[Dict[str, Any]]:
+        """Catalog film whose whole title matches (case and accent insensitive), or None"""
+        self._ensure_loaded()
+        tokens = tokenize_title(title)
+        if not tokens:
+            return None
+        candidates = set.intersection(*(self.title_postings.get(token, set()) for token in tokens))
+        for idx in sorted(candidates):
+            if tokenize_title(self.movies[idx].get('title', '')) == tokens:
+                return self.movies[idx]
+        return None
+
+LOCAL_CATALOG = LocalFilmCatalog()
+
+def simulation_rng(*parts: Any) -> random.Random:
+    """Local Random seeded from a stable hash of (SIMULATION_SEED, *parts)"""
+    key = "\x1f".join(str(part) for part in (SIMULATION_SEED,) + parts)
+    digest = hashlib.sha256(key.encode("utf-8")).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+@contextmanager
+def file_lock(path: Optional[str]):
+    """Exclusive advisory lock (path + ".lock") around a read-modify-write of path"""
+    handle = None
+    if fcntl is not None and path:
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            handle = open(f"{path}.lock", "a")
+        except OSError:
+            handle = None
+    if handle is None:
+        yield
+        return
+    with handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+def film_key(title: str) -> str:
+    """Registry key of a title: case-folded, whitespace collapsed"""
+    return " ".join((title or "").casefold().split())
+
+class FilmRegistry:
+    """
+    Interned film id <-> title maps
+    
+    A title's id is FILM_ID_BASE plus a blake2b hash of its key; when that
+    id already belongs to another title the next free id is used (linear
+    probing). Assignments are persisted so ids stay stable between runs;
+    new ids are chosen and written under a file lock shared by all processes.
+    """
+
+    def __init__(self, path: str = FILM_REGISTRY_PATH):
+        self.path = path
+        self.titles = {}  # film id -> title
+        self.ids = {}     # title key -> film id
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def _reload(self, force: bool = False) -> None:
+        """Merge assignments made by another process since the last read"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._mtime and not force:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        if stored.get("version") == FILM_REGISTRY_VERSION:
+            for film_id, title in stored.get("films", {}).items():
+                self._assign(int(film_id), title)
+        self._mtime = mtime
+
+    def _assign(self, film_id: int, title: str) -> bool:
+        key = film_key(title)
+        if key in self.ids or film_id in self.titles:
+            return False
+        self.titles[film_id] = title
+        self.ids[key] = film_id
+        return True
+
+    def _write(self) -> None:
+        """Write all assignments atomically (caller holds the file lock and _lock)"""
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": FILM_REGISTRY_VERSION, "films": self.titles}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._mtime = os.path.getmtime(self.path)
+        except OSError:
+            pass
+
+    def _intern(self, title: str) -> int:
+        """Film id of a title, assigning a new one in memory (caller holds _lock)"""
+        key = film_key(title)
+        film_id = self.ids.get(key)
+        if film_id is not None:
+            return film_id
+        if len(self.titles) >= FILM_ID_SPACE:
+            raise ValueError("Film id space is full")
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+        slot = int.from_bytes(digest, "big") % FILM_ID_SPACE
+        while FILM_ID_BASE + slot in self.titles:
+            slot = (slot + 1) % FILM_ID_SPACE
+        self._assign(FILM_ID_BASE + slot, title)
+        return FILM_ID_BASE + slot
+
+    def save(self) -> None:
+        """Merge with the file on disk and write it back atomically"""
+        with file_lock(self.path), self._lock:
+            self._reload(force=True)
+            self._write()
+
+    def intern(self, title: str) -> int:
+        """Film id of a title, assigning and persisting a new one if needed"""
+        film_id = self.ids.get(film_key(title))
+        if film_id is not None:
+            return film_id
+        return self.intern_many([title])[0]
+
+    def intern_many(self, titles: List[str]) -> List[int]:
+        """
+        Film ids of many titles, persisting any new assignments with one write
+        
+        The file is re-read under the lock before ids are chosen, so two
+        processes never hand the same id to different titles.
+        """
+        with file_lock(self.path), self._lock:
+            self._reload(force=True)
+            known = len(self.titles)
+            film_ids = [self._intern(title) for title in titles]
+            if len(self.titles) > known:
+                self._write()
+        return film_ids
+
+    def register(self, film_id: int, title: str) -> bool:
+        """Adopt an existing assignment (e.g. from a saved world); False on conflict"""
+        with self._lock:
+            self._reload()
+            return self._assign(film_id, title) or self.ids.get(film_key(title)) == film_id
+
+    def title_for(self, film_id: int) -> Optional[str]:
+        title = self.titles.get(film_id)
+        if title is None:
+            with self._lock:
+                self._reload()
+            title = self.titles.get(film_id)
+        return title
+
+FILM_REGISTRY = FilmRegistry()
+
 def generate_film_id_from_title(title: str) -> int:
     """Generate a consistent film ID from movie title"""
-    # Simple hash-like function to generate consistent IDs
-    hash_value = sum(ord(char) for char in title.lower())
-    return 340000 + (hash_value % 9999)
+    return FILM_REGISTRY.intern(title)
 
-def generate_cinema_name() -> str:
+def generate_cinema_name(rng: random.Random = random) -> str:
     """Generate a realistic French cinema name"""
-    chain = random.choice(CINEMA_CHAINS)
-    location = random.choice(CINEMA_LOCATIONS)
-    cinema_type = random.choice(CINEMA_TYPES)
+    chain = rng.choice(CINEMA_CHAINS)
+    location = rng.choice(CINEMA_LOCATIONS)
+    cinema_type = rng.choice(CINEMA_TYPES)
     
     if cinema_type:
         return f"{chain} {location} {cinema_type}"
     else:
         return f"{chain} {location}"
 
-def generate_cinema_address(city: str = "Paris") -> str:
+def generate_cinema_address(city: str = "Paris", rng: random.Random = random) -> str:
     """Generate a realistic French address"""
-    street_numbers = [str(random.randint(1, 200))]
-    street_types = ["Rue", "Avenue", "Boulevard", "Place", "Passage"]
-    street_names = ["de la République", "du Temple", "Saint-Antoine", "de Rivoli", "des Champs-Élysées", "Montmartre", "de la Bastille", "Saint-Germain", "du Louvre", "de Belleville", "Voltaire", "Danton", "Lafayette", "Haussmann", "Faubourg"]
+    street_numbers = [str(rng.randint(1, 200))]
     
-    return f"{random.choice(street_numbers)} {random.choice(street_types)} {random.choice(street_names)}"
+    return f"{rng.choice(street_numbers)} {rng.choice(STREET_TYPES)} {rng.choice(STREET_NAMES)}"
 
+@lru_cache(maxsize=SIMULATION_MEMO_SIZE)
 def generate_movie_data(title: str) -> Dict[str, Any]:
-    """Generate realistic movie data for any title"""
+    """Generate realistic movie data for any title (same title, same film)"""
+    rng = simulation_rng("film", title.lower())
     film_id = generate_film_id_from_title(title)
-    genres = random.choice(MOVIE_GENRES)
-    duration = random.randint(85, 180)  # 1h25 to 3h
+    genres = rng.choice(MOVIE_GENRES)
+    duration = rng.randint(85, 180)  # 1h25 to 3h
     
     return {
         "film_id": film_id,
@@ -73,40 +351,94 @@ def generate_movie_data(title: str) -> Dict[str, Any]:
         "duration": duration
     }
 
-def generate_showtimes(date_str: str = None) -> List[Dict[str, str]]:
-    """Generate realistic showtime schedule"""
+def clock_minutes(text: str, strict: bool = False) -> int:
+    """Minutes after midnight of an HH:MM time (strict: only 00:00-23:59, else ValueError)"""
+    hour, minute = map(int, text.split(':'))
+    if strict and not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"Time out of range: {text}")
+    return hour * 60 + minute
+
+def simulation_date(date: str) -> Optional[str]:
+    """YYYY-MM-DD of a requested date (today when empty), or None if it is not one"""
+    if not date or not date.strip():
+        return datetime.now().strftime("%Y-%m-%d")
+    try:
+        return datetime.strptime(date.strip(), "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+def clock_text(minutes: int) -> str:
+    """HH:MM of minutes after midnight (wrapping past midnight)"""
+    minutes = int(minutes) % 1440
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+def pack_screen(durations: List[int], opening: int) -> List[int]:
+    """Start minutes of back-to-back shows on one screen: runtime plus cleaning gap, rounded up to the slot"""
+    starts, start = [], opening
+    for duration in durations:
+        if start > clock_minutes(SCREEN_LAST_START):
+            break
+        starts.append(start)
+        block = duration + SCREEN_CLEANING_GAP
+        start += -(-block // SCREEN_SLOT_MINUTES) * SCREEN_SLOT_MINUTES
+    return starts
+
+def generate_showtimes(date_str: str = None, rng: random.Random = random, duration: int = 120) -> List[Dict[str, str]]:
+    """Generate a realistic showtime schedule: one screen, packed by the film's runtime"""
     if not date_str:
         date_str = datetime.now().strftime("%Y-%m-%d")
     
-    # Generate showtimes between 10:00 and 23:00
-    base_times = ["10:30", "13:15", "16:00", "18:45", "21:30"]
-    variations = ["10:00", "12:45", "15:30", "17:15", "19:00", "20:15", "22:00"]
-    
-    all_times = base_times + random.sample(variations, random.randint(2, 4))
-    selected_times = random.sample(all_times, random.randint(3, 6))
-    
-    showtimes = []
-    for time in sorted(selected_times):
-        hour, minute = map(int, time.split(':'))
-        start_time = f"{hour:02d}:{minute:02d}"
-        
-        # Calculate end time (add movie duration, assume 2 hours average)
-        end_hour = hour + 2
-        if end_hour >= 24:
-            end_hour -= 24
-        end_time = f"{end_hour:02d}:{minute:02d}"
-        
-        showtimes.append({
-            "start_time": start_time,
-            "end_time": end_time
-        })
+    # First show between opening and 90 minutes later, then back to back with cleaning gaps
+    opening = clock_minutes(SCREEN_OPENING) + rng.randint(0, 6) * 15
+    starts = pack_screen([duration] * SCREEN_MAX_SHOWS, opening)
     
-    return showtimes
+    return [{"start_time": clock_text(start), "end_time": clock_text(start + duration)} for start in starts]
+
+@lru_cache(maxsize=SIMULATION_MEMO_SIZE)
+def simulated_cinema(cinema_id: int) -> Dict[str, Any]:
+    """Name, address and postcode of a cinema, fixed by its id"""
+    for cinema in FRENCH_CINEMAS:
+        if cinema["id"] == cinema_id:
+            return {"name": cinema["name"], "address": cinema["address"], "city": cinema["city"], "postcode": 75001}
+    rng = simulation_rng("cinema", cinema_id)
+    return {
+        "name": generate_cinema_name(rng),
+        "address": generate_cinema_address("Paris", rng),
+        "city": "Paris",
+        "postcode": rng.randint(75001, 75020)
+    }
+
+@lru_cache(maxsize=SIMULATION_MEMO_SIZE)
+def simulated_showtimes(cinema_id: int, film_id: int, date: str, duration: int = 120) -> List[Dict[str, str]]:
+    """Showtimes of one film at one cinema on one date"""
+    return generate_showtimes(date, simulation_rng("showtimes", cinema_id, film_id, date), duration)
+
+def simulated_age_rating(film_id: int) -> str:
+    """Age rating of a film, fixed by its id"""
+    return simulation_rng("age_rating", film_id).choice(AGE_RATINGS)
+
+def haversine_miles(lat1: Any, lng1: Any, lat2: Any, lng2: Any) -> Any:
+    """Great-circle distance in miles; vectorized over NumPy arrays"""
+    if np is None:
+        phi1, phi2 = math.radians(lat1), math.radians(lat2)
+        a = math.sin((phi2 - phi1) / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2
+        return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a)))
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    a = np.sin((phi2 - phi1) / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(np.radians(np.subtract(lng2, lng1)) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.minimum(1.0, np.sqrt(a)))
 
 def calculate_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-    """Calculate approximate distance in miles"""
-    # Simple distance calculation (not accurate, just for simulation)
-    return round(((lat2 - lat1) ** 2 + (lng2 - lng1) ** 2) ** 0.5 * 69, 2)
+    """Calculate distance in miles (haversine)"""
+    return round(float(haversine_miles(lat1, lng1, lat2, lng2)), 2)
+
+def offset_point(latitude: float, longitude: float, distance: float, bearing: float) -> tuple:
+    """Point at a distance (miles) and bearing (radians) from a location"""
+    phi1, lambda1 = math.radians(latitude), math.radians(longitude)
+    delta = distance / EARTH_RADIUS_MILES
+    phi2 = math.asin(math.sin(phi1) * math.cos(delta) + math.cos(phi1) * math.sin(delta) * math.cos(bearing))
+    lambda2 = lambda1 + math.atan2(math.sin(bearing) * math.sin(delta) * math.cos(phi1),
+                                   math.cos(delta) - math.sin(phi1) * math.sin(phi2))
+    return math.degrees(phi2), math.degrees(lambda2)
 
 @tool
 def search_film_by_title(title: str) -> Dict[str, Any]:
@@ -119,6 +451,30 @@ def search_film_by_title(title: str) -> Dict[str, Any]:
     Returns:
         Dictionary containing film information
     """
+    # Answer from the local catalog when it knows the title
+    catalog_movie = LOCAL_CATALOG.find(title)
+    if catalog_movie:
+        film_id = generate_film_id_from_title(catalog_movie["title"])
+        return {
+            "status": "success",
+            "film": {
+                "movieglu_id": film_id,
+                "title": catalog_movie["title"],
+                "release_date": catalog_movie.get("releaseDate", "TBA"),
+                "age_rating": catalog_movie.get("rating", "TBC"),
+                "synopsis": catalog_movie.get("synopsis", "No synopsis available"),
+                "genres": catalog_movie.get("genre", []),
+                "cast": catalog_movie.get("cast", [])[:5],
+                "directors": [catalog_movie["director"]] if catalog_movie.get("director") else [],
+                "duration_mins": catalog_movie.get("duration", 0),
+                "images": {
+                    "poster": catalog_movie.get("posterUrl"),
+                    "still": f"https://example.com/still_{film_id}.jpg"
+                }
+            },
+            "alternative_titles": []
+        }
+    
     # Generate movie data for any title
     movie_data = generate_movie_data(title)
     
@@ -126,8 +482,9 @@ def search_film_by_title(title: str) -> Dict[str, Any]:
     first_names = ["Jean", "Marie", "Pierre", "Sophie", "Lucas", "Emma", "Antoine", "Camille", "Nicolas", "Julie"]
     last_names = ["Martin", "Bernard", "Dubois", "Thomas", "Robert", "Petit", "Durand", "Leroy", "Moreau", "Simon"]
     
-    cast = [f"{random.choice(first_names)} {random.choice(last_names)}" for _ in range(3)]
-    director = f"{random.choice(first_names)} {random.choice(last_names)}"
+    rng = simulation_rng("credits", title.lower())
+    cast = [f"{rng.choice(first_names)} {rng.choice(last_names)}" for _ in range(3)]
+    director = f"{rng.choice(first_names)} {rng.choice(last_names)}"
     
     return {
         "status": "success",
@@ -135,9 +492,9 @@ def search_film_by_title(title: str) -> Dict[str, Any]:
             "movieglu_id": movie_data["film_id"],
             "title": movie_data["title"],
             "release_date": "2025-07-17",
-            "age_rating": random.choice(["G", "PG", "PG-13", "R"]),
+            "age_rating": simulated_age_rating(movie_data["film_id"]),
             "synopsis": f"An captivating {', '.join(movie_data['genres'])} film that tells the story of {title}. A masterpiece of cinema that will leave audiences on the edge of their seats.",
-            "genres": movie_data["genres"],
+            "genres": list(movie_data["genres"]),
             "cast": cast,
             "directors": [director],
             "duration_mins": movie_data["duration"],
@@ -149,39 +506,25 @@ def search_film_by_title(title: str) -> Dict[str, Any]:
         "alternative_titles": []
     }
 
-@tool
-def check_film_showtimes(film_id: str, date: str = "", latitude: float = 48.8566, longitude: float = 2.3522) -> Dict[str, Any]:
-    """
-    Check which cinemas are showing a specific film (simulated - works with ANY film ID)
+@lru_cache(maxsize=SIMULATION_MEMO_SIZE)
+def simulate_film_showtimes(film_id: int, date: str, latitude: float, longitude: float) -> Dict[str, Any]:
+    """Cinemas showing a film around a location on a date (memoized)"""
+    rng = simulation_rng("film_showtimes", film_id, date, latitude, longitude)
+    movie_title = f"Movie {film_id}"  # Fallback title
+    registered = FILM_REGISTRY.title_for(film_id)
+    duration = generate_movie_data(registered)["duration"] if registered else 120
     
-    Args:
-        film_id: Film ID to check
-        date: Date in YYYY-MM-DD format (empty string for today)
-        latitude: Latitude of the location (default: Paris)
-        longitude: Longitude of the location (default: Paris)
-    
-    Returns:
-        Dictionary containing cinemas showing the film
-    """
-    if not date or not date.strip():
-        date = datetime.now().strftime("%Y-%m-%d")
-    
-    # Generate movie title from film_id (reverse the hash process approximately)
-    film_id_int = int(film_id)
-    movie_title = f"Movie {film_id_int}"  # Fallback title
-    
-    # Generate random cinemas (3-6 cinemas showing the movie)
-    num_cinemas = random.randint(3, 6)
+    # Generate cinemas (3-6 cinemas showing the movie)
+    num_cinemas = rng.randint(3, 6)
     formatted_cinemas = []
     
     for i in range(num_cinemas):
-        cinema_id = random.randint(20000, 29999)
-        cinema_name = generate_cinema_name()
-        cinema_address = generate_cinema_address()
+        cinema_id = rng.randint(FALLBACK_CINEMA_ID_BASE, FALLBACK_CINEMA_ID_BASE + FALLBACK_CINEMA_IDS - 1)
+        cinema = simulated_cinema(cinema_id)
         
-        # Generate random coordinates around Paris
-        lat_offset = random.uniform(-0.1, 0.1)
-        lng_offset = random.uniform(-0.1, 0.1)
+        # Generate coordinates around the location
+        lat_offset = rng.uniform(-0.1, 0.1)
+        lng_offset = rng.uniform(-0.1, 0.1)
         cinema_lat = latitude + lat_offset
         cinema_lng = longitude + lng_offset
         
@@ -189,12 +532,12 @@ def check_film_showtimes(film_id: str, date: str = "", latitude: float = 48.8566
         
         cinema_data = {
             "id": cinema_id,
-            "name": cinema_name,
-            "address": cinema_address,
-            "city": "Paris",
+            "name": cinema["name"],
+            "address": cinema["address"],
+            "city": cinema["city"],
             "distance": distance,
-            "showtime_count": random.randint(3, 8),
-            "showtimes": generate_showtimes(date)
+            "showtime_count": rng.randint(3, 8),
+            "showtimes": simulated_showtimes(cinema_id, film_id, date, duration)
         }
         formatted_cinemas.append(cinema_data)
     
@@ -204,53 +547,38 @@ def check_film_showtimes(film_id: str, date: str = "", latitude: float = 48.8566
     return {
         "status": "success",
         "film": {
-            "id": film_id_int,
+            "id": film_id,
             "title": movie_title,
-            "age_rating": random.choice(["G", "PG", "PG-13", "R"])
+            "age_rating": simulated_age_rating(film_id)
         },
         "date": date,
         "cinemas": formatted_cinemas
     }
 
-@tool
-def find_cinemas_nearby(latitude: float = 48.8566, longitude: float = 2.3522, radius: int = 10) -> Dict[str, Any]:
-    """
-    Find cinemas near a specific location (simulated - generates random cinemas)
+@lru_cache(maxsize=SIMULATION_MEMO_SIZE)
+def simulate_cinemas_nearby(latitude: float, longitude: float, radius: int) -> Dict[str, Any]:
+    """Cinemas around a location (memoized)"""
+    rng = simulation_rng("nearby", latitude, longitude, radius)
     
-    Args:
-        latitude: Latitude of the location (default: Paris)
-        longitude: Longitude of the location (default: Paris)
-        radius: Search radius in miles (default: 10)
-    
-    Returns:
-        Dictionary containing list of nearby cinemas
-    """
-    # Generate 6-10 random cinemas nearby
-    num_cinemas = random.randint(6, 10)
+    # Generate 6-10 cinemas nearby
+    num_cinemas = rng.randint(6, 10)
     nearby_cinemas = []
     
     for i in range(num_cinemas):
-        cinema_id = random.randint(20000, 29999)
-        cinema_name = generate_cinema_name()
-        cinema_address = generate_cinema_address()
+        cinema_id = rng.randint(FALLBACK_CINEMA_ID_BASE, FALLBACK_CINEMA_ID_BASE + FALLBACK_CINEMA_IDS - 1)
+        cinema = simulated_cinema(cinema_id)
         
-        # Generate random coordinates within radius
-        angle = random.uniform(0, 2 * 3.14159)
-        distance = random.uniform(0.1, radius)
-        
-        # Convert distance to approximate lat/lng offset
-        lat_offset = distance * 0.014 * random.choice([-1, 1])  # Rough conversion
-        lng_offset = distance * 0.014 * random.choice([-1, 1])
-        
-        cinema_lat = latitude + lat_offset
-        cinema_lng = longitude + lng_offset
+        # Place the cinema at a random bearing within the radius; report its true distance
+        angle = rng.uniform(0, 2 * math.pi)
+        cinema_lat, cinema_lng = offset_point(latitude, longitude, rng.uniform(0.1, max(radius, 0.1)), angle)
+        distance = calculate_distance(latitude, longitude, cinema_lat, cinema_lng)
         
         formatted_cinema = {
             "id": cinema_id,
-            "name": cinema_name,
-            "address": cinema_address,
-            "city": "Paris",
-            "postcode": random.randint(75001, 75020),
+            "name": cinema["name"],
+            "address": cinema["address"],
+            "city": cinema["city"],
+            "postcode": cinema["postcode"],
             "distance": distance,
             "lat": cinema_lat,
             "lng": cinema_lng
@@ -271,57 +599,780 @@ def find_cinemas_nearby(latitude: float = 48.8566, longitude: float = 2.3522, ra
         }
     }
 
-@tool
-def get_cinema_showtimes(cinema_id: str, movie_id: str = "", date: str = "") -> Dict[str, Any]:
-    """
-    Get showtimes for a specific cinema (simulated - generates random movies)
-    
-    Args:
-        cinema_id: Cinema ID
-        movie_id: Optional movie ID to filter showtimes (not used in simulation)
-        date: Date in YYYY-MM-DD format (empty string for today)
-    
-    Returns:
-        Dictionary containing showtimes information
-    """
-    if not date or not date.strip():
-        date = datetime.now().strftime("%Y-%m-%d")
-    
-    # Generate cinema data
-    cinema_name = generate_cinema_name()
-    cinema_address = generate_cinema_address()
+@lru_cache(maxsize=SIMULATION_MEMO_SIZE)
+def simulate_cinema_programme(cinema_id: int, date: str) -> Dict[str, Any]:
+    """Films and showtimes of a cinema on a date (memoized)"""
+    rng = simulation_rng("programme", cinema_id, date)
+    cinema = simulated_cinema(cinema_id)
     
-    # Generate random movies playing at this cinema
-    popular_movies = ["Avatar", "Dune", "Spider-Man", "Batman", "Superman", "Avengers", "Star Wars", "Jurassic Park", "Fast & Furious", "Mission Impossible", "James Bond", "Transformers", "Harry Potter", "Lord of the Rings", "The Matrix"]
+    # Generate the movies playing at this cinema
+    popular_movies = TITLE_POPULAR
     
-    num_movies = random.randint(4, 8)
+    num_movies = rng.randint(4, 8)
     films = []
     
     for i in range(num_movies):
-        # Generate random movie title
+        # Generate movie title
         if i < len(popular_movies):
-            movie_title = f"{popular_movies[i]}: {random.choice(['Revolution', 'Origins', 'Returns', 'Awakens', 'Rising', 'Legacy', 'Reborn', 'Forever', 'Unleashed', 'Destiny'])}"
+            movie_title = f"{popular_movies[i]}: {rng.choice(TITLE_SUFFIXES)}"
         else:
-            movie_title = f"Movie {random.randint(1000, 9999)}"
+            movie_title = f"Movie {rng.randint(1000, 9999)}"
         
         movie_data = generate_movie_data(movie_title)
         
         film_data = {
             "id": movie_data["film_id"],
             "title": movie_data["title"],
-            "age_rating": random.choice(["G", "PG", "PG-13", "R"]),
-            "showtimes": generate_showtimes(date)
+            "age_rating": simulated_age_rating(movie_data["film_id"]),
+            "showtimes": simulated_showtimes(cinema_id, movie_data["film_id"], date, movie_data["duration"])
         }
         films.append(film_data)
     
     return {
         "status": "success",
         "cinema": {
-            "id": int(cinema_id),
-            "name": cinema_name,
-            "address": cinema_address,
-            "city": "Paris"
+            "id": cinema_id,
+            "name": cinema["name"],
+            "address": cinema["address"],
+            "city": cinema["city"]
         },
         "date": date,
         "films": films
-    }
\ No newline at end of file
+    }
+
+def world_film_titles(count: int, rng: random.Random) -> List[str]:
+    """Catalog titles first, then generated ones, without duplicate keys"""
+    LOCAL_CATALOG._ensure_loaded()
+    candidates = [movie["title"] for movie in LOCAL_CATALOG.movies if movie.get("title")]
+    candidates += [f"{name}: {suffix}" for name in TITLE_POPULAR for suffix in TITLE_SUFFIXES]
+    titles, seen = [], set()
+    for title in candidates:
+        if film_key(title) not in seen:
+            seen.add(film_key(title))
+            titles.append(title)
+    attempts = 0
+    while len(titles) < count and attempts < count * 20:
+        attempts += 1
+        title = f"The {rng.choice(TITLE_ADJECTIVES)} {rng.choice(TITLE_NOUNS)}"
+        if rng.random() < 0.5:
+            title += f" {rng.choice(['of', 'in', 'beyond'])} {rng.choice(TITLE_NOUNS)}"
+        if film_key(title) not in seen:
+            seen.add(film_key(title))
+            titles.append(title)
+    return titles[:count]
+
+class CinemaKDTree:
+    """Static KD-tree over cinema positions as 3D unit vectors
+
+    Euclidean (chord) distance between unit vectors is monotonic in
+    great-circle distance, so radius and k-nearest queries are exact and
+    distances are converted back to haversine miles. Points are permuted so
+    every node covers a contiguous slice; leaves are scanned with NumPy.
+    """
+
+    def __init__(self, lat: Any, lng: Any, leaf_size: int = KDTREE_LEAF_SIZE):
+        phi, lam = np.radians(np.asarray(lat, dtype=np.float64)), np.radians(np.asarray(lng, dtype=np.float64))
+        points = np.column_stack([np.cos(phi) * np.cos(lam), np.cos(phi) * np.sin(lam), np.sin(phi)])
+        self.order = np.arange(len(points))
+        # Node arrays: slice bounds, children (-1 for leaves) and bounding box
+        self.lo, self.hi, self.left, self.right, self.mins, self.maxs = [], [], [], [], [], []
+        stack = [(0, len(points), None, None)]
+        while stack:
+            lo, hi, parent, side = stack.pop()
+            node = len(self.lo)
+            if parent is not None:
+                (self.left if side == 0 else self.right)[parent] = node
+            box = points[self.order[lo:hi]] if hi > lo else np.zeros((1, 3))
+            self.lo.append(lo)
+            self.hi.append(hi)
+            self.left.append(-1)
+            self.right.append(-1)
+            self.mins.append(tuple(box.min(axis=0).tolist()))
+            self.maxs.append(tuple(box.max(axis=0).tolist()))
+            if hi - lo <= leaf_size:
+                continue
+            dim = int(np.argmax(box.max(axis=0) - box.min(axis=0)))
+            mid = (lo + hi) // 2
+            part = np.argpartition(box[:, dim], mid - lo)
+            self.order[lo:hi] = self.order[lo:hi][part]
+            stack.append((mid, hi, node, 1))
+            stack.append((lo, mid, node, 0))
+        self.points = points[self.order]
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    @staticmethod
+    def chord(miles: float) -> float:
+        return 2 * math.sin(min(miles / EARTH_RADIUS_MILES, math.pi) / 2)
+
+    def _box_distance2(self, node: int, q: tuple) -> float:
+        d2 = 0.0
+        for value, low, high in zip(q, self.mins[node], self.maxs[node]):
+            if value < low:
+                d2 += (low - value) ** 2
+            elif value > high:
+                d2 += (value - high) ** 2
+        return d2
+
+    def _query_radius(self, q: tuple, qv: Any, bound2: float) -> tuple:
+        """All points within a chord bound: collect overlapping leaves, then one vectorized pass"""
+        ranges = []
+        stack = [0] if len(self) else []
+        while stack:
+            node = stack.pop()
+            if self._box_distance2(node, q) > bound2:
+                continue
+            if self.left[node] >= 0:
+                stack.append(self.right[node])
+                stack.append(self.left[node])
+            else:
+                ranges.append((self.lo[node], self.hi[node]))
+        if not ranges:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        idx = np.concatenate([np.arange(lo, hi) for lo, hi in ranges])
+        d2 = ((self.points[idx] - qv) ** 2).sum(axis=1)
+        keep = d2 <= bound2
+        idx, d2 = idx[keep], d2[keep]
+        nearest = np.argsort(d2, kind="stable")
+        miles = 2 * EARTH_RADIUS_MILES * np.arcsin(np.minimum(1.0, np.sqrt(d2[nearest]) / 2))
+        return self.order[idx[nearest]], miles
+
+    def query(self, latitude: float, longitude: float, k: Optional[int] = None, radius: Optional[float] = None) -> tuple:
+        """(indices, miles) of the k nearest points and/or all within radius, nearest first"""
+        phi, lam = math.radians(latitude), math.radians(longitude)
+        q = (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi))
+        qv = np.array(q)
+        bound2 = self.chord(radius) ** 2 if radius is not None else math.inf
+        if k is None:
+            return self._query_radius(q, qv, bound2)
+        found_idx, found_d2 = [], []
+        count = 0
+        heap = [(self._box_distance2(0, q), 0)] if len(self) else []
+        while heap:
+            box2, node = heapq.heappop(heap)
+            if box2 > bound2:
+                break
+            if self.left[node] >= 0:
+                for child in (self.left[node], self.right[node]):
+                    child2 = self._box_distance2(child, q)
+                    if child2 <= bound2:
+                        heapq.heappush(heap, (child2, child))
+                continue
+            lo, hi = self.lo[node], self.hi[node]
+            d2 = ((self.points[lo:hi] - qv) ** 2).sum(axis=1)
+            keep = np.flatnonzero(d2 <= bound2)
+            if not len(keep):
+                continue
+            found_idx.append(keep + lo)
+            found_d2.append(d2[keep])
+            count += len(keep)
+            if k is not None and count >= k:
+                # Tighten the bound to the current k-th nearest
+                all_d2 = np.concatenate(found_d2)
+                bound2 = min(bound2, float(np.partition(all_d2, k - 1)[k - 1]))
+                keep = all_d2 <= bound2
+                found_idx, found_d2 = [np.concatenate(found_idx)[keep]], [all_d2[keep]]
+                count = len(found_d2[0])
+        if not found_idx:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        idx, d2 = np.concatenate(found_idx), np.concatenate(found_d2)
+        nearest = np.argsort(d2, kind="stable")[:k]
+        miles = 2 * EARTH_RADIUS_MILES * np.arcsin(np.minimum(1.0, np.sqrt(d2[nearest]) / 2))
+        return self.order[idx[nearest]], miles
+
+class SimulatedWorld:
+    """Columnar synthetic cinema world with a CSR showtime grid
+
+    Cinemas and films are sorted by id (binary-search lookups). Showings are
+    stored per (cinema, day) row: row r = cinema_index * days + day spans
+    showing_film/showing_start[showing_ptr[r]:showing_ptr[r + 1]], sorted by
+    start time. film_showing_order is the same showings grouped by (film, day)
+    via film_showing_ptr, so "where is this film playing" is a slice too.
+    Showings are packed per screen (showing_screen) by runtime plus cleaning
+    gap, and day_start_order/day_start_sorted index each day by start time.
+    """
+
+    ARRAYS = (
+        "format", "start_date", "cinema_id", "cinema_lat", "cinema_lng", "cinema_city", "cinema_screens",
+        "cinema_chain", "cinema_location", "cinema_type", "cinema_street_number",
+        "cinema_street_type", "cinema_street_name", "cinema_postcode",
+        "film_id", "film_title", "film_duration", "film_genre", "film_rating",
+        "showing_ptr", "showing_film", "showing_start", "showing_screen", "film_showing_ptr",
+        "film_showing_order", "day_start_ptr", "day_start_order", "day_start_sorted"
+    )
+
+    def __init__(self, arrays: Dict[str, Any]):
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self.days = (len(self.showing_ptr) - 1) // max(len(self.cinema_id), 1)
+        self.real_cinemas = {cinema["id"]: cinema for cinema in FRENCH_CINEMAS}
+        self._tree = None
+        self._tree_lock = threading.Lock()
+
+    @classmethod
+    def generate(cls, cinemas: int = SIMULATION_WORLD_CINEMAS, films: int = SIMULATION_WORLD_FILMS,
+                 days: int = SIMULATION_WORLD_DAYS, start_date: Optional[str] = None) -> "SimulatedWorld":
+        """Build a world with vectorized NumPy draws seeded by SIMULATION_SEED"""
+        title_rng = simulation_rng("world", cinemas, films, days)
+        rng = np.random.default_rng(title_rng.getrandbits(64))
+        start_date = start_date or datetime.now().strftime("%Y-%m-%d")
+        
+        # Cinemas: the real Paris ones plus generated ones clustered around French cities
+        generated = min(max(cinemas - len(FRENCH_CINEMAS), 0), FALLBACK_CINEMA_ID_BASE - WORLD_CINEMA_ID_BASE)
+        city_weights = np.array([city[3] for city in WORLD_CITIES], dtype=np.float64)
+        city = np.concatenate([
+            np.zeros(len(FRENCH_CINEMAS), dtype=np.int8),
+            rng.choice(len(WORLD_CITIES), size=generated, p=city_weights / city_weights.sum()).astype(np.int8)
+        ])
+        centre_lat = np.array([c[1] for c in WORLD_CITIES])[city]
+        centre_lng = np.array([c[2] for c in WORLD_CITIES])[city]
+        spread = np.array([c[6] for c in WORLD_CITIES])[city]
+        lat = centre_lat + rng.normal(0.0, 1.0, len(city)) * spread
+        lng = centre_lng + rng.normal(0.0, 1.0, len(city)) * spread / np.cos(np.radians(centre_lat))
+        real = len(FRENCH_CINEMAS)
+        lat[:real] = [c["lat"] for c in FRENCH_CINEMAS]
+        lng[:real] = [c["lng"] for c in FRENCH_CINEMAS]
+        cinema_id = np.concatenate([
+            np.array([c["id"] for c in FRENCH_CINEMAS], dtype=np.int32),
+            WORLD_CINEMA_ID_BASE + np.arange(generated, dtype=np.int32)
+        ])
+        districts = np.array([c[5] for c in WORLD_CITIES])[city]
+        postcode = np.array([c[4] for c in WORLD_CITIES])[city] + 1 + (rng.random(len(city)) * districts).astype(np.int32)
+        n = len(cinema_id)
+        order = np.argsort(cinema_id, kind="stable")
+        screens = rng.integers(1, 13, n).astype(np.int8)
+        
+        # Films: sorted by id, popularity follows a Zipf-like curve over the title order
+        titles = world_film_titles(films, title_rng)
+        catalog = {movie["title"]: movie for movie in LOCAL_CATALOG.movies}
+        film_id = np.array(FILM_REGISTRY.intern_many(titles), dtype=np.int32)
+        duration = rng.integers(85, 181, len(titles)).astype(np.int16)
+        for i, title in enumerate(titles):
+            if catalog.get(title, {}).get("duration"):
+                duration[i] = int(catalog[title]["duration"])
+        popularity = 1.0 / (np.arange(len(titles)) + 5.0)
+        popularity /= popularity.sum()
+        film_order = np.argsort(film_id, kind="stable")
+        rank_to_sorted = np.empty(len(titles), dtype=np.int64)
+        rank_to_sorted[film_order] = np.arange(len(titles))
+        
+        # Each cinema programmes a few more films than it has screens, picked by popularity
+        screens = screens[order]
+        programme = rank_to_sorted[rng.choice(len(titles), size=(n, 15), p=popularity)]
+        programme_size = np.minimum(screens.astype(np.int64) + 3, 15)
+        
+        # Showings: every screen-day runs a main film, sometimes alternating with a second
+        # one, packed back to back by runtime plus cleaning gap (no overlaps on a screen)
+        rows = n * days
+        film_dtype = np.int16 if len(titles) < 2 ** 15 else np.int32
+        sorted_duration = duration[film_order].astype(np.int32)
+        screen_cinema = np.repeat(np.arange(n, dtype=np.int64), screens)
+        screen_number = np.arange(len(screen_cinema)) - np.repeat(np.cumsum(screens) - screens, screens)
+        screen_days = len(screen_cinema) * days
+        parts = {"row": [], "film": [], "start": [], "screen": []}
+        chunk = 1 << 20
+        for lo in range(0, screen_days, chunk):
+            sd = np.arange(lo, min(lo + chunk, screen_days), dtype=np.int64)
+            cinema_of, day_of = screen_cinema[sd // days], sd % days
+            picks = (rng.random((len(sd), 2)) * programme_size[cinema_of, None]).astype(np.int64)
+            main, second = programme[cinema_of, picks[:, 0]], programme[cinema_of, picks[:, 1]]
+            films_k = np.where(rng.random((len(sd), SCREEN_MAX_SHOWS)) < 0.7, main[:, None], second[:, None])
+            block = -(-(sorted_duration[films_k] + SCREEN_CLEANING_GAP) // SCREEN_SLOT_MINUTES) * SCREEN_SLOT_MINUTES
+            opening = clock_minutes(SCREEN_OPENING) + rng.integers(0, 7, len(sd)) * 15
+            starts = opening[:, None] + np.cumsum(block, axis=1) - block
+            valid = starts <= clock_minutes(SCREEN_LAST_START)
+            parts["row"].append(np.broadcast_to((cinema_of * days + day_of)[:, None], valid.shape)[valid])
+            parts["film"].append(films_k[valid].astype(film_dtype))
+            parts["start"].append(starts[valid].astype(np.int16))
+            parts["screen"].append(np.broadcast_to(screen_number[sd // days][:, None], valid.shape)[valid].astype(np.int8))
+        row_of, showing_film, showing_start, showing_screen = (np.concatenate(parts[k]) for k in ("row", "film", "start", "screen"))
+        del parts
+        total = len(row_of)
+        by_row = np.lexsort((showing_screen, showing_start, row_of))
+        row_of = row_of[by_row]
+        showing_film, showing_start, showing_screen = showing_film[by_row], showing_start[by_row], showing_screen[by_row]
+        showing_ptr = np.zeros(rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(row_of, minlength=rows), out=showing_ptr[1:])
+        
+        # Interval index: each day's showings sorted by start time (binary-searchable)
+        index_dtype = np.int32 if total < 2 ** 31 else np.int64
+        day_of = row_of % days
+        day_start_order = np.lexsort((showing_start, day_of)).astype(index_dtype)
+        day_start_sorted = showing_start[day_start_order]
+        day_start_ptr = np.zeros(days + 1, dtype=np.int64)
+        np.cumsum(np.bincount(day_of, minlength=days), out=day_start_ptr[1:])
+        
+        film_day = showing_film.astype(np.int64) * days + day_of
+        film_showing_order = np.argsort(film_day, kind="stable").astype(index_dtype)
+        film_showing_ptr = np.zeros(len(titles) * days + 1, dtype=np.int64)
+        np.cumsum(np.bincount(film_day, minlength=len(titles) * days), out=film_showing_ptr[1:])
+        
+        return cls({
+            "format": np.array([SIMULATION_WORLD_FORMAT]),
+            "start_date": np.array([start_date], dtype="datetime64[D]"),
+            "cinema_id": cinema_id[order],
+            "cinema_lat": lat[order].astype(np.float32),
+            "cinema_lng": lng[order].astype(np.float32),
+            "cinema_city": city[order],
+            "cinema_screens": screens,
+            "cinema_chain": rng.integers(0, len(CINEMA_CHAINS), n).astype(np.int8),
+            "cinema_location": rng.integers(0, len(CINEMA_LOCATIONS), n).astype(np.int8),
+            "cinema_type": rng.integers(0, len(CINEMA_TYPES), n).astype(np.int8),
+            "cinema_street_number": rng.integers(1, 201, n).astype(np.int16),
+            "cinema_street_type": rng.integers(0, len(STREET_TYPES), n).astype(np.int8),
+            "cinema_street_name": rng.integers(0, len(STREET_NAMES), n).astype(np.int8),
+            "cinema_postcode": postcode[order].astype(np.int32),
+            "film_id": film_id[film_order],
+            "film_title": np.array(titles)[film_order],
+            "film_duration": duration[film_order],
+            "film_genre": rng.integers(0, len(MOVIE_GENRES), len(titles)).astype(np.int8),
+            "film_rating": rng.integers(0, len(AGE_RATINGS), len(titles)).astype(np.int8),
+            "showing_ptr": showing_ptr,
+            "showing_film": showing_film,
+            "showing_start": showing_start,
+            "showing_screen": showing_screen,
+            "film_showing_ptr": film_showing_ptr,
+            "film_showing_order": film_showing_order,
+            "day_start_ptr": day_start_ptr,
+            "day_start_order": day_start_order,
+            "day_start_sorted": day_start_sorted
+        })
+
+    def save(self, path: str) -> None:
+        """Save as one .npz file, or as a directory of .npy files (memory-mappable)"""
+        arrays = {name: getattr(self, name) for name in self.ARRAYS}
+        if path.endswith(".npz"):
+            np.savez(path, **arrays)
+            return
+        os.makedirs(path, exist_ok=True)
+        for name, values in arrays.items():
+            np.save(os.path.join(path, f"{name}.npy"), values)
+
+    @classmethod
+    def load(cls, path: str) -> "SimulatedWorld":
+        """Load a saved world; a directory of .npy files is memory-mapped read-only"""
+        if path.endswith(".npz"):
+            with np.load(path) as data:
+                world = cls({name: data[name] for name in cls.ARRAYS})
+        else:
+            world = cls({name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in cls.ARRAYS})
+        if int(world.format[0]) != SIMULATION_WORLD_FORMAT:
+            raise ValueError(f"Saved world {path} has an outdated format")
+        for film_id, title in zip(world.film_id.tolist(), world.film_title.tolist()):
+            FILM_REGISTRY.register(film_id, title)
+        return world
+
+    def day_index(self, date: str) -> int:
+        """Day row of a date; dates outside the generated range wrap around"""
+        return int((np.datetime64(date, "D") - self.start_date[0]).astype(np.int64)) % self.days
+
+    def find_cinema(self, cinema_id: int) -> Optional[int]:
+        i = int(np.searchsorted(self.cinema_id, cinema_id))
+        return i if i < len(self.cinema_id) and self.cinema_id[i] == cinema_id else None
+
+    def find_film(self, film_id: int) -> Optional[int]:
+        i = int(np.searchsorted(self.film_id, film_id))
+        return i if i < len(self.film_id) and self.film_id[i] == film_id else None
+
+    def cinema_info(self, i: int) -> Dict[str, Any]:
+        """Cinema record rendered from its columns (real cinemas keep their name)"""
+        cinema_id = int(self.cinema_id[i])
+        city = WORLD_CITIES[int(self.cinema_city[i])][0]
+        real = self.real_cinemas.get(cinema_id)
+        if real:
+            name, address = real["name"], real["address"]
+        else:
+            location = CINEMA_LOCATIONS[int(self.cinema_location[i])] if city == "Paris" else city
+            name = " ".join(part for part in (CINEMA_CHAINS[int(self.cinema_chain[i])], location, CINEMA_TYPES[int(self.cinema_type[i])]) if part)
+            address = f"{int(self.cinema_street_number[i])} {STREET_TYPES[int(self.cinema_street_type[i])]} {STREET_NAMES[int(self.cinema_street_name[i])]}"
+        return {
+            "id": cinema_id,
+            "name": name,
+            "address": address,
+            "city": city,
+            "postcode": int(self.cinema_postcode[i]),
+            "lat": float(self.cinema_lat[i]),
+            "lng": float(self.cinema_lng[i])
+        }
+
+    def film_info(self, f: int) -> Dict[str, Any]:
+        return {
+            "id": int(self.film_id[f]),
+            "title": str(self.film_title[f]),
+            "age_rating": AGE_RATINGS[int(self.film_rating[f])]
+        }
+
+    def showtime(self, f: int, start: int, screen: int) -> Dict[str, Any]:
+        return {"start_time": clock_text(start), "end_time": clock_text(int(start) + int(self.film_duration[f])), "screen": int(screen) + 1}
+
+    @property
+    def tree(self) -> CinemaKDTree:
+        """KD-tree over the world's cinemas (built on first spatial query)"""
+        if self._tree is None:
+            with self._tree_lock:
+                if self._tree is None:
+                    self._tree = CinemaKDTree(self.cinema_lat, self.cinema_lng)
+        return self._tree
+
+    def distances(self, latitude: float, longitude: float, cinemas: Any = slice(None)) -> Any:
+        """Haversine distance in miles from a point to cinemas"""
+        return np.round(haversine_miles(latitude, longitude, self.cinema_lat[cinemas].astype(np.float64),
+                                        self.cinema_lng[cinemas].astype(np.float64)), 2)
+
+    def nearby(self, latitude: float, longitude: float, radius: float, limit: int) -> List[Dict[str, Any]]:
+        """Nearest cinemas within radius miles, with true distances"""
+        cinemas, miles = self.tree.query(latitude, longitude, k=limit, radius=radius)
+        return [dict(self.cinema_info(int(i)), distance=round(float(d), 2)) for i, d in zip(cinemas, miles)]
+
+    def programme(self, i: int, day: int, film: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Films showing at a cinema on a day, showtimes in start order"""
+        row = i * self.days + day
+        lo, hi = int(self.showing_ptr[row]), int(self.showing_ptr[row + 1])
+        films = {}
+        for f, start, screen in zip(self.showing_film[lo:hi].tolist(), self.showing_start[lo:hi].tolist(),
+                                    self.showing_screen[lo:hi].tolist()):
+            if film is not None and f != film:
+                continue
+            if f not in films:
+                films[f] = dict(self.film_info(f), showtimes=[])
+            films[f]["showtimes"].append(self.showtime(f, start, screen))
+        return list(films.values())
+
+    def film_cinemas(self, f: int, day: int, latitude: float, longitude: float, limit: int) -> List[Dict[str, Any]]:
+        """Nearest cinemas showing a film on a day, with that film's showtimes"""
+        key = f * self.days + day
+        showings = np.asarray(self.film_showing_order[self.film_showing_ptr[key]:self.film_showing_ptr[key + 1]], dtype=np.int64)
+        if not len(showings):
+            return []
+        cinemas = (np.searchsorted(self.showing_ptr, showings, side="right") - 1) // self.days
+        unique = np.unique(cinemas)
+        distance = self.distances(latitude, longitude, unique)
+        nearest = np.argsort(distance, kind="stable")[:limit]
+        results = []
+        for j in nearest:
+            mine = showings[cinemas == unique[j]]
+            results.append(dict(
+                self.cinema_info(int(unique[j])),
+                distance=float(distance[j]),
+                showtimes=[self.showtime(f, start, screen) for start, screen in
+                           zip(self.showing_start[mine].tolist(), self.showing_screen[mine].tolist())]
+            ))
+            results[-1]["showtime_count"] = len(results[-1]["showtimes"])
+        return results
+
+    def showing_record(self, showing: int, cinema: int, distance: Optional[float] = None) -> Dict[str, Any]:
+        f = int(self.showing_film[showing])
+        record = dict(self.showtime(f, self.showing_start[showing], self.showing_screen[showing]),
+                      film=self.film_info(f), cinema=self.cinema_info(cinema))
+        if distance is not None:
+            record["cinema"]["distance"] = round(float(distance), 2)
+        return record
+
+    def showings_between(self, day: int, start: int, end: int, latitude: Optional[float] = None,
+                         longitude: Optional[float] = None, radius: Optional[float] = None,
+                         film: Optional[int] = None, limit: int = 50) -> tuple:
+        """(total, records) of showings starting in [start, end] minutes on a day
+
+        With a location, the KD-tree finds cinemas within radius miles and each
+        cinema's start-sorted row is binary searched (all rows at once); otherwise the day's
+        start-time index is. Records are ordered by start time, then distance.
+        """
+        if end < start:
+            return 0, []
+        if latitude is not None and longitude is not None:
+            cinemas, miles = self.tree.query(latitude, longitude, radius=radius)
+            rows = cinemas * self.days + day
+            lo, hi = self.showing_ptr[rows], self.showing_ptr[rows + 1]
+            first = self._bisect_rows(lo, hi, start, right=False)
+            last = self._bisect_rows(lo, hi, end, right=True)
+            counts = last - first
+            owner = np.repeat(np.arange(len(rows)), counts)
+            showings = np.repeat(first, counts) + np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+            if film is not None:
+                keep = self.showing_film[showings] == film
+                showings, owner = showings[keep], owner[keep]
+            order = np.lexsort((showings, miles[owner], self.showing_start[showings]))[:limit]
+            return len(showings), [self.showing_record(int(showings[j]), int(cinemas[owner[j]]), miles[owner[j]]) for j in order]
+        lo, hi = int(self.day_start_ptr[day]), int(self.day_start_ptr[day + 1])
+        starts = self.day_start_sorted[lo:hi]
+        first = lo + int(np.searchsorted(starts, start, side="left"))
+        last = lo + int(np.searchsorted(starts, end, side="right"))
+        showings = np.asarray(self.day_start_order[first:last], dtype=np.int64)
+        if film is not None:
+            showings = showings[self.showing_film[showings] == film]
+        cinemas = (np.searchsorted(self.showing_ptr, showings[:limit], side="right") - 1) // self.days
+        return len(showings), [self.showing_record(i, c) for i, c in zip(showings[:limit].tolist(), cinemas.tolist())]
+
+    def _bisect_rows(self, lo: Any, hi: Any, value: int, right: bool) -> Any:
+        """Vectorized binary search of value in many start-sorted rows [lo, hi)"""
+        lo, hi = lo.astype(np.int64), hi.astype(np.int64)
+        last = max(len(self.showing_start) - 1, 0)
+        while True:
+            active = lo < hi
+            if not active.any():
+                return lo
+            mid = (lo + hi) // 2
+            starts = self.showing_start[np.minimum(mid, last)]
+            below = (starts <= value) if right else (starts < value)
+            lo = np.where(active & below, mid + 1, lo)
+            hi = np.where(active & ~below, mid, hi)
+
+_WORLD = None
+_WORLD_LOCK = threading.Lock()
+
+def get_world() -> Optional[SimulatedWorld]:
+    """The shared simulated world (loaded or generated once), or None without numpy"""
+    global _WORLD
+    if np is None:
+        return None
+    if _WORLD is None:
+        with _WORLD_LOCK:
+            if _WORLD is None:
+                try:
+                    _WORLD = SimulatedWorld.load(SIMULATION_WORLD_PATH) if SIMULATION_WORLD_PATH else None
+                except (OSError, KeyError, ValueError):
+                    _WORLD = None  # missing or outdated: generate a new one
+                if _WORLD is None:
+                    _WORLD = SimulatedWorld.generate()
+                    if SIMULATION_WORLD_PATH:
+                        _WORLD.save(SIMULATION_WORLD_PATH)
+    return _WORLD
+
+@tool
+def check_film_showtimes(film_id: str, date: str = "", latitude: float = 48.8566, longitude: float = 2.3522) -> Dict[str, Any]:
+    """
+    Check which cinemas are showing a specific film (simulated - works with ANY film ID)
+    
+    Args:
+        film_id: Film ID to check
+        date: Date in YYYY-MM-DD format (empty string for today)
+        latitude: Latitude of the location (default: Paris)
+        longitude: Longitude of the location (default: Paris)
+    
+    Returns:
+        Dictionary containing cinemas showing the film
+    """
+    requested, date = date, simulation_date(date)
+    if date is None:
+        return {"error": f"Invalid date: {requested} (expected YYYY-MM-DD)"}
+    if not str(film_id).strip().isdigit():
+        return {"error": f"Invalid film ID: {film_id} (search_film_by_title gives a film's ID)"}
+    
+    # Films in the pre-generated world are an indexed lookup
+    world = get_world()
+    film = world.find_film(int(film_id)) if world else None
+    if film is not None:
+        return {
+            "status": "success",
+            "film": world.film_info(film),
+            "date": date,
+            "cinemas": world.film_cinemas(film, world.day_index(date), float(latitude), float(longitude), SIMULATION_NEARBY_LIMIT)
+        }
+    
+    # Same film, date and location always give the same cinemas and showtimes
+    result = copy.deepcopy(simulate_film_showtimes(int(film_id), date, float(latitude), float(longitude)))
+    result["film"]["title"] = FILM_REGISTRY.title_for(int(film_id)) or result["film"]["title"]
+    return result
+
+@tool
+def find_cinemas_nearby(latitude: float = 48.8566, longitude: float = 2.3522, radius: int = 10) -> Dict[str, Any]:
+    """
+    Find cinemas near a specific location (simulated - generates random cinemas)
+    
+    Args:
+        latitude: Latitude of the location (default: Paris)
+        longitude: Longitude of the location (default: Paris)
+        radius: Search radius in miles (default: 10)
+    
+    Returns:
+        Dictionary containing list of nearby cinemas
+    """
+    world = get_world()
+    if world is None:
+        return copy.deepcopy(simulate_cinemas_nearby(float(latitude), float(longitude), radius))
+    
+    nearby_cinemas = world.nearby(float(latitude), float(longitude), float(radius), SIMULATION_NEARBY_LIMIT)
+    return {
+        "status": "success",
+        "count": len(nearby_cinemas),
+        "cinemas": nearby_cinemas,
+        "search_location": {
+            "latitude": latitude,
+            "longitude": longitude,
+            "radius": radius
+        }
+    }
+
+@tool
+def get_cinema_showtimes(cinema_id: str, movie_id: str = "", date: str = "") -> Dict[str, Any]:
+    """
+    Get showtimes for a specific cinema (simulated - generates random movies)
+    
+    Args:
+        cinema_id: Cinema ID
+        movie_id: Optional movie ID to filter showtimes
+        date: Date in YYYY-MM-DD format (empty string for today)
+    
+    Returns:
+        Dictionary containing showtimes information
+    """
+    requested, date = date, simulation_date(date)
+    if date is None:
+        return {"error": f"Invalid date: {requested} (expected YYYY-MM-DD)"}
+    if not str(cinema_id).strip().isdigit():
+        return {"error": f"Invalid cinema ID: {cinema_id}"}
+    return cinema_programme(cinema_id, movie_id, date)
+
+def cinema_programme(cinema_id: str, movie_id: str, date: str) -> Dict[str, Any]:
+    """Programme of one cinema on one date, optionally for one film"""
+    # Cinemas in the pre-generated world are an indexed lookup
+    world = get_world()
+    cinema = world.find_cinema(int(cinema_id)) if world else None
+    if cinema is not None:
+        movie_id = str(movie_id or "").strip()
+        film = world.find_film(int(movie_id)) if movie_id.isdigit() else None
+        # An id outside the registry cannot filter anything, so list the whole programme
+        info = world.cinema_info(cinema)
+        response = {
+            "status": "success",
+            "cinema": {key: info[key] for key in ("id", "name", "address", "city")},
+            "date": date,
+            "films": world.programme(cinema, world.day_index(date), film)
+        }
+        if movie_id and film is None:
+            response["unresolved_movie_id"] = movie_id
+            response["note"] = "This movie id is not a simulated film, so every film is listed."
+        return response
+    
+    # Same cinema and date always give the same programme
+    return copy.deepcopy(simulate_cinema_programme(int(cinema_id), date))
+
+@tool
+def get_showtimes_matrix(cinema_ids: List[str], dates: List[str] = None, film_id: str = "") -> Dict[str, Any]:
+    """
+    Get showtimes for several cinemas over several dates in one call (simulated)
+    
+    Args:
+        cinema_ids: List of cinema IDs
+        dates: List of dates in YYYY-MM-DD format (empty for today)
+        film_id: Optional film ID to filter showtimes (empty string for all movies)
+    
+    Returns:
+        Dictionary containing one time-sorted timeline of showings, and per-cell errors
+    """
+    # Dedupe while keeping the caller's order
+    cinema_ids = list(dict.fromkeys(str(c).strip() for c in cinema_ids or [] if str(c).strip()))
+    dates = list(dict.fromkeys(d.strip() for d in dates or [] if d and d.strip()))
+    invalid = [d for d in dates if simulation_date(d) is None]
+    if invalid:
+        return {"error": f"Invalid date: {', '.join(invalid)} (expected YYYY-MM-DD)"}
+    dates = list(dict.fromkeys(simulation_date(d) for d in dates)) or [simulation_date("")]
+    
+    if not cinema_ids:
+        return {"error": "No cinema IDs provided."}
+    cells = [(cinema_id, date) for cinema_id in cinema_ids for date in dates]
+    if len(cells) > SIMULATION_MATRIX_MAX_CELLS:
+        return {"error": f"Too many cinema/date combinations: at most {SIMULATION_MATRIX_MAX_CELLS} per call."}
+    
+    timeline = []
+    errors = []
+    grid = {cinema_id: {} for cinema_id in cinema_ids}
+    for cinema_id, date in cells:
+        if not cinema_id.isdigit():
+            errors.append({"cinema_id": cinema_id, "date": date, "error": f"Invalid cinema ID: {cinema_id}"})
+            continue
+        programme = cinema_programme(cinema_id, film_id, date)
+        count = 0
+        for film in programme["films"]:
+            for showtime in film["showtimes"]:
+                timeline.append({
+                    "date": date,
+                    "start_time": showtime["start_time"],
+                    "end_time": showtime["end_time"],
+                    "format": showtime.get("format", "Standard"),
+                    "cinema_id": cinema_id,
+                    "cinema_name": programme["cinema"]["name"],
+                    "film_id": film["id"],
+                    "film_title": film["title"]
+                })
+                count += 1
+        grid[cinema_id][date] = count
+    
+    timeline.sort(key=lambda s: (s["date"], s["start_time"], s["cinema_name"]))
+    
+    return {
+        "status": "success" if not errors else "partial" if len(errors) < len(cells) else "error",
+        "count": len(timeline),
+        "timeline": timeline,
+        "showings_per_cinema": grid,
+        "errors": errors
+    }
+
+@tool
+def find_showings_between(start_time: str = "19:00", end_time: str = "21:00", date: str = "",
+                          latitude: float = 48.8566, longitude: float = 2.3522, radius: float = 5,
+                          film_id: str = "") -> Dict[str, Any]:
+    """
+    Find showings starting in a time window at cinemas near a location (simulated)
+    
+    Args:
+        start_time: Earliest start time in HH:MM format (default: 19:00)
+        end_time: Latest start time in HH:MM format (default: 21:00)
+        date: Date in YYYY-MM-DD format (empty string for today)
+        latitude: Latitude of the location (default: Paris)
+        longitude: Longitude of the location (default: Paris)
+        radius: Search radius in miles (default: 5)
+        film_id: Optional film ID to restrict the search to one film
+    
+    Returns:
+        Dictionary containing the matching showings, earliest first, then nearest
+    """
+    requested, date = date, simulation_date(date)
+    if date is None:
+        return {"error": f"Invalid date: {requested} (expected YYYY-MM-DD)"}
+    try:
+        window = (clock_minutes(start_time, strict=True), clock_minutes(end_time, strict=True))
+    except ValueError:
+        return {"error": f"Invalid time window: {start_time} - {end_time} (expected HH:MM between 00:00 and 23:59)"}
+    if window[0] > window[1]:
+        return {"error": f"Invalid time window: {start_time} - {end_time} (start must not be after end; "
+                         "split a window crossing midnight into two searches)"}
+    if film_id and film_id.strip() and not film_id.strip().isdigit():
+        return {"error": f"Invalid film ID: {film_id}"}
+    film_filter = int(film_id) if film_id and film_id.strip() else None
+    
+    world = get_world()
+    if world is not None:
+        film = world.find_film(film_filter) if film_filter is not None else None
+        if film_filter is not None and film is None:
+            total, showings = 0, []
+        else:
+            total, showings = world.showings_between(world.day_index(date), window[0], window[1], float(latitude),
+                                                     float(longitude), float(radius), film, SIMULATION_NEARBY_LIMIT * 5)
+    else:
+        # Without the pre-generated world: scan the simulated programmes of nearby cinemas
+        found = []
+        for cinema in simulate_cinemas_nearby(float(latitude), float(longitude), radius)["cinemas"]:
+            for film in simulate_cinema_programme(cinema["id"], date)["films"]:
+                if film_filter is not None and film["id"] != film_filter:
+                    continue
+                for showtime in film["showtimes"]:
+                    if window[0] <= clock_minutes(showtime["start_time"]) <= window[1]:
+                        found.append(dict(showtime, film={key: film[key] for key in ("id", "title", "age_rating")},
+                                          cinema={key: cinema[key] for key in ("id", "name", "address", "city", "distance")}))
+        found.sort(key=lambda s: (s["start_time"], s["cinema"]["distance"]))
+        total, showings = len(found), copy.deepcopy(found[:SIMULATION_NEARBY_LIMIT * 5])
+    
+    return {
+        "status": "success",
+        "date": date,
+        "window": {"start_time": start_time, "end_time": end_time},
+        "search_location": {
+            "latitude": latitude,
+            "longitude": longitude,
+            "radius": radius
+        },
+        "total": total,
+        "showings": showings
+    }
@@ -4,13 +4,327 @@ Uses MovieGlu API for cinema and showtime information
 """
 
 import os
+import json
+import atexit
+import math
+import time
+import random
+import tempfile
+import threading
+import unicodedata
 import requests
+from requests.adapters import HTTPAdapter
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
+from urllib.parse import urlparse
 from ibm_watsonx_orchestrate.agent_builder.tools import tool
 
-# MovieGlu API Configuration
-MOVIEGLU_BASE_URL = "https://api-gate2.movieglu.com"
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:  # Fall back to the standard library decoder
+    json_loads = json.loads
+
+try:
+    import fcntl
+except ImportError:  # No advisory file locks (Windows): writes stay atomic but may race
+    fcntl = None
+
+# MovieGlu API Configuration (point MOVIEGLU_BASE_URL at a local stand-in for load tests)
+MOVIEGLU_BASE_URL = os.getenv('MOVIEGLU_BASE_URL', "https://api-gate2.movieglu.com").rstrip('/')
+
+# Upstream call protection: timeouts, jittered retries and circuit breaking
+UPSTREAM_TIMEOUT = (float(os.getenv('UPSTREAM_CONNECT_TIMEOUT', '3.05')),
+                    float(os.getenv('UPSTREAM_READ_TIMEOUT', '10')))
+UPSTREAM_MAX_RETRIES = int(os.getenv('UPSTREAM_MAX_RETRIES', '2'))
+UPSTREAM_BACKOFF_BASE = float(os.getenv('UPSTREAM_BACKOFF_BASE', '0.25'))
+UPSTREAM_BACKOFF_CAP = float(os.getenv('UPSTREAM_BACKOFF_CAP', '4'))
+UPSTREAM_MAX_THROTTLE_WAIT = float(os.getenv('UPSTREAM_MAX_THROTTLE_WAIT', '2'))
+UPSTREAM_BREAKER_THRESHOLD = int(os.getenv('UPSTREAM_BREAKER_THRESHOLD', '5'))
+UPSTREAM_BREAKER_RESET = float(os.getenv('UPSTREAM_BREAKER_RESET', '30'))
+
+# Pooled session and daily quota accounting for the MovieGlu client
+MOVIEGLU_POOL_MAXSIZE = int(os.getenv('MOVIEGLU_POOL_MAXSIZE', '8'))
+MOVIEGLU_DAILY_QUOTA = int(os.getenv('MOVIEGLU_DAILY_QUOTA', '75'))
+MOVIEGLU_QUOTA_RESERVE = int(os.getenv('MOVIEGLU_QUOTA_RESERVE', '0'))
+# Requests are added to the shared quota file in batches, and one by one close to the cap;
+# processes sharing the file can each overshoot it by about a batch, which MOVIEGLU_QUOTA_RESERVE absorbs
+MOVIEGLU_QUOTA_SYNC_EVERY = int(os.getenv('MOVIEGLU_QUOTA_SYNC_EVERY', '10'))
+MOVIEGLU_QUOTA_SYNC_SECONDS = float(os.getenv('MOVIEGLU_QUOTA_SYNC_SECONDS', '2'))
+
+# Local cache directory shared by the cinema agent tools
+CACHE_DIR = os.getenv('CINEMA_AGENT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'cinema_agent'))
+MOVIEGLU_QUOTA_PATH = os.getenv('MOVIEGLU_QUOTA_PATH', os.path.join(CACHE_DIR, 'movieglu_quota.json'))
+
+# Showtime cache: entries expire after a TTL or at a local time of day, whichever is first
+SHOWTIME_CACHE_TTL = int(os.getenv('SHOWTIME_CACHE_TTL', str(6 * 3600)))
+SHOWTIME_CACHE_EXPIRE_AT = os.getenv('SHOWTIME_CACHE_EXPIRE_AT', '04:00')
+SHOWTIME_CACHE_MAX_ENTRIES = int(os.getenv('SHOWTIME_CACHE_MAX_ENTRIES', '2048'))
+SHOWTIME_GEO_PRECISION = int(os.getenv('SHOWTIME_GEO_PRECISION', '2'))
+
+# TMDb <-> MovieGlu film id cross-reference (also written by the movie search tool)
+FILM_XREF_PATH = os.getenv('FILM_XREF_PATH', os.path.join(CACHE_DIR, 'film_xref.json'))
+FILM_XREF_VERSION = 1
+
+# Local geospatial cinema index: grid cell size in degrees and refresh interval
+CINEMA_INDEX_PATH = os.getenv('CINEMA_INDEX_PATH', os.path.join(CACHE_DIR, 'cinema_index.json'))
+CINEMA_INDEX_CELL_DEG = float(os.getenv('CINEMA_INDEX_CELL_DEG', '0.05'))
+CINEMA_INDEX_REFRESH = int(os.getenv('CINEMA_INDEX_REFRESH', str(7 * 24 * 3600)))
+CINEMA_INDEX_SEED_SIMULATION = os.getenv('CINEMA_INDEX_SEED_SIMULATION', 'false').lower() in ('1', 'true', 'yes')
+EARTH_RADIUS_MILES = 3958.8
+
+# Seed cinemas from the cinema simulation tool (simulation ids, so only seeded on request)
+FRENCH_CINEMAS = [
+    {"id": 19001, "name": "Pathé Opéra", "address": "2 Boulevard des Capucines", "city": "Paris", "lat": 48.8707, "lng": 2.3322},
+    {"id": 19002, "name": "UGC Ciné Cité Les Halles", "address": "7 Place de la Rotonde", "city": "Paris", "lat": 48.8606, "lng": 2.3470},
+    {"id": 19003, "name": "Gaumont Champs-Élysées", "address": "66 Avenue des Champs-Élysées", "city": "Paris", "lat": 48.8704, "lng": 2.3075},
+    {"id": 19004, "name": "MK2 Bibliothèque", "address": "128 Avenue de France", "city": "Paris", "lat": 48.8299, "lng": 2.3763},
+    {"id": 19005, "name": "Luminor Hôtel de Ville", "address": "20 rue du Temple", "city": "Paris", "lat": 48.8586, "lng": 2.3535},
+    {"id": 19006, "name": "Pathé Beaugrenelle", "address": "7 Rue Linois", "city": "Paris", "lat": 48.8470, "lng": 2.2877},
+    {"id": 19007, "name": "UGC Montparnasse", "address": "83 Boulevard du Montparnasse", "city": "Paris", "lat": 48.8436, "lng": 2.3266},
+    {"id": 19008, "name": "Gaumont Aquaboulevard", "address": "8 Rue du Colonel Pierre Avia", "city": "Paris", "lat": 48.8362, "lng": 2.2816},
+    {"id": 19009, "name": "Pathé La Villette", "address": "30 Avenue Corentin Cariou", "city": "Paris", "lat": 48.8958, "lng": 2.3904},
+    {"id": 19010, "name": "UGC Lyon Bastille", "address": "15 Rue du Faubourg Saint-Antoine", "city": "Paris", "lat": 48.8515, "lng": 2.3710},
+]
+
+# Fan-out limits for get_showtimes_matrix
+SHOWTIMES_MATRIX_WORKERS = int(os.getenv('SHOWTIMES_MATRIX_WORKERS', '4'))
+SHOWTIMES_MATRIX_MAX_CELLS = int(os.getenv('SHOWTIMES_MATRIX_MAX_CELLS', '21'))
+
+# Per-host request quotas (tokens per second and burst size)
+MOVIEGLU_RATE_LIMIT = float(os.getenv('MOVIEGLU_RATE_LIMIT', '5'))
+MOVIEGLU_RATE_BURST = float(os.getenv('MOVIEGLU_RATE_BURST', '5'))
+UPSTREAM_POLICIES = {
+    urlparse(MOVIEGLU_BASE_URL).hostname: {"rate": MOVIEGLU_RATE_LIMIT, "burst": MOVIEGLU_RATE_BURST},
+    "default": {"rate": 10, "burst": 10}
+}
+
+
+class UpstreamUnavailableError(requests.RequestException):
+    """Raised when an upstream call is short-circuited or throttled away"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at `rate` tokens per second"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait: float) -> Optional[float]:
+        """Take one token, waiting up to max_wait seconds; returns the wait or None"""
+        deadline = time.monotonic() + max_wait
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            if now + delay > deadline:
+                return None
+            time.sleep(delay)
+            waited += delay
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets one probe through after a cool-down"""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.state = "closed"
+        self.opened_at = 0.0
+        self.prober = None  # thread sending the half-open probe
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now"""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self.prober = threading.get_ident()
+                return True
+            return False
+
+    def _probing(self) -> bool:
+        return self.state == "half_open" and self.prober == threading.get_ident()
+
+    def yield_probe(self) -> None:
+        """Hand an unsent probe back: open again, with the next call free to probe"""
+        with self._lock:
+            if self._probing():
+                self.state = "open"
+
+    def end_probe(self) -> None:
+        """A probe that ended without recording an outcome counts as a failure"""
+        with self._lock:
+            if self._probing():
+                self.failures += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.state = "closed"
+            self.prober = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+class MovieGluQuotaExceededError(UpstreamUnavailableError):
+    """Raised when the local daily MovieGlu quota would be exceeded"""
+
+
+class UpstreamGuard:
+    """Per-host rate limiting, jittered retries and circuit breaking for upstream calls"""
+
+    def __init__(self, policies: Dict[str, Dict[str, float]]):
+        self.policies = policies
+        self.buckets = {}
+        self.breakers = {}
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "throttled": 0, "retried": 0, "short_circuited": 0, "failures": 0}
+
+    def _for_host(self, host: str) -> tuple:
+        with self._lock:
+            if host not in self.buckets:
+                policy = self.policies.get(host, self.policies["default"])
+                self.buckets[host] = TokenBucket(policy["rate"], policy["burst"])
+                self.breakers[host] = CircuitBreaker(UPSTREAM_BREAKER_THRESHOLD, UPSTREAM_BREAKER_RESET)
+            return self.buckets[host], self.breakers[host]
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def request(self, send, url: str, **kwargs) -> requests.Response:
+        """Call send(url, **kwargs) under the host's limiter, retry policy and breaker"""
+        host = urlparse(url).hostname or ""
+        bucket, breaker = self._for_host(host)
+        kwargs.setdefault("timeout", UPSTREAM_TIMEOUT)
+        self._count("calls")
+        
+        for attempt in range(UPSTREAM_MAX_RETRIES + 1):
+            if not breaker.allow():
+                self._count("short_circuited")
+                raise UpstreamUnavailableError(f"{host} is temporarily unavailable (circuit open)")
+            waited = bucket.acquire(UPSTREAM_MAX_THROTTLE_WAIT)
+            if waited is None:
+                breaker.yield_probe()
+                self._count("throttled")
+                raise UpstreamUnavailableError(f"Rate limit for {host} exceeded, try again shortly")
+            if waited > 0:
+                self._count("throttled")
+            
+            retry_after = None
+            try:
+                response = send(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                breaker.record_failure()
+                self._count("failures")
+                if attempt == UPSTREAM_MAX_RETRIES:
+                    raise
+            else:
+                if response.status_code != 429 and response.status_code < 500:
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                self._count("failures")
+                if attempt == UPSTREAM_MAX_RETRIES:
+                    return response
+                retry_after = response.headers.get("Retry-After")
+            finally:
+                # Any other exception must not leave the breaker half-open for good
+                breaker.end_probe()
+            
+            # Full-jitter exponential backoff, honouring Retry-After when given
+            delay = random.uniform(0, min(UPSTREAM_BACKOFF_CAP, UPSTREAM_BACKOFF_BASE * 2 ** attempt))
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, min(float(retry_after), UPSTREAM_BACKOFF_CAP))
+            self._count("retried")
+            time.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for throttled, retried and short-circuited calls, plus breaker states"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["breakers"] = {host: breaker.state for host, breaker in self.breakers.items()}
+        return stats
+
+
+
+class SingleFlight:
+    """Collapse concurrent identical calls into one in-flight upstream call"""
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "executed": 0, "collapsed": 0}
+
+    def do(self, key: Any, fn) -> Any:
+        """Run fn() once per key at a time; concurrent callers share its result or error"""
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self._stats["collapsed"] += 1
+                leader = False
+            else:
+                call = self._calls[key] = SingleFlight._Call()
+                self._stats["executed"] += 1
+                leader = True
+        
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        return stats
+
+
+# Module-level upstream guard and single-flight shared by every MovieGlu tool
+UPSTREAM_GUARD = UpstreamGuard(UPSTREAM_POLICIES)
+MOVIEGLU_FLIGHT = SingleFlight()
 
 def get_movieglu_credentials():
     """Get MovieGlu API credentials from environment variables"""
@@ -51,17 +365,761 @@ def get_movieglu_credentials():
 
 def get_movieglu_headers(endpoint: str) -> Dict[str, str]:
     """Generate required headers for MovieGlu API"""
-    creds = get_movieglu_credentials()
-    headers = {
-        "client": creds['client'],
-        "x-api-key": creds['api_key'],
-        "authorization": creds['authorization'],
-        "territory": creds['territory'],
-        "api-version": "v201",
-        "geolocation": creds['geolocation'],
-        "device-datetime": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    return MOVIEGLU_CLIENT.headers()
+
+
+@contextmanager
+def file_lock(path: Optional[str]):
+    """Exclusive advisory lock (path + ".lock") around a read-modify-write of path"""
+    handle = None
+    if fcntl is not None and path:
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            handle = open(f"{path}.lock", "a")
+        except OSError:
+            handle = None
+    if handle is None:
+        yield
+        return
+    with handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+class MovieGluClient:
+    """MovieGlu API client with resolved credentials, pooled session and quota accounting"""
+
+    def __init__(self, base_url: str = MOVIEGLU_BASE_URL,
+                 guard: Optional[UpstreamGuard] = None,
+                 flight: Optional[SingleFlight] = None,
+                 daily_quota: int = MOVIEGLU_DAILY_QUOTA,
+                 quota_reserve: int = MOVIEGLU_QUOTA_RESERVE,
+                 quota_path: Optional[str] = MOVIEGLU_QUOTA_PATH):
+        self.base_url = base_url
+        self.guard = guard
+        self.flight = flight
+        self.daily_quota = daily_quota
+        self.quota_reserve = quota_reserve
+        self.quota_path = quota_path
+        self.credentials = get_movieglu_credentials()
+        self.default_geolocation = self.credentials['geolocation']
+        self.header_template = {
+            "client": self.credentials['client'],
+            "x-api-key": self.credentials['api_key'],
+            "authorization": self.credentials['authorization'],
+            "territory": self.credentials['territory'],
+            "api-version": "v201"
+        }
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MOVIEGLU_POOL_MAXSIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self._quota_day, self._quota_used = self._load_quota()
+        self._quota_pending = 0  # counted here, not yet added to the quota file
+        self._quota_synced_at = time.monotonic()
+        self._quota_io = threading.Lock()
+        self._shed = 0
+        if self.quota_path:
+            atexit.register(self._sync_quota)
+
+    def has_credentials(self) -> bool:
+        return all([self.credentials['client'], self.credentials['api_key'], self.credentials['authorization']])
+
+    def headers(self, geolocation: Optional[str] = None) -> Dict[str, str]:
+        """Copy of the header template with per-request datetime and geolocation"""
+        headers = dict(self.header_template)
+        headers["geolocation"] = geolocation or self.default_geolocation
+        headers["device-datetime"] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        return headers
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.utcnow().strftime("%Y-%m-%d")
+
+    def _load_quota(self) -> tuple:
+        """Restore today's request count from disk"""
+        try:
+            with open(self.quota_path, encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored.get("date") == self._today():
+                return stored["date"], int(stored.get("used", 0))
+        except (OSError, ValueError, TypeError, KeyError):
+            pass
+        return self._today(), 0
+
+    def _save_quota(self, day: str, used: int) -> None:
+        if not self.quota_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.quota_path) or ".", exist_ok=True)
+            tmp_path = f"{self.quota_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"date": day, "used": used}, f)
+            os.replace(tmp_path, self.quota_path)
+        except OSError:
+            pass
+
+    def _check_quota(self) -> None:
+        """Shed load before the daily cap is hit"""
+        with self._lock:
+            today = self._today()
+            if today != self._quota_day:
+                self._quota_day, self._quota_used, self._quota_pending = today, 0, 0
+            if self._quota_used >= self.daily_quota - self.quota_reserve:
+                self._shed += 1
+                raise MovieGluQuotaExceededError(
+                    f"MovieGlu daily quota reached ({self._quota_used}/{self.daily_quota} requests)"
+                )
+
+    def _count_request(self) -> None:
+        """Count one outgoing request (retries included)"""
+        with self._lock:
+            self._quota_used += 1
+            self._quota_pending += 1
+            sync = self.quota_path and (
+                self._quota_pending >= MOVIEGLU_QUOTA_SYNC_EVERY
+                or self._quota_used + MOVIEGLU_QUOTA_SYNC_EVERY >= self.daily_quota - self.quota_reserve
+                or time.monotonic() - self._quota_synced_at >= MOVIEGLU_QUOTA_SYNC_SECONDS
+            )
+        if sync:
+            self._sync_quota()
+
+    def _sync_quota(self) -> None:
+        """
+        Add the pending requests to the quota file and adopt its total
+        
+        The file is re-read and written back under an exclusive file lock, so
+        processes sharing it never lose each other's requests; the disk I/O
+        happens outside the client lock, and only one thread syncs at a time.
+        """
+        if not self.quota_path or not self._quota_io.acquire(blocking=False):
+            return
+        try:
+            with file_lock(self.quota_path):
+                day, used = self._load_quota()
+                with self._lock:
+                    pending, self._quota_pending = self._quota_pending, 0
+                    if day != self._quota_day:
+                        pending = 0  # the day rolled over: yesterday's requests no longer count
+                used += pending
+                self._save_quota(day, used)
+            with self._lock:
+                if day == self._quota_day:
+                    self._quota_used = used + self._quota_pending
+                self._quota_synced_at = time.monotonic()
+        finally:
+            self._quota_io.release()
+
+    def _send(self, url: str, **kwargs) -> requests.Response:
+        self._count_request()
+        return self.session.get(url, **kwargs)
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+            geolocation: Optional[str] = None) -> requests.Response:
+        """Send a GET request to a MovieGlu endpoint"""
+        url = f"{self.base_url}{endpoint}"
+        headers = self.headers(geolocation)
+        self._check_quota()  # before the guard: a shed request is not an upstream failure
+        if self.guard is not None:
+            return self.guard.request(self._send, url, headers=headers, params=params)
+        return self._send(url, headers=headers, params=params, timeout=UPSTREAM_TIMEOUT)
+
+    def get_json(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                 geolocation: Optional[str] = None) -> Dict[str, Any]:
+        """Send a GET request and return the decoded JSON body, sharing identical in-flight calls"""
+        if self.flight is not None:
+            key = (endpoint, tuple(sorted((k, str(v)) for k, v in (params or {}).items())),
+                   geolocation or self.default_geolocation)
+            return self.flight.do(key, lambda: self._send_json(endpoint, params, geolocation))
+        return self._send_json(endpoint, params, geolocation)
+
+    def _send_json(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                   geolocation: Optional[str] = None) -> Dict[str, Any]:
+        response = self.get(endpoint, params=params, geolocation=geolocation)
+        response.raise_for_status()
+        return json_loads(response.content)
+
+    def quota_status(self) -> Dict[str, Any]:
+        """How close we are to today's MovieGlu request cap"""
+        with self._lock:
+            used = self._quota_used if self._quota_day == self._today() else 0
+            return {
+                "date": self._today(),
+                "used": used,
+                "limit": self.daily_quota,
+                "reserve": self.quota_reserve,
+                "remaining": max(self.daily_quota - used, 0),
+                "shed": self._shed
+            }
+
+
+# Module-level client shared by every MovieGlu tool
+MOVIEGLU_CLIENT = MovieGluClient(guard=UPSTREAM_GUARD, flight=MOVIEGLU_FLIGHT)
+
+
+class Showing:
+    """One showing of a film in a given format (Standard, IMAX, 3D, ...)"""
+    __slots__ = ("start_time", "end_time", "format")
+
+    def __init__(self, start_time: Optional[str], end_time: Optional[str], format: str):
+        self.start_time = start_time
+        self.end_time = end_time
+        self.format = format
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"start_time": self.start_time, "end_time": self.end_time, "format": self.format}
+
+
+def parse_showings(showings: Dict[str, Any]) -> List[Showing]:
+    """Parse every showing format of a MovieGlu film entry, sorted by start time"""
+    parsed = [Showing(t.get('start_time'), t.get('end_time'), showing_format)
+              for showing_format, group in (showings or {}).items()
+              for t in (group or {}).get('times', [])]
+    parsed.sort(key=lambda showing: showing.start_time or "")
+    return parsed
+
+
+class FilmSchedule:
+    """A film's showings at one cinema on one date"""
+    __slots__ = ("id", "title", "age_rating", "showings")
+
+    def __init__(self, id: Any, title: Optional[str], age_rating: str, showings: List[Showing]):
+        self.id = id
+        self.title = title
+        self.age_rating = age_rating
+        self.showings = showings
+
+    @classmethod
+    def from_response(cls, film: Dict[str, Any]) -> "FilmSchedule":
+        return cls(film.get('film_id'),
+                   film.get('film_name'),
+                   (film.get('age_rating') or [{}])[0].get('rating', 'TBC'),
+                   parse_showings(film.get('showings')))
+
+    def formats(self) -> List[str]:
+        return sorted({showing.format for showing in self.showings})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "age_rating": self.age_rating,
+            "formats": self.formats(),
+            "showtimes": [showing.to_dict() for showing in self.showings]
+        }
+
+
+class CinemaSchedule:
+    """Compact parsed form of a /cinemaShowTimes/ response"""
+    __slots__ = ("id", "name", "address", "city", "date", "films")
+
+    def __init__(self, id: Any, name: Optional[str], address: Optional[str], city: Optional[str],
+                 date: str, films: List[FilmSchedule]):
+        self.id = id
+        self.name = name
+        self.address = address
+        self.city = city
+        self.date = date
+        self.films = films
+
+    @classmethod
+    def from_response(cls, data: Dict[str, Any], date: str) -> "CinemaSchedule":
+        cinema = data.get('cinema') or {}
+        return cls(cinema.get('cinema_id'),
+                   cinema.get('cinema_name'),
+                   cinema.get('address'),
+                   cinema.get('city'),
+                   date,
+                   [FilmSchedule.from_response(film) for film in data.get('films') or []])
+
+    def to_dict(self, film_ids: Optional[set] = None) -> Dict[str, Any]:
+        """Tool response, optionally restricted to a set of film ids"""
+        return {
+            "status": "success",
+            "cinema": {
+                "id": self.id,
+                "name": self.name,
+                "address": self.address,
+                "city": self.city
+            },
+            "date": self.date,
+            "films": [film.to_dict() for film in self.films
+                      if film_ids is None or str(film.id) in film_ids]
+        }
+
+
+class ShowtimeCache:
+    """Bounded cache of formatted showtimes with day-boundary expiry"""
+
+    def __init__(self, ttl: int = SHOWTIME_CACHE_TTL,
+                 expire_at: str = SHOWTIME_CACHE_EXPIRE_AT,
+                 max_entries: int = SHOWTIME_CACHE_MAX_ENTRIES,
+                 geo_precision: int = SHOWTIME_GEO_PRECISION):
+        self.ttl = ttl
+        self.expire_at = expire_at
+        self.max_entries = max_entries
+        self.geo_precision = geo_precision
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "composed": 0, "evictions": 0, "invalidations": 0}
+
+    def cinema_key(self, cinema_id: Any, date: str) -> tuple:
+        return ("cinema", str(cinema_id), date)
+
+    def film_key(self, film_id: Any, date: str, latitude: float, longitude: float) -> tuple:
+        return ("film", str(film_id), date,
+                round(float(latitude), self.geo_precision), round(float(longitude), self.geo_precision))
+
+    def nearby_key(self, latitude: float, longitude: float) -> tuple:
+        return ("nearby", round(float(latitude), self.geo_precision), round(float(longitude), self.geo_precision))
+
+    def _expires_at(self, now: float) -> float:
+        """Earliest of now + TTL and the next configured local expiry time"""
+        expires_at = now + self.ttl
+        if self.expire_at:
+            hour, minute = map(int, self.expire_at.split(':'))
+            local_now = datetime.fromtimestamp(now)
+            boundary = local_now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if boundary <= local_now:
+                boundary += timedelta(days=1)
+            expires_at = min(expires_at, boundary.timestamp())
+        return expires_at
+
+    def get(self, key: tuple) -> Any:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry[1]:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: tuple, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (value, self._expires_at(time.time()))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, cinema_id: str = "", film_id: str = "", date: str = "") -> int:
+        """Drop matching entries (all showtime entries when no filter is given)"""
+        with self._lock:
+            keys = []
+            for key in self._entries:
+                if key[0] == "nearby":
+                    continue
+                if cinema_id and not (key[0] == "cinema" and key[1] == str(cinema_id)):
+                    continue
+                if film_id and not (key[0] == "film" and key[1] == str(film_id)):
+                    continue
+                if date and key[2] != date:
+                    continue
+                keys.append(key)
+            for key in keys:
+                del self._entries[key]
+            self._stats["invalidations"] += len(keys)
+        return len(keys)
+
+    def compose_film_showtimes(self, film_id: str, date: str,
+                               latitude: float, longitude: float,
+                               limit: int = 10) -> Optional[Dict[str, Any]]:
+        """
+        Answer check_film_showtimes from cached per-cinema schedules
+        
+        Only possible when the upstream nearby cinema list for this location
+        and the schedule of every one of those cinemas for the date are
+        cached, and the result is the one /filmShowTimes/ would give: either
+        every one of the limit nearest cinemas shows the film, or there are
+        fewer than limit cinemas nearby at all. Otherwise cinemas further away
+        that show the film would be missing.
+        """
+        nearby = self.get(self.nearby_key(latitude, longitude))
+        if not nearby:
+            return None
+        film_info = None
+        cinemas = []
+        for cinema in nearby:
+            schedule = self.get(self.cinema_key(cinema["id"], date))
+            if schedule is None:
+                return None
+            for film in schedule.films:
+                if str(film.id) == str(film_id):
+                    film_info = film_info or {"id": film.id, "title": film.title,
+                                              "age_rating": film.age_rating}
+                    cinemas.append({
+                        "id": cinema["id"],
+                        "name": cinema["name"],
+                        "address": cinema["address"],
+                        "city": cinema["city"],
+                        "distance": cinema["distance"],
+                        "showtime_count": len(film.showings),
+                        "formats": film.formats()
+                    })
+                    break
+        if not cinemas or (len(cinemas) < len(nearby) and len(nearby) >= limit):
+            return None
+        with self._lock:
+            self._stats["composed"] += 1
+        return {
+            "status": "success",
+            "film": film_info,
+            "date": date,
+            "cinemas": sorted(cinemas, key=lambda c: c["distance"] or 0)
+        }
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        return stats
+
+
+# Module-level showtime cache shared by the showtime tools
+SHOWTIME_CACHE = ShowtimeCache()
+
+
+def invalidate_showtimes(cinema_id: str = "", film_id: str = "", date: str = "") -> int:
+    """Explicitly drop cached showtimes, e.g. after a schedule change"""
+    return SHOWTIME_CACHE.invalidate(cinema_id=cinema_id, film_id=film_id, date=date)
+
+
+def normalize_film_title(title: str) -> str:
+    """Normalize a title for cross-provider matching (case, accents and punctuation insensitive)"""
+    decomposed = unicodedata.normalize("NFKD", (title or "").casefold())
+    return " ".join("".join(c if c.isalnum() else " " for c in decomposed
+                            if not unicodedata.combining(c)).split())
+
+
+def release_year(release_date: Any) -> Optional[int]:
+    """Year of a YYYY-MM-DD release date, or None"""
+    text = str(release_date or "")[:4]
+    return int(text) if text.isdigit() else None
+
+
+class FilmXrefIndex:
+    """
+    Persisted TMDb id -> MovieGlu film_id index
+    
+    Both providers' titles are recorded by normalized title and release
+    year; a TMDb id resolves to the MovieGlu film with the same title whose
+    release year is within one year (regional release dates differ).
+    """
+
+    def __init__(self, path: str = FILM_XREF_PATH):
+        self.path = path
+        self.data = {"version": FILM_XREF_VERSION, "tmdb": {}, "movieglu": {}, "links": {}}
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def _reload(self, force: bool = False) -> None:
+        """Re-read the file when another tool or process has updated it"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._mtime and not force:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        if stored.get("version") == FILM_XREF_VERSION:
+            for side in ("tmdb", "movieglu", "links"):
+                self.data[side].update(stored.get(side, {}))
+        self._mtime = mtime
+
+    def _save(self) -> None:
+        """Write the index back atomically (callers hold file_lock and have just reloaded)"""
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._mtime = os.path.getmtime(self.path)
+        except OSError:
+            pass
+
+    def record_movieglu(self, films: List[Dict[str, Any]]) -> None:
+        """Record MovieGlu films (raw filmLiveSearch entries)"""
+        with self._lock, file_lock(self.path):
+            self._reload(force=True)
+            changed = False
+            for film in films:
+                title = normalize_film_title(film.get('film_name'))
+                if not title or film.get('film_id') is None:
+                    continue
+                year = release_year(film.get('release_dates', [{}])[0].get('release_date'))
+                entry = {"id": str(film['film_id']), "year": year}
+                entries = self.data["movieglu"].setdefault(title, [])
+                if entry not in entries:
+                    entries.append(entry)
+                    changed = True
+            if changed:
+                self._save()
+
+    def knows_movieglu(self, film_id: str) -> bool:
+        """Whether film_id has been recorded as a MovieGlu film id"""
+        film_id = str(film_id)
+        with self._lock:
+            self._reload()
+            return any(entry["id"] == film_id for entries in self.data["movieglu"].values() for entry in entries)
+
+    def resolve(self, tmdb_id: str) -> Optional[str]:
+        """MovieGlu film_id for a TMDb id, or None when it cannot be resolved yet"""
+        tmdb_id = str(tmdb_id)
+        with self._lock:
+            self._reload()
+            if tmdb_id in self.data["links"]:
+                return self.data["links"][tmdb_id]
+            tmdb_entry = self.data["tmdb"].get(tmdb_id)
+            if not tmdb_entry:
+                return None
+            for candidate in self.data["movieglu"].get(tmdb_entry["title"], []):
+                years = (candidate.get("year"), tmdb_entry.get("year"))
+                if None in years or abs(years[0] - years[1]) <= 1:
+                    with file_lock(self.path):
+                        self._reload(force=True)
+                        self.data["links"][tmdb_id] = candidate["id"]
+                        self._save()
+                    return candidate["id"]
+            return None
+
+
+# Module-level cross-reference index
+FILM_XREF = FilmXrefIndex()
+
+
+def haversine_miles(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in miles"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a)))
+
+
+class CinemaSpatialIndex:
+    """Grid index of cinema locations, filled from cinemasNearby responses"""
+
+    def __init__(self, path: Optional[str] = CINEMA_INDEX_PATH,
+                 cell_deg: float = CINEMA_INDEX_CELL_DEG,
+                 refresh_after: int = CINEMA_INDEX_REFRESH):
+        self.path = path
+        self.cell_deg = cell_deg
+        self.refresh_after = refresh_after
+        self.cinemas = {}
+        self.cells = {}
+        self.fetched = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _cell(self, latitude: float, longitude: float) -> tuple:
+        return (math.floor(latitude / self.cell_deg), math.floor(longitude / self.cell_deg))
+
+    def _load(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            self._merge_stored()
+
+    def _merge_stored(self) -> None:
+        """Merge the file's cinemas and fetch times into ours (newer fetches win; caller holds _lock)"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        for cinema in stored.get("cinemas", []):
+            if str(cinema.get("id")) not in self.cinemas:
+                self._add(cinema)
+        for cell, fetched_at in stored.get("fetched", []):
+            cell = tuple(cell)
+            self.fetched[cell] = max(self.fetched.get(cell, 0), fetched_at)
+
+    def save(self) -> None:
+        """
+        Persist cinemas and per-cell fetch times atomically
+        
+        The file is re-read and merged under an exclusive file lock first, so
+        processes sharing it never drop each other's cinemas.
+        """
+        if not self.path:
+            return
+        with file_lock(self.path):
+            with self._lock:
+                self._merge_stored()
+                payload = {
+                    "cinemas": list(self.cinemas.values()),
+                    "fetched": [[list(cell), fetched_at] for cell, fetched_at in self.fetched.items()]
+                }
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(payload, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                pass
+
+    def _add(self, cinema: Dict[str, Any]) -> None:
+        if cinema.get("id") is None or cinema.get("lat") is None or cinema.get("lng") is None:
+            return
+        cinema_id = str(cinema["id"])
+        previous = self.cinemas.get(cinema_id)
+        if previous is not None:
+            self.cells.get(self._cell(previous["lat"], previous["lng"]), set()).discard(cinema_id)
+        entry = {key: cinema.get(key) for key in ("id", "name", "address", "city", "postcode")}
+        entry["lat"], entry["lng"] = float(cinema["lat"]), float(cinema["lng"])
+        self.cinemas[cinema_id] = entry
+        self.cells.setdefault(self._cell(entry["lat"], entry["lng"]), set()).add(cinema_id)
+
+    def add_many(self, cinemas: List[Dict[str, Any]], latitude: Optional[float] = None,
+                 longitude: Optional[float] = None, fetched_at: Optional[float] = None) -> None:
+        """Add cinemas, marking the query point's cell as fetched when given"""
+        with self._lock:
+            for cinema in cinemas:
+                self._add(cinema)
+            if latitude is not None and longitude is not None:
+                self.fetched[self._cell(latitude, longitude)] = time.time() if fetched_at is None else fetched_at
+
+    def covers(self, latitude: float, longitude: float) -> bool:
+        """Whether the query point's cell has ever been fetched or seeded"""
+        return self._cell(latitude, longitude) in self.fetched
+
+    def is_stale(self, latitude: float, longitude: float) -> bool:
+        fetched_at = self.fetched.get(self._cell(latitude, longitude), 0)
+        return time.time() - fetched_at > self.refresh_after
+
+    def query(self, latitude: float, longitude: float, radius: float, k: int = 10) -> List[Dict[str, Any]]:
+        """k nearest cinemas within radius miles, with haversine distances"""
+        lat_span = radius / 69.0
+        lng_span = radius / max(69.0 * math.cos(math.radians(latitude)), 1e-6)
+        min_cell = self._cell(latitude - lat_span, longitude - lng_span)
+        max_cell = self._cell(latitude + lat_span, longitude + lng_span)
+        results = []
+        with self._lock:
+            for i in range(min_cell[0], max_cell[0] + 1):
+                for j in range(min_cell[1], max_cell[1] + 1):
+                    for cinema_id in self.cells.get((i, j), ()):
+                        cinema = self.cinemas[cinema_id]
+                        distance = haversine_miles(latitude, longitude, cinema["lat"], cinema["lng"])
+                        if distance <= radius:
+                            results.append(dict(cinema, distance=round(distance, 2)))
+        results.sort(key=lambda c: c["distance"])
+        return results[:k]
+
+    def refresh_async(self, latitude: float, longitude: float, fetch) -> None:
+        """Re-fetch a stale cell in the background (at most one refresh per cell)"""
+        cell = self._cell(latitude, longitude)
+        with self._lock:
+            if cell in self._refreshing:
+                return
+            self._refreshing.add(cell)
+        
+        def run():
+            try:
+                fetch(latitude, longitude)
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(cell)
+        
+        threading.Thread(target=run, daemon=True).start()
+
+
+# Module-level cinema index shared by the MovieGlu tools
+CINEMA_INDEX = CinemaSpatialIndex()
+if CINEMA_INDEX_SEED_SIMULATION:
+    for seed in FRENCH_CINEMAS:
+        CINEMA_INDEX.add_many([seed], seed["lat"], seed["lng"], fetched_at=0)
+
+
+def fetch_cinema_schedule(cinema_id: str, date: str) -> CinemaSchedule:
+    """Parsed schedule of a cinema for a date, from the showtime cache or MovieGlu"""
+    cache_key = SHOWTIME_CACHE.cinema_key(cinema_id, date)
+    cached = SHOWTIME_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    endpoint = "/cinemaShowTimes/"
+    
+    params = {
+        "cinema_id": cinema_id,
+        "date": date
     }
-    return headers
+    
+    data = MOVIEGLU_CLIENT.get_json(endpoint, params=params)
+    schedule = CinemaSchedule.from_response(data, date)
+    
+    SHOWTIME_CACHE.put(cache_key, schedule)
+    return schedule
+
+
+def fetch_nearby_cinemas(latitude: float, longitude: float) -> List[Dict[str, Any]]:
+    """Fetch /cinemasNearby/ and add the results to the local cinema index"""
+    data = MOVIEGLU_CLIENT.get_json("/cinemasNearby/", params={"n": 10},  # Limit to 10 cinemas
+                                    geolocation=f"{latitude};{longitude}")
+    
+    formatted_cinemas = []
+    for cinema in data.get('cinemas', []):
+        formatted_cinema = {
+            "id": cinema.get('cinema_id'),
+            "name": cinema.get('cinema_name'),
+            "address": cinema.get('address'),
+            "city": cinema.get('city'),
+            "postcode": cinema.get('postcode'),
+            "distance": cinema.get('distance', 0),
+            "lat": cinema.get('lat'),
+            "lng": cinema.get('lng')
+        }
+        formatted_cinemas.append(formatted_cinema)
+    
+    CINEMA_INDEX.add_many(formatted_cinemas, latitude, longitude)
+    CINEMA_INDEX.save()
+    
+    # Remember the complete upstream list so cached schedules can answer film lookups
+    SHOWTIME_CACHE.put(SHOWTIME_CACHE.nearby_key(latitude, longitude), formatted_cinemas)
+    return formatted_cinemas
+
+
+def film_filter_ids(movie_id: str, known_ids: Optional[set] = None) -> Optional[set]:
+    """
+    Film ids to keep for a MovieGlu or TMDb movie_id filter
+    
+    None keeps every film: no filter was given, or the id is neither a
+    MovieGlu film id (seen in known_ids or the cross-reference) nor a TMDb
+    id that maps to one. Filtering on an unknown id would hide the whole
+    schedule, so callers return it unfiltered with an unresolved_movie_id note.
+    """
+    movie_id = str(movie_id or "").strip()
+    if not movie_id:
+        return None
+    movieglu_id = FILM_XREF.resolve(movie_id)
+    if movieglu_id:
+        return {movie_id, movieglu_id}
+    if movie_id in (known_ids or ()) or FILM_XREF.knows_movieglu(movie_id):
+        return {movie_id}
+    return None
+
+
+def unresolved_movie_id_note(response: Dict[str, Any], movie_id: str) -> Dict[str, Any]:
+    """Mark a response whose movie_id filter could not be applied"""
+    response["unresolved_movie_id"] = str(movie_id).strip()
+    response["note"] = "This movie id could not be matched to a MovieGlu film, so every film is listed."
+    return response
 
 
 @tool
@@ -80,41 +1138,28 @@ def find_cinemas_nearby(latitude: float = 48.8566,
         Dictionary containing list of nearby cinemas
     """
     
-    creds = get_movieglu_credentials()
-    if not all([creds['client'], creds['api_key'], creds['authorization']]):
+    if not MOVIEGLU_CLIENT.has_credentials():
         return {"error": "MovieGlu API credentials not configured. Please configure the movieglu_api connection."}
     
     try:
-        endpoint = "/cinemasNearby/"
-        url = f"{MOVIEGLU_BASE_URL}{endpoint}"
-        
-        # Update geolocation in headers
-        headers = get_movieglu_headers(endpoint)
-        headers["geolocation"] = f"{latitude};{longitude}"
-        
-        params = {
-            "n": 10  # Limit to 10 cinemas
-        }
-        
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        cinemas = data.get('cinemas', [])
-        
-        formatted_cinemas = []
-        for cinema in cinemas:
-            formatted_cinema = {
-                "id": cinema.get('cinema_id'),
-                "name": cinema.get('cinema_name'),
-                "address": cinema.get('address'),
-                "city": cinema.get('city'),
-                "postcode": cinema.get('postcode'),
-                "distance": cinema.get('distance', 0),
-                "lat": cinema.get('lat'),
-                "lng": cinema.get('lng')
-            }
-            formatted_cinemas.append(formatted_cinema)
+        # Answer from the local cinema index when this area has been fetched: a fresh cell
+        # answers even when nothing is in range, a stale one refreshes in the background
+        formatted_cinemas = None
+        if CINEMA_INDEX.covers(latitude, longitude):
+            formatted_cinemas = CINEMA_INDEX.query(latitude, longitude, radius)
+            if CINEMA_INDEX.is_stale(latitude, longitude):
+                if formatted_cinemas:
+                    CINEMA_INDEX.refresh_async(latitude, longitude, fetch_nearby_cinemas)
+                else:
+                    formatted_cinemas = None
+        if formatted_cinemas is None:
+            # Fetched cinemas go into the index, so the radius filter and distances match the cached path
+            fetched = fetch_nearby_cinemas(latitude, longitude)
+            formatted_cinemas = CINEMA_INDEX.query(latitude, longitude, radius)
+            # Cinemas MovieGlu returns without coordinates are not indexed: keep them by reported distance
+            formatted_cinemas += [cinema for cinema in fetched
+                                  if (cinema.get("lat") is None or cinema.get("lng") is None)
+                                  and float(cinema.get("distance") or 0) <= radius]
         
         return {
             "status": "success",
@@ -142,15 +1187,14 @@ def get_cinema_showtimes(cinema_id: str,
     
     Args:
         cinema_id: MovieGlu cinema ID
-        movie_id: Optional MovieGlu film ID to filter showtimes (empty string for all movies)
+        movie_id: Optional MovieGlu film ID or TMDb movie ID to filter showtimes (empty string for all movies)
         date: Date in YYYY-MM-DD format (empty string for today)
     
     Returns:
         Dictionary containing showtimes information
     """
     
-    creds = get_movieglu_credentials()
-    if not all([creds['client'], creds['api_key'], creds['authorization']]):
+    if not MOVIEGLU_CLIENT.has_credentials():
         return {"error": "MovieGlu API credentials not configured. Please configure the movieglu_api connection."}
     
     try:
@@ -158,54 +1202,13 @@ def get_cinema_showtimes(cinema_id: str,
         if not date or not date.strip():
             date = datetime.now().strftime("%Y-%m-%d")
         
-        endpoint = "/cinemaShowTimes/"
-        url = f"{MOVIEGLU_BASE_URL}{endpoint}"
-        
-        headers = get_movieglu_headers(endpoint)
-        
-        params = {
-            "cinema_id": cinema_id,
-            "date": date
-        }
-        
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        cinema = data.get('cinema', {})
-        films = data.get('films', [])
-        
-        formatted_showtimes = {
-            "status": "success",
-            "cinema": {
-                "id": cinema.get('cinema_id'),
-                "name": cinema.get('cinema_name'),
-                "address": cinema.get('address'),
-                "city": cinema.get('city')
-            },
-            "date": date,
-            "films": []
-        }
-        
-        for film in films:
-            film_data = {
-                "id": film.get('film_id'),
-                "title": film.get('film_name'),
-                "age_rating": film.get('age_rating', [{}])[0].get('rating', 'TBC'),
-                "showtimes": []
-            }
-            
-            for showtime in film.get('showings', {}).get('Standard', {}).get('times', []):
-                showtime_data = {
-                    "start_time": showtime.get('start_time'),
-                    "end_time": showtime.get('end_time')
-                }
-                film_data['showtimes'].append(showtime_data)
-            
-            # Add all films - movie_id filtering doesn't work since TMDb ID != MovieGlu ID
-            formatted_showtimes['films'].append(film_data)
-        
-        return formatted_showtimes
+        # The full schedule is cached; movie_id filtering is applied per call
+        schedule = fetch_cinema_schedule(cinema_id, date)
+        film_ids = film_filter_ids(movie_id, {str(film.id) for film in schedule.films})
+        response = schedule.to_dict(film_ids)
+        if film_ids is None and movie_id and movie_id.strip():
+            unresolved_movie_id_note(response, movie_id)
+        return response
         
     except requests.RequestException as e:
         return {"error": f"Failed to fetch showtimes: {str(e)}"}
@@ -213,6 +1216,87 @@ def get_cinema_showtimes(cinema_id: str,
         return {"error": f"An error occurred: {str(e)}"}
 
 
+@tool
+def get_showtimes_matrix(cinema_ids: List[str],
+                         dates: List[str] = None,
+                         film_id: str = "") -> Dict[str, Any]:
+    """
+    Get showtimes for several cinemas over several dates in one call
+    
+    Args:
+        cinema_ids: List of MovieGlu cinema IDs
+        dates: List of dates in YYYY-MM-DD format (empty for today)
+        film_id: Optional MovieGlu film ID or TMDb movie ID to filter showtimes (empty string for all movies)
+    
+    Returns:
+        Dictionary containing one time-sorted timeline of showings, and per-cell errors
+    """
+    
+    if not MOVIEGLU_CLIENT.has_credentials():
+        return {"error": "MovieGlu API credentials not configured. Please configure the movieglu_api connection."}
+    
+    # Dedupe while keeping the caller's order
+    cinema_ids = list(dict.fromkeys(str(c).strip() for c in cinema_ids or [] if str(c).strip()))
+    dates = list(dict.fromkeys(d.strip() for d in dates or [] if d and d.strip()))
+    if not dates:
+        dates = [datetime.now().strftime("%Y-%m-%d")]
+    
+    if not cinema_ids:
+        return {"error": "No cinema IDs provided."}
+    cells = [(cinema_id, date) for cinema_id in cinema_ids for date in dates]
+    if len(cells) > SHOWTIMES_MATRIX_MAX_CELLS:
+        return {"error": f"Too many cinema/date combinations: at most {SHOWTIMES_MATRIX_MAX_CELLS} per call."}
+    
+    timeline = []
+    errors = []
+    schedules = {}
+    grid = {cinema_id: {} for cinema_id in cinema_ids}
+    with ThreadPoolExecutor(max_workers=min(SHOWTIMES_MATRIX_WORKERS, len(cells))) as pool:
+        futures = {cell: pool.submit(fetch_cinema_schedule, *cell) for cell in cells}
+        for cell, future in futures.items():
+            try:
+                schedules[cell] = future.result()
+            except requests.RequestException as e:
+                errors.append({"cinema_id": cell[0], "date": cell[1],
+                               "error": f"Failed to fetch showtimes: {str(e)}"})
+            except Exception as e:
+                errors.append({"cinema_id": cell[0], "date": cell[1],
+                               "error": f"An error occurred: {str(e)}"})
+    
+    film_ids = film_filter_ids(film_id, {str(film.id) for schedule in schedules.values() for film in schedule.films})
+    for (cinema_id, date), schedule in schedules.items():
+        count = 0
+        for film in schedule.films:
+            if film_ids is not None and str(film.id) not in film_ids:
+                continue
+            for showing in film.showings:
+                timeline.append({
+                    "date": date,
+                    "start_time": showing.start_time,
+                    "end_time": showing.end_time,
+                    "format": showing.format,
+                    "cinema_id": cinema_id,
+                    "cinema_name": schedule.name,
+                    "film_id": film.id,
+                    "film_title": film.title
+                })
+                count += 1
+        grid[cinema_id][date] = count
+    
+    timeline.sort(key=lambda s: (s['date'], s['start_time'] or "", s['cinema_name'] or ""))
+    
+    response = {
+        "status": "success" if not errors else "partial" if len(errors) < len(cells) else "error",
+        "count": len(timeline),
+        "timeline": timeline,
+        "showings_per_cinema": grid,
+        "errors": errors
+    }
+    if film_ids is None and film_id and film_id.strip():
+        unresolved_movie_id_note(response, film_id)
+    return response
+
+
 @tool
 def search_film_by_title(title: str) -> Dict[str, Any]:
     """
@@ -225,27 +1309,23 @@ def search_film_by_title(title: str) -> Dict[str, Any]:
         Dictionary containing film information from MovieGlu
     """
     
-    creds = get_movieglu_credentials()
-    if not all([creds['client'], creds['api_key'], creds['authorization']]):
+    if not MOVIEGLU_CLIENT.has_credentials():
         return {"error": "MovieGlu API credentials not configured. Please configure the movieglu_api connection."}
     
     try:
         endpoint = "/filmLiveSearch/"
-        url = f"{MOVIEGLU_BASE_URL}{endpoint}"
-        
-        headers = get_movieglu_headers(endpoint)
         
         params = {
             "query": title,
             "n": 5  # Limit to 5 results
         }
         
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = MOVIEGLU_CLIENT.get_json(endpoint, params=params)
         films = data.get('films', [])
         
+        # Remember MovieGlu ids so TMDb ids can be translated without another search
+        FILM_XREF.record_movieglu(films)
+        
         if not films:
             return {
                 "status": "not_found",
@@ -282,28 +1362,35 @@ def search_film_by_title(title: str) -> Dict[str, Any]:
 
 
 @tool
-def check_film_showtimes(film_id: str,
+def check_film_showtimes(film_id: str = "",
                         date: str = "",
                         latitude: float = 48.8566,
-                        longitude: float = 2.3522) -> Dict[str, Any]:
+                        longitude: float = 2.3522,
+                        tmdb_id: str = "") -> Dict[str, Any]:
     """
     Check which cinemas are showing a specific film
     
     Args:
-        film_id: MovieGlu film ID
+        film_id: MovieGlu film ID (empty string when passing tmdb_id)
         date: Date in YYYY-MM-DD format (empty string for today)
         latitude: Latitude of the location (default: Paris)
         longitude: Longitude of the location (default: Paris)
+        tmdb_id: TMDb movie ID, used when film_id is empty and the film has been resolved before
     
     Returns:
         Dictionary containing cinemas showing the film
     """
     
     # Convert film_id to string if it's passed as integer
-    film_id = str(film_id)
+    film_id = str(film_id or "").strip()
+    if not film_id and tmdb_id:
+        film_id = FILM_XREF.resolve(str(tmdb_id).strip()) or ""
+        if not film_id:
+            return {"error": f"No MovieGlu film known for TMDb id {tmdb_id}. Use search_film_by_title first."}
+    if not film_id:
+        return {"error": "A film_id or tmdb_id is required."}
     
-    creds = get_movieglu_credentials()
-    if not all([creds['client'], creds['api_key'], creds['authorization']]):
+    if not MOVIEGLU_CLIENT.has_credentials():
         return {"error": "MovieGlu API credentials not configured. Please configure the movieglu_api connection."}
     
     try:
@@ -311,11 +1398,16 @@ def check_film_showtimes(film_id: str,
         if not date or not date.strip():
             date = datetime.now().strftime("%Y-%m-%d")
         
-        endpoint = "/filmShowTimes/"
-        url = f"{MOVIEGLU_BASE_URL}{endpoint}"
+        cache_key = SHOWTIME_CACHE.film_key(film_id, date, latitude, longitude)
+        cached = SHOWTIME_CACHE.get(cache_key)
+        if cached is None:
+            cached = SHOWTIME_CACHE.compose_film_showtimes(film_id, date, latitude, longitude)
+            if cached is not None:
+                SHOWTIME_CACHE.put(cache_key, cached)
+        if cached is not None:
+            return cached
         
-        headers = get_movieglu_headers(endpoint)
-        headers["geolocation"] = f"{latitude};{longitude}"
+        endpoint = "/filmShowTimes/"
         
         params = {
             "film_id": film_id,
@@ -323,10 +1415,7 @@ def check_film_showtimes(film_id: str,
             "n": 10  # Limit to 10 cinemas
         }
         
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = MOVIEGLU_CLIENT.get_json(endpoint, params=params, geolocation=f"{latitude};{longitude}")
         film = data.get('film', {})
         cinemas = data.get('cinemas', [])
         
@@ -347,11 +1436,14 @@ def check_film_showtimes(film_id: str,
                 "name": cinema.get('cinema_name'),
                 "address": cinema.get('address'),
                 "city": cinema.get('city'),
-                "distance": cinema.get('distance', 0),
-                "showtime_count": len(cinema.get('showings', {}).get('Standard', {}).get('times', []))
+                "distance": cinema.get('distance', 0)
             }
+            showings = parse_showings(cinema.get('showings'))
+            cinema_data["showtime_count"] = len(showings)
+            cinema_data["formats"] = sorted({showing.format for showing in showings})
             formatted_availability['cinemas'].append(cinema_data)
         
+        SHOWTIME_CACHE.put(cache_key, formatted_availability)
         return formatted_availability
         
     except requests.RequestException as e:
@@ -4,15 +4,1209 @@ Uses TMDb API for movie information
 """
 
 import os
+import re
+import json
+import time
+import random
+import tempfile
+import bisect
+import difflib
+import threading
+import unicodedata
 import requests
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from ibm_watsonx_orchestrate.agent_builder.tools import tool
 
+try:
+    import numpy as np
+except ImportError:  # Local recommendations are disabled; TMDb is used instead
+    np = None
+
+try:
+    import fcntl
+except ImportError:  # No advisory file locks (Windows): writes stay atomic but may race
+    fcntl = None
+
 # TMDb API Configuration
 TMDB_BASE_URL = "https://api.themoviedb.org/3"
 TMDB_IMAGE_BASE = "https://image.tmdb.org/t/p/w500"
 
+# Connection pool configuration (shared by every tool in this module)
+TMDB_POOL_CONNECTIONS = int(os.getenv('TMDB_POOL_CONNECTIONS', '4'))
+TMDB_POOL_MAXSIZE = int(os.getenv('TMDB_POOL_MAXSIZE', '16'))
+
+# Upstream call protection: timeouts, jittered retries and circuit breaking
+UPSTREAM_TIMEOUT = (float(os.getenv('UPSTREAM_CONNECT_TIMEOUT', '3.05')),
+                    float(os.getenv('UPSTREAM_READ_TIMEOUT', '10')))
+UPSTREAM_MAX_RETRIES = int(os.getenv('UPSTREAM_MAX_RETRIES', '2'))
+UPSTREAM_BACKOFF_BASE = float(os.getenv('UPSTREAM_BACKOFF_BASE', '0.25'))
+UPSTREAM_BACKOFF_CAP = float(os.getenv('UPSTREAM_BACKOFF_CAP', '4'))
+UPSTREAM_MAX_THROTTLE_WAIT = float(os.getenv('UPSTREAM_MAX_THROTTLE_WAIT', '2'))
+UPSTREAM_BREAKER_THRESHOLD = int(os.getenv('UPSTREAM_BREAKER_THRESHOLD', '5'))
+UPSTREAM_BREAKER_RESET = float(os.getenv('UPSTREAM_BREAKER_RESET', '30'))
+
+# Per-host request quotas (tokens per second and burst size)
+TMDB_RATE_LIMIT = float(os.getenv('TMDB_RATE_LIMIT', '40'))
+TMDB_RATE_BURST = float(os.getenv('TMDB_RATE_BURST', '20'))
+UPSTREAM_POLICIES = {
+    urlparse(TMDB_BASE_URL).hostname: {"rate": TMDB_RATE_LIMIT, "burst": TMDB_RATE_BURST},
+    "default": {"rate": 10, "burst": 10}
+}
+
+# Fan-out configuration for get_movies_details
+TMDB_DETAILS_WORKERS = int(os.getenv('TMDB_DETAILS_WORKERS', '6'))
+TMDB_DETAILS_MAX_IDS = int(os.getenv('TMDB_DETAILS_MAX_IDS', '20'))
+
+# Pagination configuration for search_movies
+TMDB_PAGE_WORKERS = int(os.getenv('TMDB_PAGE_WORKERS', '4'))
+TMDB_MAX_PAGES = int(os.getenv('TMDB_MAX_PAGES', '10'))
+
+# Response cache configuration: TTLs in seconds per endpoint family
+TMDB_CACHE_MAX_ENTRIES = int(os.getenv('TMDB_CACHE_MAX_ENTRIES', '512'))
+TMDB_CACHE_MAX_STALE = int(os.getenv('TMDB_CACHE_MAX_STALE', str(24 * 3600)))
+TMDB_CACHE_TTLS = {
+    "/movie/now_playing": 3 * 3600,
+    "/movie/upcoming": 6 * 3600,
+    "/movie/popular": 3 * 3600,
+    "/movie/top_rated": 12 * 3600,
+    "/movie/{id}": 24 * 3600,
+    "/movie/{id}/recommendations": 12 * 3600,
+    "/search/movie": 3600,
+    "/discover/movie": 3 * 3600,
+    "/genre/movie/list": 7 * 24 * 3600
+}
+
+
+class UpstreamUnavailableError(requests.RequestException):
+    """Raised when an upstream call is short-circuited or throttled away"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at `rate` tokens per second"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait: float) -> Optional[float]:
+        """Take one token, waiting up to max_wait seconds; returns the wait or None"""
+        deadline = time.monotonic() + max_wait
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            if now + delay > deadline:
+                return None
+            time.sleep(delay)
+            waited += delay
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets one probe through after a cool-down"""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.state = "closed"
+        self.opened_at = 0.0
+        self.prober = None  # thread sending the half-open probe
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now"""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self.prober = threading.get_ident()
+                return True
+            return False
+
+    def _probing(self) -> bool:
+        return self.state == "half_open" and self.prober == threading.get_ident()
+
+    def yield_probe(self) -> None:
+        """Hand an unsent probe back: open again, with the next call free to probe"""
+        with self._lock:
+            if self._probing():
+                self.state = "open"
+
+    def end_probe(self) -> None:
+        """A probe that ended without recording an outcome counts as a failure"""
+        with self._lock:
+            if self._probing():
+                self.failures += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.state = "closed"
+            self.prober = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+class UpstreamGuard:
+    """Per-host rate limiting, jittered retries and circuit breaking for upstream calls"""
+
+    def __init__(self, policies: Dict[str, Dict[str, float]]):
+        self.policies = policies
+        self.buckets = {}
+        self.breakers = {}
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "throttled": 0, "retried": 0, "short_circuited": 0, "failures": 0}
+
+    def _for_host(self, host: str) -> tuple:
+        with self._lock:
+            if host not in self.buckets:
+                policy = self.policies.get(host, self.policies["default"])
+                self.buckets[host] = TokenBucket(policy["rate"], policy["burst"])
+                self.breakers[host] = CircuitBreaker(UPSTREAM_BREAKER_THRESHOLD, UPSTREAM_BREAKER_RESET)
+            return self.buckets[host], self.breakers[host]
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def request(self, send, url: str, **kwargs) -> requests.Response:
+        """Call send(url, **kwargs) under the host's limiter, retry policy and breaker"""
+        host = urlparse(url).hostname or ""
+        bucket, breaker = self._for_host(host)
+        kwargs.setdefault("timeout", UPSTREAM_TIMEOUT)
+        self._count("calls")
+        
+        for attempt in range(UPSTREAM_MAX_RETRIES + 1):
+            if not breaker.allow():
+                self._count("short_circuited")
+                raise UpstreamUnavailableError(f"{host} is temporarily unavailable (circuit open)")
+            waited = bucket.acquire(UPSTREAM_MAX_THROTTLE_WAIT)
+            if waited is None:
+                breaker.yield_probe()
+                self._count("throttled")
+                raise UpstreamUnavailableError(f"Rate limit for {host} exceeded, try again shortly")
+            if waited > 0:
+                self._count("throttled")
+            
+            retry_after = None
+            try:
+                response = send(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                breaker.record_failure()
+                self._count("failures")
+                if attempt == UPSTREAM_MAX_RETRIES:
+                    raise
+            else:
+                if response.status_code != 429 and response.status_code < 500:
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                self._count("failures")
+                if attempt == UPSTREAM_MAX_RETRIES:
+                    return response
+                retry_after = response.headers.get("Retry-After")
+            finally:
+                # Any other exception must not leave the breaker half-open for good
+                breaker.end_probe()
+            
+            # Full-jitter exponential backoff, honouring Retry-After when given
+            delay = random.uniform(0, min(UPSTREAM_BACKOFF_CAP, UPSTREAM_BACKOFF_BASE * 2 ** attempt))
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, min(float(retry_after), UPSTREAM_BACKOFF_CAP))
+            self._count("retried")
+            time.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for throttled, retried and short-circuited calls, plus breaker states"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["breakers"] = {host: breaker.state for host, breaker in self.breakers.items()}
+        return stats
+
+
+class SingleFlight:
+    """Collapse concurrent identical calls into one in-flight upstream call"""
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "executed": 0, "collapsed": 0}
+
+    def do(self, key: Any, fn) -> Any:
+        """Run fn() once per key at a time; concurrent callers share its result or error"""
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self._stats["collapsed"] += 1
+                leader = False
+            else:
+                call = self._calls[key] = SingleFlight._Call()
+                self._stats["executed"] += 1
+                leader = True
+        
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        return stats
+
+
+class TMDbResponseCache:
+    """Bounded TTL + LRU cache for TMDb responses with stale-while-revalidate"""
+
+    def __init__(self, max_entries: int = TMDB_CACHE_MAX_ENTRIES,
+                 ttls: Optional[Dict[str, int]] = None,
+                 max_stale: int = TMDB_CACHE_MAX_STALE):
+        self.max_entries = max_entries
+        self.ttls = dict(TMDB_CACHE_TTLS if ttls is None else ttls)
+        self.max_stale = max_stale
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "evictions": 0,
+                       "refreshes": 0, "refresh_errors": 0}
+
+    @staticmethod
+    def endpoint_path(endpoint: str) -> str:
+        """Strip the base URL so full URLs and paths share cache entries"""
+        if endpoint.startswith(TMDB_BASE_URL):
+            endpoint = endpoint[len(TMDB_BASE_URL):]
+        return "/" + endpoint.strip("/")
+
+    def ttl_for(self, endpoint: str) -> Optional[int]:
+        """TTL for an endpoint, or None if the endpoint is not cacheable"""
+        family = re.sub(r"/\d+(?=/|$)", "/{id}", self.endpoint_path(endpoint))
+        return self.ttls.get(family)
+
+    def make_key(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> tuple:
+        """Normalize a request into (endpoint, region, query, page, extra params)"""
+        params = dict(params or {})
+        params.pop("api_key", None)
+        region = str(params.pop("region", "") or "").upper()
+        query = " ".join(str(params.pop("query", "") or "").casefold().split())
+        page = int(params.pop("page", 1) or 1)
+        extras = tuple(sorted((k, str(v)) for k, v in params.items()))
+        return (self.endpoint_path(endpoint), region, query, page, extras)
+
+    def get_or_fetch(self, endpoint: str, params: Optional[Dict[str, Any]], fetch) -> Any:
+        """Return a cached response, refreshing stale entries in the background"""
+        ttl = self.ttl_for(endpoint)
+        if ttl is None:
+            return fetch()
+        
+        key = self.make_key(endpoint, params)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if now < expires_at:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return value
+                if now < expires_at + self.max_stale:
+                    self._entries.move_to_end(key)
+                    self._stats["stale_hits"] += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(target=self._refresh, args=(key, ttl, fetch),
+                                         daemon=True).start()
+                    return value
+            self._stats["misses"] += 1
+        
+        value = fetch()
+        self.put(key, value, ttl)
+        return value
+
+    def put(self, key: tuple, value: Any, ttl: int) -> None:
+        """Store a response and evict least recently used entries past the bound"""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _refresh(self, key: tuple, ttl: int, fetch) -> None:
+        """Background revalidation of a stale entry"""
+        try:
+            value = fetch()
+            self.put(key, value, ttl)
+            with self._lock:
+                self._stats["refreshes"] += 1
+        except Exception:
+            with self._lock:
+                self._stats["refresh_errors"] += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def peek(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Return a cached response regardless of age, or None"""
+        with self._lock:
+            entry = self._entries.get(self.make_key(endpoint, params))
+        return entry[0] if entry is not None else None
+
+    def invalidate(self, endpoint: str = "") -> int:
+        """Drop every entry, or only those for one endpoint path"""
+        path = self.endpoint_path(endpoint) if endpoint else ""
+        with self._lock:
+            keys = [k for k in self._entries if not path or k[0] == path]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters and current size"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+            stats["refreshing"] = len(self._refreshing)
+        return stats
+
+
+class TMDbClient:
+    """Pooled, keep-alive HTTP client for the TMDb API"""
+
+    def __init__(self, base_url: str = TMDB_BASE_URL,
+                 pool_connections: int = TMDB_POOL_CONNECTIONS,
+                 pool_maxsize: int = TMDB_POOL_MAXSIZE,
+                 cache: Optional[TMDbResponseCache] = None,
+                 guard: Optional[UpstreamGuard] = None,
+                 flight: Optional[SingleFlight] = None):
+        self.base_url = base_url
+        self.cache = cache
+        self.guard = guard
+        self.flight = flight
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive"
+        })
+        self.adapter = HTTPAdapter(pool_connections=pool_connections,
+                                   pool_maxsize=pool_maxsize,
+                                   pool_block=False)
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self._lock = threading.Lock()
+        self._requests = 0
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+        """Send a GET request through the pooled session"""
+        url = endpoint if endpoint.startswith("http") else f"{self.base_url}{endpoint}"
+        if self.guard is not None:
+            response = self.guard.request(self.session.get, url, params=params)
+        else:
+            response = self.session.get(url, params=params, timeout=UPSTREAM_TIMEOUT)
+        with self._lock:
+            self._requests += 1
+        return response
+
+    def get_json(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Return the decoded JSON body, served from the response cache when possible"""
+        if self.cache is None:
+            return self._fetch_json(endpoint, params)
+        try:
+            return self.cache.get_or_fetch(endpoint, params,
+                                           lambda: self._fetch_json(endpoint, params))
+        except requests.RequestException:
+            # Serve an expired entry while the upstream is unhealthy
+            stale = self.cache.peek(endpoint, params)
+            if stale is None:
+                raise
+            return stale
+
+    def _fetch_json(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Send a GET request and return the decoded JSON body"""
+        if self.flight is not None:
+            key = (TMDbResponseCache.endpoint_path(endpoint),
+                   tuple(sorted((k, str(v)) for k, v in (params or {}).items())))
+            return self.flight.do(key, lambda: self._send_json(endpoint, params))
+        return self._send_json(endpoint, params)
+
+    def _send_json(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        response = self.get(endpoint, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def stats(self) -> Dict[str, int]:
+        """Connection-reuse counters, summed over every pooled host"""
+        pool_manager = self.adapter.poolmanager
+        connections_opened = 0
+        pool_requests = 0
+        for key in list(pool_manager.pools.keys()):
+            pool = pool_manager.pools.get(key)
+            if pool is None:
+                continue
+            connections_opened += pool.num_connections
+            pool_requests += pool.num_requests
+        with self._lock:
+            total_requests = self._requests
+        return {
+            "requests": total_requests,
+            "connections_opened": connections_opened,
+            "connections_reused": max(pool_requests - connections_opened, 0),
+            "pools": len(pool_manager.pools)
+        }
+
+
+# Module-level cache, upstream guard, single-flight and client shared by every TMDb tool
+TMDB_CACHE = TMDbResponseCache()
+UPSTREAM_GUARD = UpstreamGuard(UPSTREAM_POLICIES)
+TMDB_FLIGHT = SingleFlight()
+TMDB_CLIENT = TMDbClient(cache=TMDB_CACHE, guard=UPSTREAM_GUARD, flight=TMDB_FLIGHT)
+
+# Local cache directory shared by the cinema agent tools
+CACHE_DIR = os.getenv('CINEMA_AGENT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'cinema_agent'))
+
+# TMDb <-> MovieGlu film id cross-reference (resolved by the cinema tool)
+FILM_XREF_PATH = os.getenv('FILM_XREF_PATH', os.path.join(CACHE_DIR, 'film_xref.json'))
+FILM_XREF_VERSION = 1
+
+# Genre index configuration
+GENRE_INDEX_VERSION = 1
+GENRE_INDEX_PATH = os.getenv('TMDB_GENRE_INDEX_PATH', os.path.join(CACHE_DIR, 'tmdb_genre_index.json'))
+GENRE_INDEX_MAX_AGE = int(os.getenv('TMDB_GENRE_INDEX_MAX_AGE', str(30 * 24 * 3600)))
+GENRE_INDEX_LANGUAGES = ["en-US", "fr-FR"]
+
+# TMDb movie genres (id -> localized names), used until the first refresh
+TMDB_GENRES = {
+    28: {"en-US": "Action", "fr-FR": "Action"},
+    12: {"en-US": "Adventure", "fr-FR": "Aventure"},
+    16: {"en-US": "Animation", "fr-FR": "Animation"},
+    35: {"en-US": "Comedy", "fr-FR": "Comédie"},
+    80: {"en-US": "Crime", "fr-FR": "Crime"},
+    99: {"en-US": "Documentary", "fr-FR": "Documentaire"},
+    18: {"en-US": "Drama", "fr-FR": "Drame"},
+    10751: {"en-US": "Family", "fr-FR": "Familial"},
+    14: {"en-US": "Fantasy", "fr-FR": "Fantastique"},
+    36: {"en-US": "History", "fr-FR": "Histoire"},
+    27: {"en-US": "Horror", "fr-FR": "Horreur"},
+    10402: {"en-US": "Music", "fr-FR": "Musique"},
+    9648: {"en-US": "Mystery", "fr-FR": "Mystère"},
+    10749: {"en-US": "Romance", "fr-FR": "Romance"},
+    878: {"en-US": "Science Fiction", "fr-FR": "Science-Fiction"},
+    10770: {"en-US": "TV Movie", "fr-FR": "Téléfilm"},
+    53: {"en-US": "Thriller", "fr-FR": "Thriller"},
+    10752: {"en-US": "War", "fr-FR": "Guerre"},
+    37: {"en-US": "Western", "fr-FR": "Western"}
+}
+
+# Common aliases users type instead of the TMDb genre name
+GENRE_ALIASES = {
+    "sci-fi": 878, "scifi": 878, "sf": 878, "science fiction": 878,
+    "action adventure": 28, "animated": 16, "cartoon": 16, "anime": 16,
+    "comedies": 35, "funny": 35, "rom-com": 10749, "romcom": 10749, "romantic": 10749,
+    "documentaries": 99, "doc": 99, "docs": 99, "kids": 10751, "children": 10751,
+    "historical": 36, "period": 36, "scary": 27, "horror movies": 27, "musical": 10402,
+    "suspense": 53, "thrillers": 53, "whodunit": 9648, "policier": 80, "gangster": 80,
+    "war movies": 10752, "cowboy": 37, "tv": 10770
+}
+
+
+def normalize_genre_name(name: str) -> str:
+    """Normalize a genre name for lookups (case, accents and punctuation insensitive)"""
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    return "".join(c for c in decomposed if c.isalnum())
+
+
+class GenreIndex:
+    """Genre name -> TMDb genre id index, persisted on disk and refreshed rarely"""
+
+    def __init__(self, path: str = GENRE_INDEX_PATH, max_age: int = GENRE_INDEX_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self.genres = {}
+        self.fetched_at = 0.0
+        self._names = {}
+        self._loaded = False
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self) -> None:
+        """Load the index from disk once, falling back to the built-in genre list"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            genres, fetched_at = TMDB_GENRES, 0.0
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    stored = json.load(f)
+                if stored.get("version") == GENRE_INDEX_VERSION and stored.get("genres"):
+                    genres = {int(k): v for k, v in stored["genres"].items()}
+                    fetched_at = float(stored.get("fetched_at", 0))
+            except (OSError, ValueError, AttributeError):
+                pass
+            self._build(genres, fetched_at)
+            self._loaded = True
+
+    def _build(self, genres: Dict[int, Dict[str, str]], fetched_at: float) -> None:
+        """Rebuild the name lookup table from id -> localized names"""
+        names = {}
+        for alias, genre_id in GENRE_ALIASES.items():
+            names[normalize_genre_name(alias)] = genre_id
+        for genre_id, localized in genres.items():
+            for name in localized.values():
+                names[normalize_genre_name(name)] = genre_id
+        self.genres = genres
+        self.fetched_at = fetched_at
+        self._names = names
+
+    def resolve(self, name: str, api_key: Optional[str] = None) -> Optional[int]:
+        """Resolve a genre name, localized name or alias to its TMDb id"""
+        self._ensure_loaded()
+        if api_key:
+            self.maybe_refresh(api_key)
+        return self._names.get(normalize_genre_name(name or ""))
+
+    def resolve_many(self, names: List[str], api_key: Optional[str] = None) -> List[int]:
+        """Resolve several genre names, skipping unknown ones and duplicates"""
+        genre_ids = []
+        for name in names or []:
+            genre_id = self.resolve(name, api_key)
+            if genre_id is not None and genre_id not in genre_ids:
+                genre_ids.append(genre_id)
+        return genre_ids
+
+    def name_for(self, genre_id: int, language: str = "en-US") -> Optional[str]:
+        """Localized display name for a genre id"""
+        self._ensure_loaded()
+        localized = self.genres.get(int(genre_id), {})
+        return localized.get(language) or localized.get("en-US")
+
+    def is_stale(self) -> bool:
+        """Whether the index is older than its maximum age"""
+        self._ensure_loaded()
+        return time.time() - self.fetched_at > self.max_age
+
+    def maybe_refresh(self, api_key: str) -> None:
+        """Refresh the index in the background when it is stale"""
+        if not self.is_stale():
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, args=(api_key,), daemon=True).start()
+
+    def _background_refresh(self, api_key: str) -> None:
+        try:
+            self.refresh(api_key)
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def refresh(self, api_key: str) -> None:
+        """Fetch the genre list in every configured language and persist it"""
+        genres = {}
+        for language in GENRE_INDEX_LANGUAGES:
+            data = TMDB_CLIENT.get_json("/genre/movie/list",
+                                        params={"api_key": api_key, "language": language})
+            for g in data.get('genres', []):
+                genres.setdefault(int(g['id']), {})[language] = g['name']
+        if not genres:
+            return
+        fetched_at = time.time()
+        with self._lock:
+            self._build(genres, fetched_at)
+        self.save()
+
+    def save(self) -> None:
+        """Write the index to disk atomically with its version stamp"""
+        payload = {
+            "version": GENRE_INDEX_VERSION,
+            "fetched_at": self.fetched_at,
+            "genres": {str(k): v for k, v in self.genres.items()}
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+
+# Module-level genre index shared by every TMDb tool
+GENRE_INDEX = GenreIndex()
+
+# Local catalog configuration: TMDb snapshot exports (results pages, optionally tagged with
+# "status" and "region") and an optional catalog file in the data/movies.json format. Only
+# entries carrying TMDb ids are indexed: the demo films in data/movies.json (ids m001...) cannot
+# be passed to get_movie_details or the cinema tools, so that file itself yields no entries.
+MOVIE_CATALOG_PATH = os.getenv('MOVIE_CATALOG_PATH', '')
+MOVIE_CATALOG_SNAPSHOTS = [p for p in os.getenv('MOVIE_CATALOG_SNAPSHOTS', '').split(os.pathsep) if p]
+
+# Catalog status names mapped onto the search_movies status values
+CATALOG_STATUSES = {
+    "now_showing": "now_playing",
+    "now_playing": "now_playing",
+    "coming_soon": "upcoming",
+    "upcoming": "upcoming",
+    "popular": "popular"
+}
+
+
+def tokenize_title(text: str) -> List[str]:
+    """Split a title into normalized (case and accent insensitive) tokens"""
+    decomposed = unicodedata.normalize("NFKD", (text or "").casefold())
+    stripped = "".join(c if c.isalnum() else " " for c in decomposed if not unicodedata.combining(c))
+    return stripped.split()
+
+
+def is_tmdb_id(movie_id: Any) -> bool:
+    """TMDb ids are positive integers; anything else cannot be passed to the TMDb tools"""
+    return str(movie_id).isdigit()
+
+
+class MovieCatalog:
+    """
+    In-memory index of TMDb movies with title, genre, status and cast postings
+    
+    Filled once, on first use, from the configured TMDb snapshot exports, so
+    every entry's id can be passed back to the TMDb tools. It is read-only
+    afterwards, so lookups need no lock.
+    """
+
+    def __init__(self, path: Optional[str] = MOVIE_CATALOG_PATH,
+                 snapshots: Optional[List[str]] = None):
+        self.path = path
+        self.snapshots = list(MOVIE_CATALOG_SNAPSHOTS if snapshots is None else snapshots)
+        self.movies = []
+        self.title_postings = {}
+        self.genre_postings = {}
+        self.status_postings = {}
+        self.cast_postings = {}
+        self.vocabulary = []
+        self._by_id = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self) -> None:
+        """Load the catalog file and snapshots on first use"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            if self.path:
+                try:
+                    with open(self.path, encoding="utf-8") as f:
+                        data = json.load(f)
+                    for movie in data.get('movies', []):
+                        self._add(self._from_catalog(movie))
+                except (OSError, ValueError, AttributeError):
+                    pass
+            for snapshot in self.snapshots:
+                try:
+                    with open(snapshot, encoding="utf-8") as f:
+                        data = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                self._add_tmdb_results(data)
+            self.vocabulary = sorted(self.title_postings)
+            self._loaded = True
+
+    @staticmethod
+    def _from_catalog(movie: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize a data/movies.json entry"""
+        genres = movie.get('genre', [])
+        return {
+            "id": str(movie['id']),
+            "title": movie['title'],
+            "release_date": movie.get('releaseDate', 'TBA'),
+            "overview": movie.get('synopsis', 'No description available'),
+            "rating": float(movie.get('imdbRating', 0) or 0),
+            "poster_url": movie.get('posterUrl'),
+            "popularity": 0,
+            "genres": genres,
+            "genre_ids": GENRE_INDEX.resolve_many(genres),
+            "cast": movie.get('cast', []),
+            "director": movie.get('director', 'Unknown'),
+            "status": CATALOG_STATUSES.get(movie.get('status', ''), movie.get('status')),
+            "region": None
+        }
+
+    @staticmethod
+    def _from_tmdb(movie: Dict[str, Any], status: Optional[str], region: Optional[str] = None) -> Dict[str, Any]:
+        """Normalize a TMDb list result"""
+        genre_ids = list(movie.get('genre_ids', []))
+        return {
+            "id": str(movie['id']),
+            "title": movie['title'],
+            "release_date": movie.get('release_date', 'TBA'),
+            "overview": movie.get('overview', 'No description available'),
+            "rating": float(movie.get('vote_average', 0) or 0),
+            "poster_url": f"{TMDB_IMAGE_BASE}{movie['poster_path']}" if movie.get('poster_path') else None,
+            "popularity": movie.get('popularity', 0),
+            "genres": [GENRE_INDEX.name_for(g) for g in genre_ids if GENRE_INDEX.name_for(g)],
+            "genre_ids": genre_ids,
+            "cast": [],
+            "director": "Unknown",
+            "status": CATALOG_STATUSES.get(status or '', status),
+            "region": region.upper() if region else None
+        }
+
+    def _add_tmdb_results(self, data: Any) -> None:
+        """Add a TMDb snapshot: a results page, a list of pages or a list of movies"""
+        pages = data if isinstance(data, list) else [data]
+        for page in pages:
+            if isinstance(page, dict) and 'results' in page:
+                for movie in page['results']:
+                    self._add(self._from_tmdb(movie, page.get('status'), page.get('region')))
+            elif isinstance(page, dict) and 'title' in page:
+                self._add(self._from_tmdb(page, page.get('status'), page.get('region')))
+
+    def _add(self, entry: Dict[str, Any]) -> None:
+        """Add one normalized entry to the postings (first occurrence of an id wins)"""
+        if entry["id"] in self._by_id or not is_tmdb_id(entry["id"]):
+            return
+        idx = len(self.movies)
+        self.movies.append(entry)
+        self._by_id[entry["id"]] = idx
+        for token in set(tokenize_title(entry["title"])):
+            self.title_postings.setdefault(token, set()).add(idx)
+        for genre_id in entry["genre_ids"]:
+            self.genre_postings.setdefault(genre_id, set()).add(idx)
+        if entry["status"]:
+            self.status_postings.setdefault(entry["status"], set()).add(idx)
+        for name in entry["cast"] + [entry["director"]]:
+            self.cast_postings.setdefault(" ".join(tokenize_title(name)), set()).add(idx)
+
+    def get(self, movie_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a catalog entry by id"""
+        self._ensure_loaded()
+        idx = self._by_id.get(str(movie_id))
+        return self.movies[idx] if idx is not None else None
+
+    def _token_postings(self, token: str) -> set:
+        """Postings for a query token: exact, then prefix, then fuzzy match"""
+        if token in self.title_postings:
+            return self.title_postings[token]
+        matches = set()
+        start = bisect.bisect_left(self.vocabulary, token)
+        for word in self.vocabulary[start:]:
+            if not word.startswith(token):
+                break
+            matches |= self.title_postings[word]
+        if matches or len(token) < 3:
+            return matches
+        for word in difflib.get_close_matches(token, self.vocabulary, n=3, cutoff=0.8):
+            matches |= self.title_postings[word]
+        return matches
+
+    def search(self, query: str = "",
+               status: str = "",
+               genre_id: Optional[int] = None,
+               cast: str = "",
+               region: str = "",
+               limit: int = 10) -> List[Dict[str, Any]]:
+        """Search the catalog; every given criterion must match (region-less entries match any region)"""
+        self._ensure_loaded()
+        candidates = None
+        tokens = tokenize_title(query)
+        for token in tokens:
+            postings = self._token_postings(token)
+            candidates = set(postings) if candidates is None else candidates & postings
+            if not candidates:
+                return []
+        if status:
+            postings = self.status_postings.get(CATALOG_STATUSES.get(status, status), set())
+            candidates = set(postings) if candidates is None else candidates & postings
+        if genre_id is not None:
+            postings = self.genre_postings.get(genre_id, set())
+            candidates = set(postings) if candidates is None else candidates & postings
+        if cast:
+            postings = self.cast_postings.get(" ".join(tokenize_title(cast)), set())
+            candidates = set(postings) if candidates is None else candidates & postings
+        if candidates is None:
+            candidates = range(len(self.movies))
+        if region:
+            candidates = [i for i in candidates if self.movies[i]["region"] in (None, region.upper())]
+        
+        # Exact title-token matches first, then popularity and rating
+        query_tokens = set(tokens)
+        ranked = sorted(
+            candidates,
+            key=lambda i: (-len(query_tokens & set(tokenize_title(self.movies[i]["title"]))),
+                           -(self.movies[i]["popularity"] or 0),
+                           -self.movies[i]["rating"])
+        )
+        return [self.movies[i] for i in ranked[:limit]]
+
+
+# Module-level local catalog shared by the TMDb tools
+MOVIE_CATALOG = MovieCatalog()
+
+# Feature weights for the local content-based recommender
+RECOMMENDER_WEIGHTS = {"genre": 1.0, "director": 0.7, "cast": 0.5}
+RECOMMENDER_RATING_WEIGHT = 0.15
+# Fewest movies with credits before the local recommender stands in for TMDb
+RECOMMENDER_MIN_MOVIES = int(os.getenv('RECOMMENDER_MIN_MOVIES', '50'))
+
+
+def has_credits(movie: Dict[str, Any]) -> bool:
+    """Whether a catalog entry names its cast or director (TMDb list results do not)"""
+    return bool(movie["cast"]) or movie["director"] not in ("", "Unknown")
+
+
+class CatalogRecommender:
+    """
+    Content-based recommender using NumPy feature vectors over genres, cast and director
+    
+    Only movies with credits become rows: catalog entries that carry them and
+    the /movie/{id} responses fetched by get_movie_details. Each rebuild
+    publishes a new immutable state, so queries never see a half-built matrix.
+    """
+
+    def __init__(self, catalog: MovieCatalog):
+        self.catalog = catalog
+        self.details = {}  # TMDb id -> entry from a /movie/{id} response
+        self.state = None
+        self._dirty = True
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _from_details(movie: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize a /movie/{id} response with credits"""
+        details = format_movie_details(movie)
+        return {
+            "id": details["id"],
+            "title": details["title"],
+            "release_date": details["release_date"],
+            "overview": details["overview"],
+            "rating": float(details["rating"] or 0),
+            "poster_url": details["poster_url"],
+            "genre_ids": [g['id'] for g in movie.get('genres', []) if 'id' in g],
+            "cast": details["cast"],
+            "director": details["director"]
+        }
+
+    def add_details(self, movie: Dict[str, Any]) -> None:
+        """Make a fetched /movie/{id} response (with credits) a recommender row"""
+        entry = self._from_details(movie)
+        if not has_credits(entry):
+            return
+        with self._lock:
+            self.details[entry["id"]] = entry
+            self._dirty = True
+
+    def _ensure_built(self) -> Optional[tuple]:
+        """(movies, by_id, features, genre_features, ratings, genre_columns), rebuilt after changes"""
+        if np is None:
+            return None
+        self.catalog._ensure_loaded()
+        with self._lock:
+            if not self._dirty:
+                return self.state
+            rows = {movie["id"]: movie for movie in self.catalog.movies if has_credits(movie)}
+            rows.update(self.details)
+            movies = list(rows.values())
+            self._dirty = False
+            
+            columns = {}
+            for movie in movies:
+                for genre_id in movie["genre_ids"]:
+                    columns.setdefault(("genre", genre_id), len(columns))
+                if movie["director"] and movie["director"] != "Unknown":
+                    columns.setdefault(("director", movie["director"]), len(columns))
+                for name in movie["cast"]:
+                    columns.setdefault(("cast", name), len(columns))
+            
+            features = np.zeros((len(movies), max(len(columns), 1)), dtype=np.float32)
+            for row, movie in enumerate(movies):
+                for genre_id in movie["genre_ids"]:
+                    features[row, columns[("genre", genre_id)]] = RECOMMENDER_WEIGHTS["genre"]
+                if ("director", movie["director"]) in columns:
+                    features[row, columns[("director", movie["director"])]] = RECOMMENDER_WEIGHTS["director"]
+                for name in movie["cast"]:
+                    features[row, columns[("cast", name)]] = RECOMMENDER_WEIGHTS["cast"]
+            norms = np.linalg.norm(features, axis=1, keepdims=True)
+            features /= np.where(norms > 0, norms, 1)
+            
+            genre_columns = {key[1]: col for key, col in columns.items() if key[0] == "genre"}
+            genre_mask = np.zeros(features.shape[1], dtype=np.float32)
+            genre_mask[list(genre_columns.values())] = 1
+            ratings = np.array([movie["rating"] for movie in movies], dtype=np.float32)
+            self.state = (movies, {movie["id"]: row for row, movie in enumerate(movies)},
+                          features, features * genre_mask, ratings, genre_columns) if movies else None
+            return self.state
+
+    def recommend(self, movie_id: str = "",
+                  genre_ids: Optional[List[int]] = None,
+                  min_rating: float = 0.0,
+                  k: int = 5) -> Optional[List[Dict[str, Any]]]:
+        """
+        Top-k similar movies for a seed movie or a genre set
+        
+        Returns None when the recommender cannot answer (no NumPy, fewer than
+        RECOMMENDER_MIN_MOVIES movies with credits, unknown seed movie or unknown genres).
+        """
+        state = self._ensure_built()
+        if state is None or len(state[0]) < RECOMMENDER_MIN_MOVIES:
+            return None
+        movies, by_id, features, genre_features, ratings, genre_columns = state
+        
+        if movie_id:
+            seed = by_id.get(str(movie_id))
+            if seed is None:
+                return None
+            scores = features @ features[seed]
+            eligible = scores > 0
+            eligible[seed] = False
+        elif genre_ids:
+            query = np.zeros(features.shape[1], dtype=np.float32)
+            for genre_id in genre_ids:
+                if genre_id in genre_columns:
+                    query[genre_columns[genre_id]] = 1
+            if not query.any():
+                return None
+            scores = genre_features @ query
+            eligible = scores > 0
+        else:
+            scores = np.zeros(len(ratings), dtype=np.float32)
+            eligible = np.ones(len(ratings), dtype=bool)
+        
+        scores = scores + RECOMMENDER_RATING_WEIGHT * ratings / 10
+        eligible &= ratings >= min_rating
+        scores = np.where(eligible, scores, -np.inf)
+        
+        count = min(k, int(eligible.sum()))
+        if count == 0:
+            return []
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.argsort(-scores[top])]
+        return [movies[i] for i in top]
+
+
+# Module-level recommender over the local catalog
+RECOMMENDER = CatalogRecommender(MOVIE_CATALOG)
+
+# TMDb ids already written to the cross-reference file by this process
+_XREF_RECORDED = set()
+_XREF_LOCK = threading.Lock()
+
+
+@contextmanager
+def file_lock(path: Optional[str]):
+    """Exclusive advisory lock (path + ".lock") around a read-modify-write of path"""
+    handle = None
+    if fcntl is not None and path:
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            handle = open(f"{path}.lock", "a")
+        except OSError:
+            handle = None
+    if handle is None:
+        yield
+        return
+    with handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def record_tmdb_titles(movies: List[Dict[str, Any]]) -> None:
+    """Record TMDb ids by normalized title and year for the MovieGlu cross-reference"""
+    with _XREF_LOCK:
+        new_movies = [m for m in movies if m.get('id') is not None and str(m['id']) not in _XREF_RECORDED]
+        if not new_movies:
+            return
+        with file_lock(FILM_XREF_PATH):
+            saved = _merge_tmdb_titles(new_movies)
+        if saved:
+            _XREF_RECORDED.update(str(m['id']) for m in new_movies)
+
+
+def _merge_tmdb_titles(new_movies: List[Dict[str, Any]]) -> bool:
+    """Add TMDb entries to the cross-reference file (caller holds its file_lock)"""
+    data = {"version": FILM_XREF_VERSION, "tmdb": {}, "movieglu": {}, "links": {}}
+    try:
+        with open(FILM_XREF_PATH, encoding="utf-8") as f:
+            stored = json.load(f)
+        if stored.get("version") == FILM_XREF_VERSION:
+            data.update(stored)
+    except (OSError, ValueError):
+        pass
+    for movie in new_movies:
+        year = str(movie.get('release_date') or "")[:4]
+        data["tmdb"][str(movie['id'])] = {
+            "title": " ".join(tokenize_title(movie.get('title', ''))),
+            "year": int(year) if year.isdigit() else None
+        }
+    try:
+        os.makedirs(os.path.dirname(FILM_XREF_PATH) or ".", exist_ok=True)
+        tmp_path = f"{FILM_XREF_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, FILM_XREF_PATH)
+    except OSError:
+        return False
+    return True
+
+
+def fetch_movie_pages(endpoint: str,
+                      params: Dict[str, Any],
+                      limit: int,
+                      max_pages: int = 1,
+                      keep=None) -> tuple:
+    """
+    Fetch result pages concurrently until `limit` movies pass the `keep` filter
+    
+    Page 1 is fetched first to learn `total_pages`; remaining pages are then
+    fetched in waves of TMDB_PAGE_WORKERS, stopping early once enough matches
+    are collected or the page cap is reached.
+    
+    Returns:
+        Tuple of (matching movies in page order, number of pages scanned)
+    """
+    first_page = TMDB_CLIENT.get_json(endpoint, params={**params, "page": 1})
+    pages = [first_page.get('results', [])]
+    last_page = min(first_page.get('total_pages') or 1, max(max_pages, 1), TMDB_MAX_PAGES)
+    
+    def collect():
+        seen = set()
+        matches = []
+        for results in pages:
+            for movie in results:
+                if movie.get('id') in seen or (keep is not None and not keep(movie)):
+                    continue
+                seen.add(movie.get('id'))
+                matches.append(movie)
+        return matches
+    
+    matches = collect()
+    next_page = 2
+    if len(matches) < limit and next_page <= last_page:
+        with ThreadPoolExecutor(max_workers=TMDB_PAGE_WORKERS) as pool:
+            while len(matches) < limit and next_page <= last_page:
+                batch = range(next_page, min(next_page + TMDB_PAGE_WORKERS, last_page + 1))
+                futures = [pool.submit(TMDB_CLIENT.get_json, endpoint, {**params, "page": page})
+                           for page in batch]
+                failed = False
+                for future in futures:
+                    try:
+                        pages.append(future.result().get('results', []))
+                    except requests.RequestException:
+                        failed = True
+                next_page = batch.stop
+                matches = collect()
+                if failed:
+                    # Keep what we have rather than failing the whole search
+                    break
+    
+    return matches, next_page - 1
+
+
+def format_movie_details(movie: Dict[str, Any]) -> Dict[str, Any]:
+    """Format a /movie/{id} response (with credits, videos and release_dates)"""
+    
+    # Extract main cast (top 5)
+    cast = []
+    if 'credits' in movie and 'cast' in movie['credits']:
+        cast = [actor['name'] for actor in movie['credits']['cast'][:5]]
+    
+    # Extract director
+    director = "Unknown"
+    if 'credits' in movie and 'crew' in movie['credits']:
+        directors = [crew['name'] for crew in movie['credits']['crew'] if crew['job'] == 'Director']
+        if directors:
+            director = directors[0]
+    
+    # Extract trailer URL
+    trailer_url = None
+    if 'videos' in movie and 'results' in movie['videos']:
+        trailers = [v for v in movie['videos']['results'] 
+                   if v['type'] == 'Trailer' and v['site'] == 'YouTube']
+        if trailers:
+            trailer_url = f"https://www.youtube.com/watch?v={trailers[0]['key']}"
+    
+    # Extract certification/rating for different regions
+    certifications = {}
+    if 'release_dates' in movie and 'results' in movie['release_dates']:
+        for release in movie['release_dates']['results']:
+            if release['iso_3166_1'] in ['GB', 'US', 'FR', 'DE']:
+                for date_info in release['release_dates']:
+                    if date_info.get('certification'):
+                        certifications[release['iso_3166_1']] = date_info['certification']
+                        break
+    
+    return {
+        "id": str(movie['id']),
+        "title": movie['title'],
+        "tagline": movie.get('tagline', ''),
+        "overview": movie.get('overview', 'No description available'),
+        "release_date": movie.get('release_date', 'TBA'),
+        "runtime": movie.get('runtime', 0),
+        "genres": [g['name'] for g in movie.get('genres', [])],
+        "director": director,
+        "cast": cast,
+        "rating": movie.get('vote_average', 0),
+        "vote_count": movie.get('vote_count', 0),
+        "poster_url": f"{TMDB_IMAGE_BASE}{movie['poster_path']}" if movie.get('poster_path') else None,
+        "backdrop_url": f"{TMDB_IMAGE_BASE}{movie['backdrop_path']}" if movie.get('backdrop_path') else None,
+        "trailer_url": trailer_url,
+        "certifications": certifications,
+        "budget": movie.get('budget', 0),
+        "revenue": movie.get('revenue', 0),
+        "production_companies": [c['name'] for c in movie.get('production_companies', [])][:3]
+    }
+
+
 def get_tmdb_api_key():
     """Get TMDb API key from environment variables"""
     # Try different possible environment variable names:
@@ -32,7 +1226,8 @@ def search_movies(query: str = "",
                   status: str = "now_playing",
                   genre: str = "",
                   region: str = "FR",
-                  limit: int = 10) -> Dict[str, Any]:
+                  limit: int = 10,
+                  max_pages: int = 5) -> Dict[str, Any]:
     """
     Search for movies using TMDb API
     
@@ -42,6 +1237,7 @@ def search_movies(query: str = "",
         genre: Genre name to filter by (optional, empty string for no filter)
         region: Region code (e.g., 'FR' for France, 'GB' for UK)
         limit: Maximum number of movies to return (default: 10)
+        max_pages: Maximum number of result pages to scan to fill the limit (default: 5)
     
     Returns:
         Dictionary containing list of movies with their details
@@ -72,28 +1268,43 @@ def search_movies(query: str = "",
             endpoint = f"{TMDB_BASE_URL}{status_endpoints.get(status, '/movie/now_playing')}"
             params = {
                 "api_key": TMDB_API_KEY,
-                "region": region,
-                "page": 1
+                "region": region
             }
         
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        movies = data.get('results', [])
-        
-        # If genre filter is specified, get genre mappings first
+        # If genre filter is specified, resolve it from the local genre index
+        keep = None
+        genre_id = None
         if genre and genre.strip():
-            genre_response = requests.get(
-                f"{TMDB_BASE_URL}/genre/movie/list",
-                params={"api_key": TMDB_API_KEY}
-            )
-            genres_data = genre_response.json()
-            genre_map = {g['name'].lower(): g['id'] for g in genres_data.get('genres', [])}
-            
-            genre_id = genre_map.get(genre.lower())
+            genre_id = GENRE_INDEX.resolve(genre, TMDB_API_KEY)
             if genre_id:
-                movies = [m for m in movies if genre_id in m.get('genre_ids', [])]
+                keep = lambda m: genre_id in m.get('genre_ids', [])
+        
+        # Answer from the TMDb snapshot catalog (prefix and fuzzy title matching, genre and
+        # status postings) when it fills the whole page by itself; otherwise ask TMDb
+        if query and query.strip():
+            local_movies = MOVIE_CATALOG.search(query=query, genre_id=genre_id, region=region, limit=limit)
+        else:
+            local_movies = MOVIE_CATALOG.search(status=status, genre_id=genre_id, region=region, limit=limit)
+        if limit > 0 and len(local_movies) >= limit:
+            return {
+                "status": "success",
+                "count": len(local_movies),
+                "movies": [
+                    {key: movie[key] for key in ("id", "title", "release_date", "overview",
+                                                  "rating", "poster_url", "popularity")}
+                    for movie in local_movies
+                ],
+                "region": region,
+                "pages_scanned": 0,
+                "source": "local_catalog"
+            }
+        
+        # Scan pages concurrently until the limit is filled
+        movies, pages_scanned = fetch_movie_pages(endpoint, params, limit,
+                                                  max_pages=max_pages, keep=keep)
+        
+        # Let the cinema tool translate these TMDb ids to MovieGlu film ids
+        record_tmdb_titles(movies[:limit])
         
         # Format the response
         formatted_movies = []
@@ -113,7 +1324,9 @@ def search_movies(query: str = "",
             "status": "success",
             "count": len(formatted_movies),
             "movies": formatted_movies,
-            "region": region
+            "region": region,
+            "pages_scanned": pages_scanned,
+            "source": "tmdb"
         }
         
     except requests.RequestException as e:
@@ -147,63 +1360,12 @@ def get_movie_details(movie_id: str) -> Dict[str, Any]:
             "append_to_response": "credits,videos,release_dates"
         }
         
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-        
-        movie = response.json()
-        
-        # Extract main cast (top 5)
-        cast = []
-        if 'credits' in movie and 'cast' in movie['credits']:
-            cast = [actor['name'] for actor in movie['credits']['cast'][:5]]
-        
-        # Extract director
-        director = "Unknown"
-        if 'credits' in movie and 'crew' in movie['credits']:
-            directors = [crew['name'] for crew in movie['credits']['crew'] if crew['job'] == 'Director']
-            if directors:
-                director = directors[0]
-        
-        # Extract trailer URL
-        trailer_url = None
-        if 'videos' in movie and 'results' in movie['videos']:
-            trailers = [v for v in movie['videos']['results'] 
-                       if v['type'] == 'Trailer' and v['site'] == 'YouTube']
-            if trailers:
-                trailer_url = f"https://www.youtube.com/watch?v={trailers[0]['key']}"
-        
-        # Extract certification/rating for different regions
-        certifications = {}
-        if 'release_dates' in movie and 'results' in movie['release_dates']:
-            for release in movie['release_dates']['results']:
-                if release['iso_3166_1'] in ['GB', 'US', 'FR', 'DE']:
-                    for date_info in release['release_dates']:
-                        if date_info.get('certification'):
-                            certifications[release['iso_3166_1']] = date_info['certification']
-                            break
+        movie = TMDB_CLIENT.get_json(endpoint, params=params)
+        RECOMMENDER.add_details(movie)
         
         return {
             "status": "success",
-            "movie": {
-                "id": str(movie['id']),
-                "title": movie['title'],
-                "tagline": movie.get('tagline', ''),
-                "overview": movie.get('overview', 'No description available'),
-                "release_date": movie.get('release_date', 'TBA'),
-                "runtime": movie.get('runtime', 0),
-                "genres": [g['name'] for g in movie.get('genres', [])],
-                "director": director,
-                "cast": cast,
-                "rating": movie.get('vote_average', 0),
-                "vote_count": movie.get('vote_count', 0),
-                "poster_url": f"{TMDB_IMAGE_BASE}{movie['poster_path']}" if movie.get('poster_path') else None,
-                "backdrop_url": f"{TMDB_IMAGE_BASE}{movie['backdrop_path']}" if movie.get('backdrop_path') else None,
-                "trailer_url": trailer_url,
-                "certifications": certifications,
-                "budget": movie.get('budget', 0),
-                "revenue": movie.get('revenue', 0),
-                "production_companies": [c['name'] for c in movie.get('production_companies', [])][:3]
-            }
+            "movie": format_movie_details(movie)
         }
         
     except requests.RequestException as e:
@@ -212,6 +1374,65 @@ def get_movie_details(movie_id: str) -> Dict[str, Any]:
         return {"error": f"An error occurred: {str(e)}"}
 
 
+@tool
+def get_movies_details(movie_ids: List[str]) -> Dict[str, Any]:
+    """
+    Get detailed information about several movies in one call
+    
+    Args:
+        movie_ids: List of TMDb movie IDs (duplicates are ignored)
+    
+    Returns:
+        Dictionary containing movie details keyed by ID, and per-ID errors
+    """
+    
+    TMDB_API_KEY = get_tmdb_api_key()
+    
+    if not TMDB_API_KEY:
+        return {"error": "TMDb API key not configured. Please configure the tmdb_api connection."}
+    
+    # Dedupe while keeping the caller's order
+    unique_ids = []
+    for movie_id in movie_ids or []:
+        movie_id = str(movie_id).strip()
+        if movie_id and movie_id not in unique_ids:
+            unique_ids.append(movie_id)
+    
+    if not unique_ids:
+        return {"error": "No movie IDs provided."}
+    if len(unique_ids) > TMDB_DETAILS_MAX_IDS:
+        return {"error": f"Too many movie IDs: at most {TMDB_DETAILS_MAX_IDS} per call."}
+    
+    params = {
+        "api_key": TMDB_API_KEY,
+        "append_to_response": "credits,videos,release_dates"
+    }
+    
+    def fetch(movie_id):
+        movie = TMDB_CLIENT.get_json(f"{TMDB_BASE_URL}/movie/{movie_id}", params=params)
+        RECOMMENDER.add_details(movie)
+        return format_movie_details(movie)
+    
+    movies = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=min(TMDB_DETAILS_WORKERS, len(unique_ids))) as pool:
+        futures = {movie_id: pool.submit(fetch, movie_id) for movie_id in unique_ids}
+        for movie_id, future in futures.items():
+            try:
+                movies[movie_id] = future.result()
+            except requests.RequestException as e:
+                errors[movie_id] = f"Failed to fetch movie details: {str(e)}"
+            except Exception as e:
+                errors[movie_id] = f"An error occurred: {str(e)}"
+    
+    return {
+        "status": "success" if not errors else "partial" if movies else "error",
+        "count": len(movies),
+        "movies": movies,
+        "errors": errors
+    }
+
+
 @tool
 def get_movie_recommendations(movie_id: str = "",
                              genres: List[str] = None,
@@ -236,43 +1457,51 @@ def get_movie_recommendations(movie_id: str = "",
     try:
         recommendations = []
         
+        # Answer from the local recommender when enough movies with credits are known and
+        # it fills the top 5 for the seed movie, genre set or top rated listing
+        movie_id = (movie_id or "").strip()
+        genre_ids = GENRE_INDEX.resolve_many(genres, TMDB_API_KEY) if genres else []
+        local = RECOMMENDER.recommend(movie_id=movie_id, genre_ids=genre_ids, min_rating=min_rating, k=5)
+        if local and len(local) >= 5 and all(is_tmdb_id(movie["id"]) for movie in local):
+            return {
+                "status": "success",
+                "count": len(local),
+                "recommendations": [
+                    {
+                        "id": movie["id"],
+                        "title": movie["title"],
+                        "release_date": movie["release_date"],
+                        "overview": movie["overview"][:200] + "...",
+                        "rating": movie["rating"],
+                        "poster_url": movie["poster_url"]
+                    }
+                    for movie in local
+                ],
+                "based_on": f"movie_id: {movie_id}" if movie_id else f"genres: {genres}" if genres else "top_rated",
+                "source": "local_catalog"
+            }
+        
         if movie_id and movie_id.strip():
             # Get recommendations based on a specific movie
             endpoint = f"{TMDB_BASE_URL}/movie/{movie_id}/recommendations"
             params = {"api_key": TMDB_API_KEY}
             
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = TMDB_CLIENT.get_json(endpoint, params=params)
             recommendations = data.get('results', [])
         
         elif genres:
             # Get popular movies filtered by genres
-            # First, get genre IDs
-            genre_response = requests.get(
-                f"{TMDB_BASE_URL}/genre/movie/list",
-                params={"api_key": TMDB_API_KEY}
-            )
-            genres_data = genre_response.json()
-            genre_map = {g['name'].lower(): g['id'] for g in genres_data.get('genres', [])}
-            
-            genre_ids = [str(genre_map[g.lower()]) for g in genres if g.lower() in genre_map]
-            
             if genre_ids:
                 endpoint = f"{TMDB_BASE_URL}/discover/movie"
                 params = {
                     "api_key": TMDB_API_KEY,
                     "sort_by": "popularity.desc",
-                    "with_genres": ",".join(genre_ids),
+                    "with_genres": ",".join(str(g) for g in genre_ids),
                     "vote_average.gte": min_rating,
                     "vote_count.gte": 100  # Ensure movies have enough votes
                 }
                 
-                response = requests.get(endpoint, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
+                data = TMDB_CLIENT.get_json(endpoint, params=params)
                 recommendations = data.get('results', [])
         
         else:
@@ -280,10 +1509,7 @@ def get_movie_recommendations(movie_id: str = "",
             endpoint = f"{TMDB_BASE_URL}/movie/top_rated"
             params = {"api_key": TMDB_API_KEY}
             
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = TMDB_CLIENT.get_json(endpoint, params=params)
             recommendations = data.get('results', [])
         
         # Filter by minimum rating and format response
@@ -307,7 +1533,8 @@ def get_movie_recommendations(movie_id: str = "",
             "status": "success",
             "count": len(formatted_recommendations),
             "recommendations": formatted_recommendations,
-            "based_on": f"movie_id: {movie_id}" if movie_id else f"genres: {genres}" if genres else "top_rated"
+            "based_on": f"movie_id: {movie_id}" if movie_id else f"genres: {genres}" if genres else "top_rated",
+            "source": "tmdb"
         }
         
     except requests.RequestException as e: